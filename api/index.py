@@ -5,8 +5,10 @@ Ajusta el path de Python para que encuentre el módulo 'app'.
 import sys
 import os
 
-# Agregar el directorio raíz al path de Python
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Agregar el directorio raíz al path de Python (solo si no está ya)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
 from app.main import app
 
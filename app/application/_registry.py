@@ -0,0 +1,40 @@
+import threading
+from typing import Any, Dict, Tuple, Type
+
+
+class HandlerRegistry:
+    """
+    Registro de handlers reutilizables.
+    Solo debe usarse con handlers sin estado propio cuyo repositorio tampoco
+    guarde estado por petición (abren su propia sesión en cada operación).
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Tuple[type, type], Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_handler(self, handler_cls: Type, repository_cls: Type) -> Any:
+        """Devuelve la instancia compartida del handler, creándola en el primer uso"""
+        clave = (handler_cls, repository_cls)
+        handler = self._handlers.get(clave)
+        if handler is not None:
+            self.hits += 1
+            return handler
+
+        with self._lock:
+            handler = self._handlers.get(clave)
+            if handler is None:
+                self.misses += 1
+                handler = handler_cls(repository_cls())
+                self._handlers[clave] = handler
+            return handler
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores de reutilización del registro"""
+        return {"handlers": len(self._handlers), "hits": self.hits, "misses": self.misses}
+
+
+registry = HandlerRegistry()
+get_handler = registry.get_handler
@@ -8,9 +8,14 @@ from app.domain.contacto.entities import (
     TipoFeedbackEnum, TipoMensajeEnum
 )
 from app.domain.contacto.repositories import ContactoRepository
+from app.application.event_bus import EventBus, event_bus as bus_por_defecto
 
 
-@dataclass
+# Tabla precalculada valor de tipo de feedback -> enum
+_TIPO_FEEDBACK_MAP = {tipo.value: tipo for tipo in TipoFeedbackEnum}
+
+
+@dataclass(slots=True, frozen=True)
 class EnviarFeedbackCommand(Command):
     """Comando para enviar feedback a un postulante"""
     postulacion_id: UUID
@@ -26,17 +31,17 @@ class EnviarFeedbackCommandHandler(CommandHandler):
     Manejador del comando para enviar feedback a un postulante
     """
     
-    def __init__(self, contacto_repository: ContactoRepository):
+    def __init__(self, contacto_repository: ContactoRepository, event_bus: Optional[EventBus] = None):
         self.contacto_repository = contacto_repository
+        self.event_bus = event_bus or bus_por_defecto
     
     def handle(self, command: EnviarFeedbackCommand) -> UUID:
         """
         Maneja el comando de envío de feedback
         """
-        try:
-            # Convertir string a enum
-            tipo_feedback_enum = TipoFeedbackEnum(command.tipo_feedback)
-        except ValueError:
+        # Convertir string a enum
+        tipo_feedback_enum = _TIPO_FEEDBACK_MAP.get(command.tipo_feedback)
+        if tipo_feedback_enum is None:
             raise ValueError(f"Tipo de feedback '{command.tipo_feedback}' no válido")
         
         # Crear el feedback como value object
@@ -69,13 +74,16 @@ class EnviarFeedbackCommandHandler(CommandHandler):
         # Actualizar el estado de la postulación según el feedback
         contacto_aggregate.actualizar_estado_postulacion()
         
-        # Guardar en repositorio
+        # Guardar en repositorio (una única transacción)
         contacto_id = self.contacto_repository.guardar(contacto_aggregate)
         
+        # Publicar los eventos de dominio solo después del commit
+        self.event_bus.publicar_todos(contacto_aggregate.pull_events())
+        
         return contacto_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActualizarEstadoContactoCommand(Command):
     """Comando para actualizar el estado de un contacto"""
     contacto_id: UUID
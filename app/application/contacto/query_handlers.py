@@ -7,10 +7,12 @@ from app.domain.contacto.entities import ContactoAggregate, FeedbackEnviado, Sol
 from app.domain.contacto.repositories import ContactoRepository
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObtenerContactosPostulacionQuery(Query):
     """Query para obtener contactos asociados a una postulación"""
     postulacion_id: UUID
+    limit: int = 100
+    offset: int = 0
 
 
 class ObtenerContactosPostulacionQueryHandler(QueryHandler):
@@ -25,7 +27,9 @@ class ObtenerContactosPostulacionQueryHandler(QueryHandler):
         """
         Maneja la consulta de contactos por postulación
         """
-        contactos = self.contacto_repository.obtener_por_postulacion(query.postulacion_id)
+        contactos = self.contacto_repository.obtener_por_postulacion_con_feedback(
+            query.postulacion_id, query.limit, query.offset
+        )
         
         # Construir respuesta
         resultado = []
@@ -49,14 +53,14 @@ class ObtenerContactosPostulacionQueryHandler(QueryHandler):
                 "cuenta_id": str(contacto.cuenta_id),
                 "tipo_mensaje": contacto.tipo_mensaje.value,
                 "motivo_rechazo": contacto.motivo_rechazo,
-                "fecha_hora": contacto.fecha_hora.isoformat(),
+                "fecha_hora": contacto.fecha_hora,
                 "ultimo_feedback": ultimo_feedback
             })
         
         return resultado
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObtenerContactoQuery(Query):
     """Query para obtener detalles de un contacto específico"""
     contacto_id: UUID
@@ -89,7 +93,7 @@ class ObtenerContactoQueryHandler(QueryHandler):
             "cuenta_id": str(contacto.cuenta_id),
             "tipo_mensaje": contacto.tipo_mensaje.value,
             "motivo_rechazo": contacto.motivo_rechazo,
-            "fecha_hora": contacto.fecha_hora.isoformat(),
+            "fecha_hora": contacto.fecha_hora,
             "feedbacks": [
                 {
                     "tipo": feedback.tipo.value,
@@ -106,6 +110,9 @@ class FeedbackEnviadoHandler(EventHandler):
     Manejador de eventos para FeedbackEnviado
     """
     
+    # Aún sin lógica: el event bus no lo registra y publicar no paga su llamada
+    es_noop = True
+    
     def handle(self, event: FeedbackEnviado) -> None:
         """
         Maneja el evento de feedback enviado
@@ -120,6 +127,9 @@ class SolicitudCambioEstadoPostulacionHandler(EventHandler):
     Manejador de eventos para SolicitudCambioEstadoPostulacion
     """
     
+    # Aún sin lógica: el event bus no lo registra y publicar no paga su llamada
+    es_noop = True
+    
     def handle(self, event: SolicitudCambioEstadoPostulacion) -> None:
         """
         Maneja el evento que solicita cambio de estado en una postulación
@@ -0,0 +1,45 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Type
+
+from app.domain.common import EventHandler
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    Bus de eventos de dominio en proceso.
+    Los command handlers publican los eventos del agregado después del commit,
+    de modo que los suscriptores nunca ven cambios que no se persistieron.
+    """
+    
+    def __init__(self):
+        self._suscriptores: Dict[Type, List[EventHandler]] = defaultdict(list)
+    
+    def suscribir(self, tipo_evento: Type, handler: EventHandler) -> None:
+        """
+        Registra un manejador para un tipo de evento.
+        Los manejadores marcados con es_noop = True no se registran, así
+        publicar no paga una llamada por cada evento que no hace nada.
+        """
+        if getattr(handler, "es_noop", False):
+            logger.debug(f"{type(handler).__name__} es un no-op; no se suscribe a {tipo_evento.__name__}")
+            return
+        self._suscriptores[tipo_evento].append(handler)
+    
+    def publicar(self, evento) -> None:
+        """Entrega un evento a sus manejadores; un fallo no interrumpe al resto"""
+        for handler in self._suscriptores.get(type(evento), ()):
+            try:
+                handler.handle(evento)
+            except Exception as e:
+                logger.error(f"Error manejando {type(evento).__name__} en {type(handler).__name__}: {e}")
+    
+    def publicar_todos(self, eventos: Iterable) -> None:
+        """Publica una secuencia de eventos en orden"""
+        for evento in eventos:
+            self.publicar(evento)
+
+
+event_bus = EventBus()
@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 from uuid import UUID
@@ -7,10 +8,17 @@ from app.domain.iam.entities import (
     CuentaAggregate, Cuenta, RolEnum, EstadoCuentaEnum
 )
 from app.domain.iam.repositories import CuentaRepository
+from app.infrastructure.cache.redis_cache import obtener_cliente_redis
+from app.infrastructure.iam.escritura_por_lotes import GuardadoCuentasPorLotes, guardado_cuentas_por_lotes
 from app.infrastructure.iam.security import TokenManager, PasswordManager
+from app.application.iam.query_handlers import invalidar_cache_cuenta
 
 
-@dataclass
+# Tabla precalculada nombre de rol -> enum
+_ROL_MAP = {nombre.lower(): miembro for nombre, miembro in RolEnum.__members__.items()}
+
+
+@dataclass(slots=True, frozen=True)
 class CrearCuentaCommand(Command):
     """Comando para crear una nueva cuenta"""
     nombre_completo: str
@@ -25,14 +33,15 @@ class CrearCuentaCommand(Command):
 class CrearCuentaHandler(CommandHandler):
     """Manejador del comando para crear una cuenta"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(self, cuenta_repository: CuentaRepository, cache=None):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
     
-    def handle(self, command: CrearCuentaCommand) -> Dict[str, Any]:
+    async def handle(self, command: CrearCuentaCommand) -> Dict[str, Any]:
         """Maneja el comando de creación de cuenta"""
         
         # Validar que el email no exista
-        if self.cuenta_repository.verificar_email_existe(command.email):
+        if await asyncio.to_thread(self.cuenta_repository.verificar_email_existe, command.email):
             raise ValueError("El email ya está registrado")
         
         # Validar que la contraseña sea fuerte
@@ -43,10 +52,12 @@ class CrearCuentaHandler(CommandHandler):
             )
         
         # Hashear contraseña
-        hash_password = PasswordManager.hashear_password(command.password)
+        hash_password = await PasswordManager.hashear_password_async(command.password)
         
         # Mapear rol string a enum
-        rol_enum = RolEnum[command.rol.upper()]
+        rol_enum = _ROL_MAP.get(command.rol.lower())
+        if rol_enum is None:
+            raise ValueError(f"Rol '{command.rol}' no válido")
         
         # Crear entidad Cuenta
         cuenta = Cuenta(
@@ -69,7 +80,9 @@ class CrearCuentaHandler(CommandHandler):
         )
         
         # Guardar en repositorio
-        cuenta_id = self.cuenta_repository.guardar(cuenta_aggregate)
+        cuenta_id = await asyncio.to_thread(self.cuenta_repository.guardar, cuenta_aggregate)
+        if self.cache is not None:
+            await asyncio.to_thread(invalidar_cache_cuenta, self.cache, cuenta_id, command.email)
         
         # Retornar respuesta
         return {
@@ -83,7 +96,7 @@ class CrearCuentaHandler(CommandHandler):
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GenerarTokenCommand(Command):
     """Comando para generar un token de acceso"""
     cuenta_id: UUID
@@ -141,7 +154,7 @@ class GenerarTokenHandler(CommandHandler):
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerificarCuentaCommand(Command):
     """Comando para verificar una cuenta"""
     cuenta_id: UUID
@@ -151,8 +164,9 @@ class VerificarCuentaCommand(Command):
 class VerificarCuentaHandler(CommandHandler):
     """Manejador del comando para verificar una cuenta"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(self, cuenta_repository: CuentaRepository, cache=None):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
     
     def handle(self, command: VerificarCuentaCommand) -> bool:
         """Maneja el comando de verificación de cuenta"""
@@ -171,11 +185,14 @@ class VerificarCuentaHandler(CommandHandler):
         
         # Guardar cambios
         self.cuenta_repository.guardar(cuenta_aggregate)
+        invalidar_cache_cuenta(
+            self.cache, command.cuenta_id, cuenta_aggregate.cuenta.credencial.email
+        )
         
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LoginCommand(Command):
     """Comando para login de un usuario"""
     email: str
@@ -185,26 +202,40 @@ class LoginCommand(Command):
 class LoginHandler(CommandHandler):
     """Manejador del comando para login"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(
+        self,
+        cuenta_repository: CuentaRepository,
+        cache=None,
+        guardado_por_lotes: Optional[GuardadoCuentasPorLotes] = None
+    ):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
+        # Las escrituras de login de peticiones concurrentes se agrupan en lotes
+        self.guardado_por_lotes = guardado_por_lotes or guardado_cuentas_por_lotes
     
-    def handle(self, command: LoginCommand) -> Dict[str, Any]:
+    async def handle(self, command: LoginCommand) -> Dict[str, Any]:
         """Maneja el comando de login"""
         
         # Recuperar la cuenta por email
-        cuenta_aggregate = self.cuenta_repository.obtener_por_email(command.email)
+        cuenta_aggregate = await asyncio.to_thread(self.cuenta_repository.obtener_por_email, command.email)
         
         if not cuenta_aggregate:
             raise ValueError("Email o contraseña incorrectos")
         
         # Verificar contraseña
-        if not PasswordManager.verificar_password(
+        if not await PasswordManager.verificar_password_async(
             command.password,
             cuenta_aggregate.cuenta.credencial.hash_password
         ):
-            # Registrar intento fallido
-            cuenta_aggregate.aplicar_intento_fallido()
-            self.cuenta_repository.guardar(cuenta_aggregate)
+            # Registrar intento fallido antes de responder: el contador se
+            # incrementa en la base de datos para que intentos concurrentes
+            # no se pisen y la suspensión se decide con el total resultante
+            intentos = await asyncio.to_thread(
+                self.cuenta_repository.incrementar_intentos_fallidos, cuenta_aggregate.cuenta.cuenta_id
+            )
+            cuenta_aggregate.aplicar_intento_fallido(intentos)
+            await asyncio.to_thread(self.cuenta_repository.guardar_intento_fallido, cuenta_aggregate)
+            await self._invalidar_cache(cuenta_aggregate)
             raise ValueError("Email o contraseña incorrectos")
         
         # Verificar estado de la cuenta
@@ -244,8 +275,8 @@ class LoginHandler(CommandHandler):
             minutos_expiracion=60*24*7
         )
         
-        # Guardar cambios
-        self.cuenta_repository.guardar(cuenta_aggregate)
+        # Guardar todos los cambios del login en una sola escritura
+        await self._persistir(cuenta_aggregate)
         
         return {
             "access_token": access_token,
@@ -255,9 +286,22 @@ class LoginHandler(CommandHandler):
             "email": command.email,
             "rol": cuenta_aggregate.cuenta.rol.value
         }
+    
+    async def _persistir(self, cuenta_aggregate: CuentaAggregate) -> None:
+        """Guarda el agregado en el siguiente lote e invalida las consultas cacheadas de la cuenta"""
+        await self.guardado_por_lotes.guardar(cuenta_aggregate)
+        await self._invalidar_cache(cuenta_aggregate)
+    
+    async def _invalidar_cache(self, cuenta_aggregate: CuentaAggregate) -> None:
+        """Invalida las consultas cacheadas de la cuenta fuera del event loop"""
+        if self.cache is not None:
+            await asyncio.to_thread(
+                invalidar_cache_cuenta,
+                self.cache, cuenta_aggregate.cuenta.cuenta_id, cuenta_aggregate.cuenta.credencial.email
+            )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CambiarPasswordCommand(Command):
     """Comando para cambiar la contraseña"""
     cuenta_id: UUID
@@ -268,20 +312,21 @@ class CambiarPasswordCommand(Command):
 class CambiarPasswordHandler(CommandHandler):
     """Manejador del comando para cambiar contraseña"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(self, cuenta_repository: CuentaRepository, cache=None):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
     
-    def handle(self, command: CambiarPasswordCommand) -> bool:
+    async def handle(self, command: CambiarPasswordCommand) -> bool:
         """Maneja el comando de cambio de contraseña"""
         
         # Recuperar la cuenta
-        cuenta_aggregate = self.cuenta_repository.obtener_por_id(command.cuenta_id)
+        cuenta_aggregate = await asyncio.to_thread(self.cuenta_repository.obtener_por_id, command.cuenta_id)
         
         if not cuenta_aggregate:
             raise ValueError(f"Cuenta no encontrada: {command.cuenta_id}")
         
         # Verificar contraseña actual
-        if not PasswordManager.verificar_password(
+        if not await PasswordManager.verificar_password_async(
             command.password_actual,
             cuenta_aggregate.cuenta.credencial.hash_password
         ):
@@ -295,12 +340,17 @@ class CambiarPasswordHandler(CommandHandler):
             )
         
         # Hashear nueva contraseña
-        nuevo_hash = PasswordManager.hashear_password(command.password_nuevo)
+        nuevo_hash = await PasswordManager.hashear_password_async(command.password_nuevo)
         
         # Aplicar cambio de contraseña
         cuenta_aggregate.aplicar_cambio_password(nuevo_hash)
         
         # Guardar cambios
-        self.cuenta_repository.guardar(cuenta_aggregate)
+        await asyncio.to_thread(self.cuenta_repository.guardar, cuenta_aggregate)
+        if self.cache is not None:
+            await asyncio.to_thread(
+                invalidar_cache_cuenta,
+                self.cache, command.cuenta_id, cuenta_aggregate.cuenta.credencial.email
+            )
         
         return True
@@ -4,10 +4,46 @@ from uuid import UUID
 
 from app.domain.common import Query, QueryHandler
 from app.domain.iam.repositories import CuentaRepository
+from app.config import settings
+from app.infrastructure.cache.redis_cache import (
+    obtener_cliente_redis, cache_obtener, cache_guardar, cache_invalidar
+)
 from app.infrastructure.iam.security import TokenManager
 
 
-@dataclass
+def clave_cuenta_por_id(cuenta_id: Any) -> str:
+    """Clave de cache para la consulta de cuenta por ID"""
+    return f"iam:cuenta:id:{cuenta_id}"
+
+
+def clave_cuenta_por_email(email: str) -> str:
+    """Clave de cache para la consulta de cuenta por email"""
+    return f"iam:cuenta:email:{email}"
+
+
+def invalidar_cache_cuenta(cache, cuenta_id: Any, email: str) -> None:
+    """Invalida las consultas cacheadas de una cuenta tras una escritura"""
+    cache_invalidar(cache, clave_cuenta_por_id(cuenta_id), clave_cuenta_por_email(email))
+
+
+def _cuenta_a_dict(cuenta) -> Dict[str, Any]:
+    """Representación de lectura de una cuenta, común a las consultas por ID y por email"""
+    return {
+        "cuenta_id": str(cuenta.cuenta_id),
+        "nombre_completo": cuenta.nombre_completo,
+        "email": cuenta.credencial.email,
+        "carrera": cuenta.carrera,
+        "telefono": cuenta.telefono,
+        "ciudad": cuenta.ciudad,
+        "rol": cuenta.rol.value,
+        "estado": cuenta.estado.value,
+        "fecha_creacion": cuenta.fecha_creacion,
+        "fecha_actualizacion": cuenta.fecha_actualizacion,
+        "fecha_primer_acceso": cuenta.fecha_primer_acceso
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class ObtenerCuentaQuery(Query):
     """Query para obtener una cuenta por ID"""
     cuenta_id: UUID
@@ -16,35 +52,31 @@ class ObtenerCuentaQuery(Query):
 class ObtenerCuentaQueryHandler(QueryHandler):
     """Manejador de consulta para obtener una cuenta"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(self, cuenta_repository: CuentaRepository, cache=None):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
     
     def handle(self, query: ObtenerCuentaQuery) -> Optional[Dict[str, Any]]:
         """Maneja la consulta de cuenta por ID"""
         
+        clave = clave_cuenta_por_id(query.cuenta_id)
+        cacheado = cache_obtener(self.cache, clave)
+        if cacheado is not None:
+            return cacheado
+        
         cuenta_aggregate = self.cuenta_repository.obtener_por_id(query.cuenta_id)
         
         if not cuenta_aggregate:
             return None
         
-        cuenta = cuenta_aggregate.cuenta
+        resultado = _cuenta_a_dict(cuenta_aggregate.cuenta)
         
-        return {
-            'cuenta_id': str(cuenta.cuenta_id),
-            'nombre_completo': cuenta.nombre_completo,
-            'carrera': cuenta.carrera,
-            'telefono': cuenta.telefono,
-            'ciudad': cuenta.ciudad,
-            "email": cuenta.credencial.email,
-            "rol": cuenta.rol.value,
-            "estado": cuenta.estado.value,
-            "fecha_creacion": cuenta.fecha_creacion,
-            "fecha_actualizacion": cuenta.fecha_actualizacion,
-            "fecha_primer_acceso": cuenta.fecha_primer_acceso
-        }
+        cache_guardar(self.cache, clave, resultado, settings.CACHE_CUENTA_TTL)
+        
+        return resultado
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObtenerCuentaPorEmailQuery(Query):
     """Query para obtener una cuenta por email"""
     email: str
@@ -53,38 +85,31 @@ class ObtenerCuentaPorEmailQuery(Query):
 class ObtenerCuentaPorEmailQueryHandler(QueryHandler):
     """Manejador de consulta para obtener una cuenta por email"""
     
-    def __init__(self, cuenta_repository: CuentaRepository):
+    def __init__(self, cuenta_repository: CuentaRepository, cache=None):
         self.cuenta_repository = cuenta_repository
+        self.cache = cache if cache is not None else obtener_cliente_redis()
     
     def handle(self, query: ObtenerCuentaPorEmailQuery) -> Optional[Dict[str, Any]]:
         """Maneja la consulta de cuenta por email"""
         
+        clave = clave_cuenta_por_email(query.email)
+        cacheado = cache_obtener(self.cache, clave)
+        if cacheado is not None:
+            return cacheado
+        
         cuenta_aggregate = self.cuenta_repository.obtener_por_email(query.email)
         
         if not cuenta_aggregate:
             return None
         
-        cuenta = cuenta_aggregate.cuenta
+        resultado = _cuenta_a_dict(cuenta_aggregate.cuenta)
         
-        return {
-            "cuenta_id": str(cuenta.cuenta_id),
-            "nombre_completo": cuenta.nombre_completo,
-            "email": cuenta.credencial.email,
-            "carrera": cuenta.carrera,
-            "telefono": cuenta.telefono,
-            "ciudad": cuenta.ciudad,
-            "rol": cuenta.rol.value,
-            "estado": cuenta.estado.value,
-            "fecha_creacion": cuenta.fecha_creacion,
-            "fecha_actualizacion": cuenta.fecha_actualizacion,
-            "fecha_primer_acceso": cuenta.fecha_primer_acceso
-        }
-
-
-
+        cache_guardar(self.cache, clave, resultado, settings.CACHE_CUENTA_TTL)
+        
+        return resultado
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerificarTokenQuery(Query):
     """Query para verificar un token"""
     token: str
@@ -99,6 +124,7 @@ class VerificarTokenQueryHandler(QueryHandler):
     def handle(self, query: VerificarTokenQuery) -> Optional[Dict[str, Any]]:
         """Maneja la consulta de verificación de token"""
         
+        # TokenManager cachea los payloads verificados para todos los consumidores
         payload = TokenManager.verificar_token(query.token)
         
         if not payload:
@@ -113,7 +139,7 @@ class VerificarTokenQueryHandler(QueryHandler):
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ListarCuentasQuery(Query):
     """Query para listar todas las cuentas"""
     pass
@@ -128,19 +154,5 @@ class ListarCuentasQueryHandler(QueryHandler):
     def handle(self, query: ListarCuentasQuery) -> List[Dict[str, Any]]:
         """Maneja la consulta de listado de cuentas"""
         
-        cuentas_aggregate = self.cuenta_repository.listar_todas()
-        
-        return [
-            {
-                'cuenta_id': str(agg.cuenta.cuenta_id),
-                'nombre_completo': agg.cuenta.nombre_completo,
-                'carrera': agg.cuenta.carrera,
-                'telefono': agg.cuenta.telefono,
-                'ciudad': agg.cuenta.ciudad,
-                "email": agg.cuenta.credencial.email,
-                "rol": agg.cuenta.rol.value,
-                "estado": agg.cuenta.estado.value,
-                "fecha_creacion": agg.cuenta.fecha_creacion
-            }
-            for agg in cuentas_aggregate
-        ]
+        # Proyección de lectura: una sola consulta, sin hidratar tokens ni historial
+        return self.cuenta_repository.listar_proyeccion_cuentas()
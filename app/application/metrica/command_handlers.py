@@ -1,13 +1,25 @@
+import time
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
 from uuid import UUID
 
 from app.domain.common import Command, CommandHandler, EventHandler
 from app.domain.metrica.entities import MetricaAggregate, MetricaRegistro
 from app.domain.metrica.repositories import MetricaRepository
 from app.domain.iam.entities import CuentaAggregate
-
-@dataclass
+from app.domain.postulacion.entities import PostulacionCreada, EstadoPostulacionActualizado
+from app.application.metrica.query_handlers import metricas_cache, cachear_metricas, metricas_a_dict
+
+# Valores devueltos cuando la cuenta no tiene métricas; se copia en cada uso
+_DEFAULT_METRICAS = {
+    "total_postulaciones": 0,
+    "total_entrevistas": 0,
+    "total_exitos": 0,
+    "total_rechazos": 0,
+    "tasa_exito": 0.0
+}
+
+@dataclass(slots=True, frozen=True)
 class RecalcularMetricasCommand(Command):
     """Comando para recalcular las métricas de un postulante"""
     cuenta_id: UUID
@@ -29,44 +41,32 @@ class RecalcularMetricasHandler(CommandHandler):
         de las postulaciones, en lugar de actualizar un registro almacenado. Las métricas
         son calculadas en tiempo real y no se persisten como estado.
         """
-        # Obtener el agregado de métricas calculado en tiempo real
-        metrica_aggregate = self.metrica_repository.obtener_por_postulante(command.cuenta_id)
+        # Cuentas sin postulaciones: una consulta de existencia basta y se
+        # devuelven los valores por defecto sin calcular el agregado
+        if not self.metrica_repository.tiene_postulaciones(command.cuenta_id):
+            metricas_cache.invalidar(str(command.cuenta_id))
+            resultado = _DEFAULT_METRICAS.copy()
+            resultado["cuenta_id"] = str(command.cuenta_id)
+            return resultado
         
-        if not metrica_aggregate:
-            # Si no hay postulaciones para esta cuenta, devolver valores por defecto
-            return {
-                "cuenta_id": str(command.cuenta_id),
-                "total_postulaciones": 0,
-                "total_entrevistas": 0,
-                "total_exitos": 0,
-                "total_rechazos": 0,
-                "tasa_exito": 0.0
-            }
+        # Obtener el agregado de métricas calculado en tiempo real; el recálculo
+        # ignora el cache y deja el resultado fresco para las consultas siguientes
+        metrica_aggregate = self.metrica_repository.obtener_por_postulante(command.cuenta_id)
+        cachear_metricas(command.cuenta_id, time.time(), metrica_aggregate)
         
         # Devolver las métricas calculadas
-        return {
-            "cuenta_id": str(metrica_aggregate.metrica_registro.cuenta_id),
-            "total_postulaciones": metrica_aggregate.metrica_registro.total_postulaciones,
-            "total_entrevistas": metrica_aggregate.metrica_registro.total_entrevistas,
-            "total_exitos": metrica_aggregate.metrica_registro.total_exitos,
-            "total_rechazos": metrica_aggregate.metrica_registro.total_rechazos,
-            "tasa_exito": metrica_aggregate.metrica_registro.tasa_exito
-        }
+        return metricas_a_dict(metrica_aggregate.metrica_registro)
 
 
 # Manejadores de eventos del bounded context de Postulación
-@dataclass
-class PostulacionCreada:
-    """Evento que se emite cuando se crea una nueva postulación"""
-    postulacion_id: UUID
-    candidato_id: UUID
-
-
 class OnPostulacionCreadaHandler(EventHandler):
     """
     Manejador del evento PostulacionCreada para actualizar métricas
     """
     
+    # Aún sin lógica: el event bus no lo registra y publicar no paga su llamada
+    es_noop = True
+    
     def __init__(self, metrica_repository: MetricaRepository):
         self.metrica_repository = metrica_repository
     
@@ -78,17 +78,8 @@ class OnPostulacionCreadaHandler(EventHandler):
         no necesita realizar ninguna acción, ya que las métricas se calculan bajo demanda
         cuando son consultadas. Se mantiene por compatibilidad con la arquitectura de eventos.
         """
-        # Las métricas ahora se calculan en tiempo real bajo demanda, 
-        # no hay necesidad de actualizar ningún registro almacenado
-
-
-@dataclass
-class EstadoPostulacionActualizado:
-    """Evento que se emite cuando cambia el estado de una postulación"""
-    postulacion_id: UUID
-    candidato_id: UUID
-    estado_anterior: str
-    estado_nuevo: str
+        # El cache de métricas lo mantiene PostulacionCreadaHandler (postulación)
+        pass
 
 
 class OnEstadoPostulacionActualizadoHandler(EventHandler):
@@ -96,6 +87,9 @@ class OnEstadoPostulacionActualizadoHandler(EventHandler):
     Manejador del evento EstadoPostulacionActualizado para actualizar métricas
     """
     
+    # Aún sin lógica: el event bus no lo registra y publicar no paga su llamada
+    es_noop = True
+    
     def __init__(self, metrica_repository: MetricaRepository):
         self.metrica_repository = metrica_repository
     
@@ -108,13 +102,11 @@ class OnEstadoPostulacionActualizadoHandler(EventHandler):
         automáticamente cuando se consultan las métricas. Se mantiene por compatibilidad
         con la arquitectura de eventos.
         """
-        # Las métricas ahora se calculan en tiempo real basadas en el estado actual
-        # de las postulaciones, por lo que no necesitamos mantener ningún registro
-        # de métricas actualizado
+        # El cache de métricas lo mantiene EstadoPostulacionActualizadoHandler (postulación)
+        pass
 
 
-@dataclass
-class PostulacionEliminada:
+class PostulacionEliminada(NamedTuple):
     """Evento que se emite cuando se elimina una postulación"""
     postulacion_id: UUID
     candidato_id: UUID
@@ -125,6 +117,9 @@ class OnPostulacionEliminadaHandler(EventHandler):
     Manejador del evento PostulacionEliminada para actualizar métricas
     """
     
+    # Aún sin lógica: el event bus no lo registra y publicar no paga su llamada
+    es_noop = True
+    
     def __init__(self, metrica_repository: MetricaRepository):
         self.metrica_repository = metrica_repository
     
@@ -137,5 +132,5 @@ class OnPostulacionEliminadaHandler(EventHandler):
         se refleja automáticamente cuando se consultan las métricas. Se mantiene por
         compatibilidad con la arquitectura de eventos.
         """
-        # Las métricas ahora se calculan en tiempo real, por lo que la eliminación
-        # de una postulación se refleja automáticamente al calcular métricas
\ No newline at end of file
+        # Las métricas ahora se calculan en tiempo real bajo demanda
+        pass
@@ -1,12 +1,124 @@
+import threading
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from app.domain.common import Query, QueryHandler
+from app.domain.metrica.entities import MetricaAggregate, MetricaRegistro
 from app.domain.metrica.repositories import MetricaRepository
+from app.domain.postulacion.entities import EstadoPostulacionEnum
+from app.infrastructure.cache.memoria import CacheTTL
 
 
-@dataclass
+# Agregados de métricas recientes por cuenta, compartidos por los handlers de
+# métricas, como tuplas (timestamp epoch tomado al terminar la lectura, agregado). Los
+# manejadores de eventos de postulación ajustan o invalidan la entrada de la
+# cuenta afectada; el TTL acota el desfase en el resto de casos.
+metricas_cache = CacheTTL(maxsize=10_000, ttl=5)
+
+
+def cachear_metricas(cuenta_id: UUID, leido_en: float, metrica_aggregate: MetricaAggregate) -> None:
+    """Guarda el agregado junto con el instante en que terminó la lectura que lo calculó"""
+    metricas_cache.guardar(str(cuenta_id), (leido_en, metrica_aggregate))
+
+
+def obtener_metricas_cacheadas(
+    metrica_repository: MetricaRepository, cuenta_id: UUID
+) -> Optional[MetricaAggregate]:
+    """Devuelve el agregado de métricas de la cuenta, calculándolo solo si no está en cache"""
+    entrada = metricas_cache.obtener(str(cuenta_id))
+    if entrada is not None:
+        return entrada[1]
+    
+    metrica_aggregate = metrica_repository.obtener_por_postulante(cuenta_id)
+    if metrica_aggregate is not None:
+        # Se marca al terminar la lectura: su snapshot es anterior a este instante
+        cachear_metricas(cuenta_id, time.time(), metrica_aggregate)
+    return metrica_aggregate
+
+
+# Contador de obtener_metricas_completas que suma cada estado de postulación;
+# los estados que no aparecen solo cuentan en el total de postulaciones
+_CONTADOR_POR_ESTADO = {
+    EstadoPostulacionEnum.ENTREVISTA.value: "entrevistas",
+    EstadoPostulacionEnum.OFERTA.value: "exitos",
+    EstadoPostulacionEnum.RECHAZADO.value: "rechazos",
+    EstadoPostulacionEnum.RECHAZO.value: "rechazos",
+}
+
+# Serializa los ajustes de una entrada cacheada (leer, ajustar y guardar)
+_ajuste_lock = threading.Lock()
+
+
+def ajustar_metricas_cacheadas(
+    metrica_repository: MetricaRepository,
+    cuenta_id: UUID,
+    estado_anterior: Optional[str],
+    estado_nuevo: str,
+    marca: Optional[float] = None
+) -> None:
+    """
+    Aplica a las métricas cacheadas de la cuenta el alta (estado_anterior
+    None) o el cambio de estado de una postulación sin volver a contar sus
+    postulaciones. Si la cuenta no está en cache no hay nada que ajustar:
+    la próxima consulta calcula las métricas completas.
+    
+    marca es un instante anterior al commit del cambio. Solo una entrada
+    cuya lectura terminó antes de marca excluye el cambio con seguridad; si
+    terminó después puede incluirlo ya, así que se descarta en lugar de
+    ajustarla para no contar la postulación dos veces.
+    """
+    clave = str(cuenta_id)
+    with _ajuste_lock:
+        entrada = metricas_cache.obtener(clave)
+        if entrada is None:
+            return
+        
+        leido_en, metrica_aggregate = entrada
+        if marca is None or leido_en >= marca:
+            metricas_cache.invalidar(clave)
+            return
+        
+        registro = metrica_aggregate.metrica_registro
+        metricas = {
+            "postulaciones": registro.total_postulaciones,
+            "entrevistas": registro.total_entrevistas,
+            "exitos": registro.total_exitos,
+            "rechazos": registro.total_rechazos
+        }
+        
+        if estado_anterior is None:
+            metricas["postulaciones"] += 1
+        elif estado_anterior in _CONTADOR_POR_ESTADO:
+            metricas[_CONTADOR_POR_ESTADO[estado_anterior]] -= 1
+        if estado_nuevo in _CONTADOR_POR_ESTADO:
+            metricas[_CONTADOR_POR_ESTADO[estado_nuevo]] += 1
+        
+        # Se guarda un agregado nuevo: quien ya leyó el anterior no lo ve cambiar.
+        # Conserva el instante de la lectura original, que sigue siendo su base
+        cachear_metricas(cuenta_id, leido_en, metrica_repository.construir_agregado(cuenta_id, metricas))
+
+
+def metricas_a_dict(registro: MetricaRegistro) -> Dict[str, Any]:
+    """Representación de respuesta de un registro de métricas"""
+    return {
+        "cuenta_id": registro.cuenta_id_str,
+        "total_postulaciones": registro.total_postulaciones,
+        "total_entrevistas": registro.total_entrevistas,
+        "total_exitos": registro.total_exitos,
+        "total_rechazos": registro.total_rechazos,
+        "tasa_exito": registro.tasa_exito
+    }
+
+
+def _leer_contador(metrica_repository: MetricaRepository, postulante_id: UUID, campo: str) -> int:
+    """Lee un contador del registro de métricas cacheado; 0 si la cuenta no tiene métricas"""
+    metrica_aggregate = obtener_metricas_cacheadas(metrica_repository, postulante_id)
+    return getattr(metrica_aggregate.metrica_registro, campo) if metrica_aggregate else 0
+
+
+@dataclass(slots=True, frozen=True)
 class ConsultarResumenMetricasQuery(Query):
     """Query para consultar el resumen de métricas de un postulante"""
     cuenta_id: UUID
@@ -28,23 +140,16 @@ class ConsultarResumenMetricasHandler(QueryHandler):
         de las postulaciones en lugar de recuperarse de registros almacenados previamente.
         """
         # Calcular el agregado de métricas del postulante en tiempo real
-        metrica_aggregate = self.metrica_repository.obtener_por_postulante(query.cuenta_id)
+        metrica_aggregate = obtener_metricas_cacheadas(self.metrica_repository, query.cuenta_id)
         
         if not metrica_aggregate:
             return None
         
         # Construir respuesta
-        return {
-            "cuenta_id": str(metrica_aggregate.metrica_registro.cuenta_id),
-            "total_postulaciones": metrica_aggregate.metrica_registro.total_postulaciones,
-            "total_entrevistas": metrica_aggregate.metrica_registro.total_entrevistas,
-            "total_exitos": metrica_aggregate.metrica_registro.total_exitos,
-            "total_rechazos": metrica_aggregate.metrica_registro.total_rechazos,
-            "tasa_exito": metrica_aggregate.metrica_registro.tasa_exito
-        }
+        return metricas_a_dict(metrica_aggregate.metrica_registro)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ListarLogrosQuery(Query):
     """Query para listar los logros de un postulante"""
     cuenta_id: UUID
@@ -62,25 +167,37 @@ class ListarLogrosHandler(QueryHandler):
         """
         Maneja la consulta de logros
         """
-        # Recuperar el agregado de métricas del postulante
-        metrica_aggregate = self.metrica_repository.obtener_por_postulante(query.cuenta_id)
-        
-        if not metrica_aggregate:
-            return []
-        
-        # Construir respuesta
-        return [
-            {
-                "id_logro": str(logro.id_logro),
-                "nombre_logro": logro.nombre_logro,
-                "umbral": logro.umbral,
-                "fecha_obtencion": logro.fecha_obtencion.isoformat()
-            }
-            for logro in metrica_aggregate.lista_logros
-        ]
-
-
-@dataclass
+        # El repositorio devuelve los logros ya serializados desde la consulta agrupada
+        return self.metrica_repository.listar_logros_serializados(query.cuenta_id)
+
+
+class ContadorQueryHandler(QueryHandler):
+    """
+    Manejador genérico para los contadores de métricas.
+    Cada contador se define por el campo de MetricaRegistro que lee y la
+    etiqueta con la que se devuelve (total_<etiqueta>).
+    
+    Nota: El contador se calcula en tiempo real a partir del estado actual de
+    las postulaciones; se lee del agregado de métricas cacheado, que ya
+    incluye todos los conteos.
+    """
+    
+    campo: str = ""
+    etiqueta: str = ""
+    
+    def __init__(self, metrica_repository: MetricaRepository):
+        self.metrica_repository = metrica_repository
+        self._clave_total = f"total_{self.etiqueta}"
+    
+    def handle(self, query) -> Dict[str, Any]:
+        """Maneja la consulta del contador"""
+        return {
+            "postulante_id": str(query.postulante_id),
+            self._clave_total: _leer_contador(self.metrica_repository, query.postulante_id, self.campo)
+        }
+
+
+@dataclass(slots=True, frozen=True)
 class ContadorOfertasQuery(Query):
     """
     Query para consultar el contador de ofertas alcanzadas
@@ -89,30 +206,16 @@ class ContadorOfertasQuery(Query):
     postulante_id: UUID
 
 
-class ContadorOfertasQueryHandler(QueryHandler):
+class ContadorOfertasQueryHandler(ContadorQueryHandler):
     """
     Manejador para consultar el contador de ofertas alcanzadas
     """
     
-    def __init__(self, metrica_repository: MetricaRepository):
-        self.metrica_repository = metrica_repository
-    
-    def handle(self, query: ContadorOfertasQuery) -> Dict[str, Any]:
-        """
-        Maneja la consulta del contador de ofertas
-        
-        Nota: El contador se calcula en tiempo real contando las postulaciones
-        que actualmente tienen estado 'oferta' en lugar de recuperar un valor almacenado.
-        """
-        total_ofertas = self.metrica_repository.obtener_contador_ofertas(query.postulante_id)
-        
-        return {
-            "postulante_id": str(query.postulante_id),
-            "total_ofertas": total_ofertas
-        }
+    campo = "total_exitos"
+    etiqueta = "ofertas"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContadorEntrevistasQuery(Query):
     """
     Query para consultar el contador de entrevistas obtenidas
@@ -121,30 +224,16 @@ class ContadorEntrevistasQuery(Query):
     postulante_id: UUID
 
 
-class ContadorEntrevistasQueryHandler(QueryHandler):
+class ContadorEntrevistasQueryHandler(ContadorQueryHandler):
     """
     Manejador para consultar el contador de entrevistas obtenidas
     """
     
-    def __init__(self, metrica_repository: MetricaRepository):
-        self.metrica_repository = metrica_repository
-    
-    def handle(self, query: ContadorEntrevistasQuery) -> Dict[str, Any]:
-        """
-        Maneja la consulta del contador de entrevistas
-        
-        Nota: El contador se calcula en tiempo real contando las postulaciones
-        que actualmente tienen estado 'entrevista' en lugar de recuperar un valor almacenado.
-        """
-        total_entrevistas = self.metrica_repository.obtener_contador_entrevistas(query.postulante_id)
-        
-        return {
-            "postulante_id": str(query.postulante_id),
-            "total_entrevistas": total_entrevistas
-        }
+    campo = "total_entrevistas"
+    etiqueta = "entrevistas"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContadorRechazosQuery(Query):
     """
     Query para consultar el contador de rechazos acumulados
@@ -153,24 +242,10 @@ class ContadorRechazosQuery(Query):
     postulante_id: UUID
 
 
-class ContadorRechazosQueryHandler(QueryHandler):
+class ContadorRechazosQueryHandler(ContadorQueryHandler):
     """
     Manejador para consultar el contador de rechazos acumulados
     """
     
-    def __init__(self, metrica_repository: MetricaRepository):
-        self.metrica_repository = metrica_repository
-    
-    def handle(self, query: ContadorRechazosQuery) -> Dict[str, Any]:
-        """
-        Maneja la consulta del contador de rechazos
-        
-        Nota: El contador se calcula en tiempo real contando las postulaciones
-        que actualmente tienen estado 'rechazado' en lugar de recuperar un valor almacenado.
-        """
-        total_rechazos = self.metrica_repository.obtener_contador_rechazos(query.postulante_id)
-        
-        return {
-            "postulante_id": str(query.postulante_id),
-            "total_rechazos": total_rechazos
-        }
\ No newline at end of file
+    campo = "total_rechazos"
+    etiqueta = "rechazos"
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 from uuid import UUID
 
+from app.application.event_bus import EventBus, event_bus as bus_por_defecto
 from app.domain.common import Command, CommandHandler
 from app.domain.postulacion.entities import (
     Postulacion, PuestoPostulacion, PostulacionAggregate, 
@@ -12,12 +13,12 @@ from app.domain.postulacion.repositories import PostulacionRepository, PuestoPos
 from app.domain.puesto.repositories import PuestoRepository
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PostularCommand(Command):
     """Comando para postular a un puesto"""
     candidato_id: UUID
     puesto_id: UUID
-    documentos_adjuntos: List[Dict[str, Any]] = None
+    documentos_adjuntos: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class PostularHandler(CommandHandler):
@@ -27,20 +28,18 @@ class PostularHandler(CommandHandler):
     
     def __init__(self, 
                  postulacion_repository: PostulacionRepository,
-                 puesto_repository: PuestoRepository = None):
+                 puesto_repository: PuestoRepository = None,
+                 event_bus: Optional[EventBus] = None):
         self.postulacion_repository = postulacion_repository
-        # Usar PuestoRepository si se proporciona, si no usar el anterior
+        self.event_bus = event_bus or bus_por_defecto
+        # Se conserva por compatibilidad: la validación del puesto la hace
+        # el repositorio de postulaciones en la misma transacción del guardado
         self.puesto_repository = puesto_repository
     
     def handle(self, command: PostularCommand) -> UUID:
         """
         Maneja el comando de postulación
         """
-        # Validar que el puesto existe y está publicado
-        puesto = self.puesto_repository.obtener_por_id(command.puesto_id)
-        if not puesto or puesto.puesto.estado != "abierto":
-            raise ValueError("El puesto no existe o no está disponible para postulación")
-        
         # Crear nueva postulación
         postulacion = Postulacion(
             candidato_id=command.candidato_id,
@@ -61,13 +60,20 @@ class PostularHandler(CommandHandler):
         # Registrar la postulación inicial
         postulacion_aggregate.postularse()
         
-        # Guardar en repositorio
-        postulacion_id = self.postulacion_repository.guardar(postulacion_aggregate)
+        # Validar que el puesto existe y está publicado y guardar en una sola transacción
+        postulacion_id = self.postulacion_repository.crear_si_puesto_abierto(
+            command.puesto_id, postulacion_aggregate
+        )
+        if postulacion_id is None:
+            raise ValueError("El puesto no existe o no está disponible para postulación")
+        
+        # Publicar los eventos solo después del commit
+        self.event_bus.publicar_todos(postulacion_aggregate.pull_events())
         
         return postulacion_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActualizarEstadoCommand(Command):
     """Comando para actualizar el estado de una postulación"""
     postulacion_id: UUID
@@ -79,30 +85,29 @@ class ActualizarEstadoPostulacionHandler(CommandHandler):
     Manejador del comando para actualizar el estado de una postulación
     """
     
-    def __init__(self, postulacion_repository: PostulacionRepository):
+    def __init__(self, postulacion_repository: PostulacionRepository, event_bus: Optional[EventBus] = None):
         self.postulacion_repository = postulacion_repository
+        self.event_bus = event_bus or bus_por_defecto
     
     def handle(self, command: ActualizarEstadoCommand) -> bool:
         """
         Maneja el comando de actualización de estado
         """
-        # Recuperar la postulación
-        postulacion_aggregate = self.postulacion_repository.obtener_por_id(command.postulacion_id)
-        if not postulacion_aggregate:
+        # Validar y aplicar la transición con una sola escritura condicional
+        evento = self.postulacion_repository.transicionar_estado(
+            command.postulacion_id, command.nuevo_estado
+        )
+        if evento is None:
             raise ValueError(f"No existe una postulación con ID {command.postulacion_id}")
-        
-        # Intentar cambiar el estado
-        resultado = postulacion_aggregate.cambiar_estado(command.nuevo_estado)
-        if not resultado:
+        if evento is False:
             return False
         
-        # Guardar los cambios
-        self.postulacion_repository.guardar(postulacion_aggregate)
-        
+        # La transición ya está confirmada: se notifica a los suscriptores
+        self.event_bus.publicar(evento)
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegistrarPuestoCommand(Command):
     """Comando para registrar un nuevo puesto de postulación"""
     empresa_id: UUID
@@ -139,7 +144,7 @@ class RegistrarPuestoHandler(CommandHandler):
         return puesto_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PublicarPuestoCommand(Command):
     """Comando para publicar un puesto"""
     puesto_id: UUID
@@ -173,7 +178,7 @@ class PublicarPuestoHandler(CommandHandler):
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActualizarEstadoReclutadorCommand(Command):
     """
     Comando para actualizar el estado de postulación según revisión del reclutador
@@ -203,7 +208,7 @@ class ActualizarEstadoReclutadorHandler(CommandHandler):
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SubirDocumentoPerfilCommand(Command):
     """
     Comando para subir un documento al perfil
@@ -213,7 +218,7 @@ class SubirDocumentoPerfilCommand(Command):
     documento: dict  # Contiene nombre, tipo, url, etc.
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EliminarDocumentoPerfilCommand(Command):
     """
     Comando para eliminar un documento del perfil
@@ -223,7 +228,7 @@ class EliminarDocumentoPerfilCommand(Command):
     documento_id: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CompletarPerfilBasicoCommand(Command):
     """
     Comando para completar perfil básico del postulante
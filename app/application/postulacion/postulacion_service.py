@@ -3,12 +3,19 @@ Servicio de Postulación - Enriquecimiento de datos
 Agrega información relacionada a las postulaciones (candidato, puesto, empresa)
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
 from app.infrastructure.postulacion.repositories import PostulacionRepositoryImpl
 from app.infrastructure.puesto.repositories import PuestoRepositoryImpl
 from app.infrastructure.iam.repositories import CuentaRepositoryImpl
+from app.infrastructure.cache.memoria import CacheTTL
+from app.domain.postulacion.repositories import PostulacionRepository
+from app.domain.puesto.repositories import PuestoRepository
+from app.domain.iam.repositories import CuentaRepository
 
 # Importar tipos de dominio para reconocer aggregates
 from app.domain.iam.entities import CuentaAggregate as CuentaAggregateDomain
@@ -16,21 +23,84 @@ from app.domain.puesto.entities import PuestoAggregate as PuestoAggregateDomain
 from app.domain.iam.entities import Cuenta as CuentaEntity
 from app.domain.puesto.entities import Puesto as PuestoEntity
 
+logger = logging.getLogger(__name__)
+
+# Información ya construida de puestos y empresas, indexada por su UUID.
+# Cambian mucho menos de lo que se consultan; los handlers de puesto invalidan
+# la entrada al modificarlo y el TTL acota el desfase de los datos de empresa.
+info_puesto_cache = CacheTTL(maxsize=10_000, ttl=60)
+info_empresa_cache = CacheTTL(maxsize=10_000, ttl=300)
+
+# Hilos para solapar la consulta del candidato con la del puesto/empresa
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="enriquecer")
+
+# Repositorios compartidos: no guardan estado por petición (abren su propia
+# sesión en cada operación), así que no hace falta crearlos por servicio
+_postulacion_repo = PostulacionRepositoryImpl()
+_puesto_repo = PuestoRepositoryImpl()
+_cuenta_repo = CuentaRepositoryImpl()
+
+
+def _as_uuid(valor) -> UUID:
+    """Devuelve el valor como UUID, parseándolo solo si llega como texto"""
+    return valor if isinstance(valor, UUID) else UUID(valor)
+
+
+def _uuid_o_none(valor) -> Optional[UUID]:
+    """Como _as_uuid, pero devuelve None si el valor falta o no es un UUID"""
+    if valor is None:
+        return None
+    try:
+        return _as_uuid(valor)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _mapear_uuids(valores, campo: str) -> Dict[Any, UUID]:
+    """Valor original -> UUID de los valores válidos; los inválidos se registran y se omiten"""
+    uuids = {}
+    for valor in valores:
+        if valor is None:
+            continue
+        uuid_valor = _uuid_o_none(valor)
+        if uuid_valor is None:
+            logger.warning("%s inválido al enriquecer postulaciones: %s", campo, valor)
+        else:
+            uuids[valor] = uuid_valor
+    return uuids
+
+
+def _extraer_email(obj) -> str:
+    """Email de una cuenta, ya sea desde su credencial (objeto o dict) o directo"""
+    credencial = getattr(obj, "credencial", None)
+    if credencial is None:
+        return getattr(obj, "email", "")
+    if isinstance(credencial, dict):
+        return credencial.get("email", "")
+    return getattr(credencial, "email", "")
+
 
 class PostulacionService:
     """Servicio que enriquece datos de postulaciones con información relacionada"""
     
-    def __init__(self):
-        self.postulacion_repo = PostulacionRepositoryImpl()
-        self.puesto_repo = PuestoRepositoryImpl()
-        self.cuenta_repo = CuentaRepositoryImpl()
+    def __init__(
+        self,
+        postulacion_repo: Optional[PostulacionRepository] = None,
+        puesto_repo: Optional[PuestoRepository] = None,
+        cuenta_repo: Optional[CuentaRepository] = None
+    ):
+        self.postulacion_repo = postulacion_repo or _postulacion_repo
+        self.puesto_repo = puesto_repo or _puesto_repo
+        self.cuenta_repo = cuenta_repo or _cuenta_repo
     
     def enriquecer_postulacion(
         self,
         postulacion_data: Dict[str, Any],
         incluir_candidato: bool = True,
         incluir_puesto: bool = True,
-        incluir_empresa: bool = True
+        incluir_empresa: bool = True,
+        *,
+        inplace: bool = False
     ) -> Dict[str, Any]:
         """
         Enriquece una postulación individual con datos relacionados
@@ -40,32 +110,54 @@ class PostulacionService:
             incluir_candidato: Si debe incluir info del candidato
             incluir_puesto: Si debe incluir info del puesto
             incluir_empresa: Si debe incluir info de la empresa
+            inplace: Si es True se completa el mismo dict recibido en lugar
+                de una copia; solo debe usarse si el llamador es su dueño
             
         Returns:
-            Postulación enriquecida con datos relacionados
+            Postulación enriquecida con datos relacionados; si no se pide ningún
+            dato relacionado se devuelve el mismo dict recibido
         """
-        postulacion_enriquecida = postulacion_data.copy()
+        if not (incluir_candidato or incluir_puesto or incluir_empresa):
+            return postulacion_data
         
-        try:
-            # Obtener información del candidato
-            if incluir_candidato and "candidato_id" in postulacion_data:
-                candidato_info = self._obtener_info_candidato(
-                    UUID(postulacion_data["candidato_id"])
-                )
-                if candidato_info:
-                    postulacion_enriquecida["candidato"] = candidato_info
+        postulacion_enriquecida = postulacion_data if inplace else postulacion_data.copy()
+        
+        # Cada _obtener_info_* registra y absorbe sus propios errores; aquí solo
+        # puede fallar la conversión de IDs, que se valida campo por campo
+        candidato_id = postulacion_data.get("candidato_id") if incluir_candidato else None
+        puesto_id = postulacion_data.get("puesto_id") if (incluir_puesto or incluir_empresa) else None
+        
+        # El candidato no depende del puesto: se consulta en otro hilo
+        # mientras este obtiene el puesto y, con él, la empresa
+        candidato_futuro = None
+        if candidato_id:
+            try:
+                candidato_futuro = _executor.submit(self._obtener_info_candidato, _as_uuid(candidato_id))
+            except ValueError:
+                logger.warning("candidato_id inválido al enriquecer postulación: %s", candidato_id)
+        
+        # Obtener información del puesto
+        puesto_info = None
+        if puesto_id:
+            try:
+                puesto_info = self._obtener_info_puesto(_as_uuid(puesto_id))
+            except ValueError:
+                logger.warning("puesto_id inválido al enriquecer postulación: %s", puesto_id)
+        
+        if puesto_info:
+            if incluir_puesto:
+                postulacion_enriquecida["puesto"] = puesto_info
             
-            # Obtener información del puesto
-            if incluir_puesto and "puesto_id" in postulacion_data:
-                puesto_info = self._obtener_info_puesto(
-                    UUID(postulacion_data["puesto_id"])
-                )
-                if puesto_info:
-                    postulacion_enriquecida["puesto"] = puesto_info
+            # Obtener información de la empresa del puesto
+            if incluir_empresa and puesto_info["_empresa_uuid"]:
+                empresa_info = self._obtener_info_empresa(puesto_info["_empresa_uuid"])
+                if empresa_info:
+                    postulacion_enriquecida["empresa"] = empresa_info
         
-        except Exception as e:
-            # Log del error pero no fallar - devolver datos básicos
-            print(f"Error enriqueciendo postulación: {str(e)}")
+        if candidato_futuro is not None:
+            candidato_info = candidato_futuro.result()
+            if candidato_info:
+                postulacion_enriquecida["candidato"] = candidato_info
         
         return postulacion_enriquecida
     
@@ -74,7 +166,9 @@ class PostulacionService:
         postulaciones: List[Dict[str, Any]],
         incluir_candidato: bool = True,
         incluir_puesto: bool = True,
-        incluir_empresa: bool = True
+        incluir_empresa: bool = True,
+        *,
+        inplace: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Enriquece múltiples postulaciones con datos relacionados
@@ -84,142 +178,302 @@ class PostulacionService:
             incluir_candidato: Si debe incluir info del candidato
             incluir_puesto: Si debe incluir info del puesto
             incluir_empresa: Si debe incluir info de la empresa
+            inplace: Si es True se completan los mismos dicts recibidos en
+                lugar de copias; solo debe usarse si el llamador es su dueño
             
         Returns:
-            Lista de postulaciones enriquecidas
+            Lista de postulaciones enriquecidas; si no se pide ningún dato
+            relacionado se devuelve la misma lista recibida
         """
-        return [
-            self.enriquecer_postulacion(
-                post,
-                incluir_candidato=incluir_candidato,
-                incluir_puesto=incluir_puesto,
-                incluir_empresa=incluir_empresa
-            )
-            for post in postulaciones
-        ]
+        if not (incluir_candidato or incluir_puesto or incluir_empresa):
+            return postulaciones
+        
+        # Paso 1: reunir los IDs únicos referenciados por las postulaciones;
+        # cada valor distinto se convierte a UUID una sola vez
+        candidatos_raw = set()
+        puestos_raw = set()
+        for post in postulaciones:
+            if incluir_candidato and "candidato_id" in post:
+                candidatos_raw.add(post["candidato_id"])
+            if (incluir_puesto or incluir_empresa) and "puesto_id" in post:
+                puestos_raw.add(post["puesto_id"])
+        
+        # Un ID ausente o inválido solo deja sin enriquecer a su postulación,
+        # igual que en enriquecer_postulacion
+        candidato_uuids = _mapear_uuids(candidatos_raw, "candidato_id")
+        puesto_uuids = _mapear_uuids(puestos_raw, "puesto_id")
+        candidato_ids = set(candidato_uuids.values())
+        puesto_ids = set(puesto_uuids.values())
+        
+        # Paso 2: una consulta por tipo de entidad en lugar de una por postulación,
+        # solo para los puestos y empresas que no están en cache. Los candidatos
+        # no dependen de los puestos, así que se consultan en paralelo
+        candidatos_info: Dict[UUID, Dict[str, Any]] = {}
+        puestos_info: Dict[UUID, Dict[str, Any]] = {}
+        empresas_info: Dict[UUID, Dict[str, Any]] = {}
+        try:
+            candidatos_futuro = None
+            if candidato_ids:
+                candidatos_futuro = _executor.submit(self.cuenta_repo.obtener_por_ids, candidato_ids)
+            
+            puestos_pendientes = set()
+            for puesto_id in puesto_ids:
+                info = info_puesto_cache.obtener(puesto_id)
+                if info is None:
+                    puestos_pendientes.add(puesto_id)
+                else:
+                    puestos_info[puesto_id] = info
+            
+            if puestos_pendientes:
+                for puesto_id, puesto in self.puesto_repo.obtener_por_ids(puestos_pendientes).items():
+                    info = self._construir_info_puesto(puesto_id, puesto)
+                    info_puesto_cache.guardar(puesto_id, info)
+                    puestos_info[puesto_id] = info
+            
+            empresa_ids = set()
+            if incluir_empresa:
+                for info in puestos_info.values():
+                    empresa_id = info["_empresa_uuid"]
+                    if empresa_id is None or empresa_id in empresas_info:
+                        continue
+                    empresa_info = info_empresa_cache.obtener(empresa_id)
+                    if empresa_info is None:
+                        empresa_ids.add(empresa_id)
+                    else:
+                        empresas_info[empresa_id] = empresa_info
+            
+            if empresa_ids:
+                for empresa_id, empresa in self.cuenta_repo.obtener_por_ids(empresa_ids).items():
+                    empresa_info = self._construir_info_empresa(empresa_id, empresa)
+                    info_empresa_cache.guardar(empresa_id, empresa_info)
+                    empresas_info[empresa_id] = empresa_info
+            
+            if candidatos_futuro is not None:
+                for candidato_id, cuenta in candidatos_futuro.result().items():
+                    candidatos_info[candidato_id] = self._construir_info_candidato(candidato_id, cuenta)
+        except Exception as e:
+            logger.warning("Error enriqueciendo postulaciones: %s", e)
+        
+        # Paso 3: ensamblar cada postulación con los datos ya cargados
+        resultado = []
+        for post in postulaciones:
+            post_enriquecida = post if inplace else post.copy()
+            
+            if incluir_candidato:
+                candidato_info = candidatos_info.get(candidato_uuids.get(post.get("candidato_id")))
+                if candidato_info:
+                    post_enriquecida["candidato"] = candidato_info
+            
+            puesto_info = puestos_info.get(puesto_uuids.get(post.get("puesto_id")))
+            if puesto_info:
+                if incluir_puesto:
+                    post_enriquecida["puesto"] = puesto_info
+                if incluir_empresa:
+                    empresa_info = empresas_info.get(puesto_info["_empresa_uuid"])
+                    if empresa_info:
+                        post_enriquecida["empresa"] = empresa_info
+            
+            resultado.append(post_enriquecida)
+        
+        return resultado
     
     def _obtener_info_candidato(self, candidato_id: UUID) -> Optional[Dict[str, Any]]:
         """Obtiene información básica del candidato"""
         try:
             cuenta = self.cuenta_repo.obtener_por_id(candidato_id)
-            if not cuenta:
-                return None
-
-            # Manejar CuentaAggregate -> extraer entidad Cuenta
-            # La implementación del repo devuelve un CuentaAggregate con atributo `cuenta`
-            if hasattr(cuenta, "cuenta"):
-                cuenta_obj = getattr(cuenta, "cuenta")
-                nombre = getattr(cuenta_obj, "nombre_completo", "")
-                email = getattr(getattr(cuenta_obj, "credencial", {}), "email", "")
-                carrera = getattr(cuenta_obj, "carrera", None)
-                telefono = getattr(cuenta_obj, "telefono", None)
-                ciudad = getattr(cuenta_obj, "ciudad", None)
-            elif isinstance(cuenta, dict):
-                nombre = cuenta.get("nombre_completo", "")
-                email = cuenta.get("email", "")
-                carrera = cuenta.get("carrera")
-                telefono = cuenta.get("telefono")
-                ciudad = cuenta.get("ciudad")
-            else:
-                # Otros tipos: intentar acceder por atributos comunes
-                nombre = getattr(cuenta, "nombre_completo", "")
-                email = getattr(cuenta, "email", getattr(getattr(cuenta, "credencial", {}), "email", ""))
-                carrera = getattr(cuenta, "carrera", None)
-                telefono = getattr(cuenta, "telefono", None)
-                ciudad = getattr(cuenta, "ciudad", None)
-
-            return {
-                "cuenta_id": str(candidato_id),
-                "nombre_completo": nombre,
-                "email": email,
-                "carrera": carrera,
-                "telefono": telefono,
-                "ciudad": ciudad
-            }
+            if cuenta:
+                return self._construir_info_candidato(candidato_id, cuenta)
         except Exception as e:
-            print(f"Error obteniendo candidato {candidato_id}: {str(e)}")
+            logger.warning("Error obteniendo candidato %s: %s", candidato_id, e)
         
         return None
     
     def _obtener_info_puesto(self, puesto_id: UUID) -> Optional[Dict[str, Any]]:
-        """Obtiene información básica del puesto"""
+        """Obtiene información básica del puesto, consultando primero el cache"""
+        info = info_puesto_cache.obtener(puesto_id)
+        if info is not None:
+            return info
+        
         try:
             puesto = self.puesto_repo.obtener_por_id(puesto_id)
-            if not puesto:
-                return None
-
-            # Si el repo devuelve un PuestoAggregate con atributo `puesto`
-            if hasattr(puesto, "puesto"):
-                puesto_obj = getattr(puesto, "puesto")
-                titulo = getattr(puesto_obj, "titulo", "")
-                descripcion = getattr(puesto_obj, "descripcion", "")
-                ubicacion = getattr(puesto_obj, "ubicacion", "")
-                salario_min = getattr(puesto_obj, "salario_min", None)
-                salario_max = getattr(puesto_obj, "salario_max", None)
-                moneda = getattr(puesto_obj, "moneda", "MXN")
-                tipo_contrato = getattr(puesto_obj, "tipo_contrato", "")
-                empresa_id = getattr(puesto_obj, "empresa_id", None)
-            elif isinstance(puesto, dict):
-                titulo = puesto.get("titulo", "")
-                descripcion = puesto.get("descripcion", "")
-                ubicacion = puesto.get("ubicacion", "")
-                salario_min = puesto.get("salario_min")
-                salario_max = puesto.get("salario_max")
-                moneda = puesto.get("moneda", "MXN")
-                tipo_contrato = puesto.get("tipo_contrato", "")
-                empresa_id = puesto.get("empresa_id")
-            else:
-                titulo = getattr(puesto, "titulo", "")
-                descripcion = getattr(puesto, "descripcion", "")
-                ubicacion = getattr(puesto, "ubicacion", "")
-                salario_min = getattr(puesto, "salario_min", None)
-                salario_max = getattr(puesto, "salario_max", None)
-                moneda = getattr(puesto, "moneda", "MXN")
-                tipo_contrato = getattr(puesto, "tipo_contrato", "")
-                empresa_id = getattr(puesto, "empresa_id", None)
-
-            empresa_id_str = str(empresa_id) if empresa_id is not None else ""
-
-            return {
-                "puesto_id": str(puesto_id),
-                "titulo": titulo,
-                "descripcion": descripcion,
-                "ubicacion": ubicacion,
-                "salario_min": salario_min,
-                "salario_max": salario_max,
-                "moneda": moneda,
-                "tipo_contrato": str(tipo_contrato) if tipo_contrato is not None else "",
-                "empresa_id": empresa_id_str
-            }
+            if puesto:
+                info = self._construir_info_puesto(puesto_id, puesto)
+                info_puesto_cache.guardar(puesto_id, info)
+                return info
         except Exception as e:
-            print(f"Error obteniendo puesto {puesto_id}: {str(e)}")
+            logger.warning("Error obteniendo puesto %s: %s", puesto_id, e)
         
         return None
     
     def _obtener_info_empresa(self, empresa_id: UUID) -> Optional[Dict[str, Any]]:
-        """Obtiene información básica de la empresa"""
+        """Obtiene información básica de la empresa, consultando primero el cache"""
+        info = info_empresa_cache.obtener(empresa_id)
+        if info is not None:
+            return info
+        
         try:
             empresa = self.cuenta_repo.obtener_por_id(empresa_id)
-            if not empresa:
-                return None
-
-            if hasattr(empresa, "cuenta"):
-                empresa_obj = getattr(empresa, "cuenta")
-                nombre = getattr(empresa_obj, "nombre_completo", "")
-                email = getattr(getattr(empresa_obj, "credencial", {}), "email", "")
-            elif isinstance(empresa, dict):
-                nombre = empresa.get("nombre_completo", "")
-                email = empresa.get("email", "")
-            else:
-                nombre = getattr(empresa, "nombre_completo", "")
-                email = getattr(empresa, "email", "")
-
-            return {
-                "empresa_id": str(empresa_id),
-                "nombre": nombre,
-                "email": email
-            }
+            if empresa:
+                info = self._construir_info_empresa(empresa_id, empresa)
+                info_empresa_cache.guardar(empresa_id, info)
+                return info
         except Exception as e:
-            print(f"Error obteniendo empresa {empresa_id}: {str(e)}")
+            logger.warning("Error obteniendo empresa %s: %s", empresa_id, e)
         
         return None
+    
+    def _construir_info_candidato(self, candidato_id, cuenta) -> Dict[str, Any]:
+        """Construye la información básica del candidato a partir de su cuenta"""
+        campos = _EXTRACTORES_CUENTA.get(type(cuenta), _campos_cuenta_generica)(cuenta)
+        return {
+            "cuenta_id": str(candidato_id),
+            "nombre_completo": campos["nombre_completo"],
+            "email": campos["email"],
+            "carrera": campos["carrera"],
+            "telefono": campos["telefono"],
+            "ciudad": campos["ciudad"]
+        }
+    
+    def _construir_info_puesto(self, puesto_id, puesto) -> Dict[str, Any]:
+        """Construye la información básica del puesto a partir del agregado"""
+        campos = _EXTRACTORES_PUESTO.get(type(puesto), _campos_puesto_generico)(puesto)
+        tipo_contrato = campos["tipo_contrato"]
+        empresa_id = campos["empresa_id"]
+        return {
+            "puesto_id": str(puesto_id),
+            "titulo": campos["titulo"],
+            "descripcion": campos["descripcion"],
+            "ubicacion": campos["ubicacion"],
+            "salario_min": campos["salario_min"],
+            "salario_max": campos["salario_max"],
+            "moneda": campos["moneda"],
+            "tipo_contrato": str(tipo_contrato) if tipo_contrato is not None else "",
+            "empresa_id": str(empresa_id) if empresa_id is not None else "",
+            # UUID de la empresa ya resuelto para el enriquecimiento; no forma
+            # parte de PuestoInfoResponse, así que no llega a la respuesta
+            "_empresa_uuid": _uuid_o_none(empresa_id)
+        }
+    
+    def _construir_info_empresa(self, empresa_id, empresa) -> Dict[str, Any]:
+        """Construye la información básica de la empresa a partir de su cuenta"""
+        campos = _EXTRACTORES_CUENTA.get(type(empresa), _campos_cuenta_generica)(empresa)
+        return {
+            "empresa_id": str(empresa_id),
+            "nombre": campos["nombre_completo"],
+            "email": campos["email"]
+        }
+
+
+# Extracción de campos según el tipo devuelto por los repositorios. Se elige
+# el extractor con una búsqueda por type(); los tipos desconocidos caen en la
+# versión genérica basada en getattr.
+
+_leer_email = attrgetter("credencial.email")
+_leer_campos_cuenta = attrgetter("nombre_completo", "carrera", "telefono", "ciudad")
+_leer_campos_puesto = attrgetter(
+    "titulo", "descripcion", "ubicacion", "salario_min", "salario_max",
+    "moneda", "tipo_contrato", "empresa_id"
+)
+
+
+def _campos_cuenta_entidad(cuenta: CuentaEntity) -> Dict[str, Any]:
+    nombre_completo, carrera, telefono, ciudad = _leer_campos_cuenta(cuenta)
+    return {
+        "nombre_completo": nombre_completo,
+        "email": _leer_email(cuenta),
+        "carrera": carrera,
+        "telefono": telefono,
+        "ciudad": ciudad
+    }
+
+
+def _campos_cuenta_agregado(cuenta_aggregate: CuentaAggregateDomain) -> Dict[str, Any]:
+    return _campos_cuenta_entidad(cuenta_aggregate.cuenta)
+
+
+def _campos_cuenta_dict(cuenta: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "nombre_completo": cuenta.get("nombre_completo", ""),
+        "email": cuenta.get("email", ""),
+        "carrera": cuenta.get("carrera"),
+        "telefono": cuenta.get("telefono"),
+        "ciudad": cuenta.get("ciudad")
+    }
+
+
+def _campos_cuenta_generica(cuenta) -> Dict[str, Any]:
+    cuenta_obj = getattr(cuenta, "cuenta", cuenta)
+    try:
+        return _campos_cuenta_entidad(cuenta_obj)
+    except AttributeError:
+        # Objeto incompleto: cada campo ausente toma su valor por defecto
+        return {
+            "nombre_completo": getattr(cuenta_obj, "nombre_completo", ""),
+            "email": _extraer_email(cuenta_obj),
+            "carrera": getattr(cuenta_obj, "carrera", None),
+            "telefono": getattr(cuenta_obj, "telefono", None),
+            "ciudad": getattr(cuenta_obj, "ciudad", None)
+        }
+
+
+def _campos_puesto_entidad(puesto: PuestoEntity) -> Dict[str, Any]:
+    (titulo, descripcion, ubicacion, salario_min, salario_max,
+     moneda, tipo_contrato, empresa_id) = _leer_campos_puesto(puesto)
+    return {
+        "titulo": titulo,
+        "descripcion": descripcion,
+        "ubicacion": ubicacion,
+        "salario_min": salario_min,
+        "salario_max": salario_max,
+        "moneda": moneda,
+        "tipo_contrato": tipo_contrato,
+        "empresa_id": empresa_id
+    }
+
+
+def _campos_puesto_agregado(puesto_aggregate: PuestoAggregateDomain) -> Dict[str, Any]:
+    return _campos_puesto_entidad(puesto_aggregate.puesto)
+
+
+def _campos_puesto_dict(puesto: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "titulo": puesto.get("titulo", ""),
+        "descripcion": puesto.get("descripcion", ""),
+        "ubicacion": puesto.get("ubicacion", ""),
+        "salario_min": puesto.get("salario_min"),
+        "salario_max": puesto.get("salario_max"),
+        "moneda": puesto.get("moneda", "MXN"),
+        "tipo_contrato": puesto.get("tipo_contrato", ""),
+        "empresa_id": puesto.get("empresa_id")
+    }
+
+
+def _campos_puesto_generico(puesto) -> Dict[str, Any]:
+    puesto_obj = getattr(puesto, "puesto", puesto)
+    try:
+        return _campos_puesto_entidad(puesto_obj)
+    except AttributeError:
+        # Objeto incompleto: cada campo ausente toma su valor por defecto
+        return {
+            "titulo": getattr(puesto_obj, "titulo", ""),
+            "descripcion": getattr(puesto_obj, "descripcion", ""),
+            "ubicacion": getattr(puesto_obj, "ubicacion", ""),
+            "salario_min": getattr(puesto_obj, "salario_min", None),
+            "salario_max": getattr(puesto_obj, "salario_max", None),
+            "moneda": getattr(puesto_obj, "moneda", "MXN"),
+            "tipo_contrato": getattr(puesto_obj, "tipo_contrato", ""),
+            "empresa_id": getattr(puesto_obj, "empresa_id", None)
+        }
+
+
+_EXTRACTORES_CUENTA = {
+    CuentaAggregateDomain: _campos_cuenta_agregado,
+    CuentaEntity: _campos_cuenta_entidad,
+    dict: _campos_cuenta_dict,
+}
+
+_EXTRACTORES_PUESTO = {
+    PuestoAggregateDomain: _campos_puesto_agregado,
+    PuestoEntity: _campos_puesto_entidad,
+    dict: _campos_puesto_dict,
+}
@@ -1,16 +1,71 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, NotRequired, Optional, TypedDict
 from uuid import UUID
 
 from app.domain.common import Query, QueryHandler, EventHandler
 from app.domain.postulacion.entities import PostulacionAggregate, PuestoPostulacion, PostulacionCreada, EstadoPostulacionActualizado
 from app.domain.postulacion.repositories import PostulacionRepository, PuestoPostulacionRepository
+from app.domain.metrica.repositories import MetricaRepository
+from app.application.metrica.query_handlers import ajustar_metricas_cacheadas
 
 
-@dataclass
+class HitoDict(TypedDict):
+    """Forma de lectura de un hito"""
+    hito_id: str
+    fecha: datetime
+    descripcion: str
+
+
+class PostulacionDict(TypedDict):
+    """Forma de lectura de una postulación (PostulacionResponse sin enriquecer)"""
+    postulacion_id: str
+    candidato_id: str
+    puesto_id: str
+    fecha_postulacion: datetime
+    estado: str
+    documentos_adjuntos: List[Dict[str, Any]]
+    hitos: List[HitoDict]
+    hitos_count: NotRequired[int]
+
+
+def serializar_hitos(lista_hitos) -> List[HitoDict]:
+    """Representación de lectura de los hitos de una línea de tiempo"""
+    return [
+        {
+            "hito_id": str(hito.hito_id),
+            "fecha": hito.fecha,
+            "descripcion": hito.descripcion
+        }
+        for hito in lista_hitos
+    ]
+
+
+def postulacion_a_dict(postulacion_aggregate: PostulacionAggregate, incluir_hitos: bool = True) -> PostulacionDict:
+    """
+    Representación de respuesta de un agregado de postulación; única
+    construcción de esta forma para handlers y endpoints
+    """
+    postulacion = postulacion_aggregate.postulacion
+    return {
+        "postulacion_id": str(postulacion.postulacion_id),
+        "candidato_id": str(postulacion.candidato_id),
+        "puesto_id": str(postulacion.puesto_id),
+        "fecha_postulacion": postulacion.fecha_postulacion,
+        "estado": postulacion.estado.valor.value,
+        "documentos_adjuntos": postulacion.documentos_adjuntos,
+        "hitos": serializar_hitos(postulacion_aggregate.linea_de_tiempo.lista_hitos) if incluir_hitos else []
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class ObtenerPostulacionQuery(Query):
-    """Query para obtener una postulación por ID"""
+    """
+    Query para obtener una postulación por ID. Por defecto no se cargan
+    los hitos y solo se informa cuántos hay (hitos_count)
+    """
     postulacion_id: UUID
+    incluir_hitos: bool = False
 
 
 class ObtenerPostulacionQueryHandler(QueryHandler):
@@ -21,36 +76,54 @@ class ObtenerPostulacionQueryHandler(QueryHandler):
     def __init__(self, postulacion_repository: PostulacionRepository):
         self.postulacion_repository = postulacion_repository
     
-    def handle(self, query: ObtenerPostulacionQuery) -> Optional[Dict[str, Any]]:
+    def handle(self, query: ObtenerPostulacionQuery) -> Optional[PostulacionDict]:
         """
         Maneja la consulta de postulación por ID
         """
-        postulacion_aggregate = self.postulacion_repository.obtener_por_id(query.postulacion_id)
+        if query.incluir_hitos:
+            postulacion_aggregate = self.postulacion_repository.obtener_por_id(query.postulacion_id)
+            if not postulacion_aggregate:
+                return None
+            
+            resultado = postulacion_a_dict(postulacion_aggregate)
+            resultado["hitos_count"] = len(resultado["hitos"])
+            return resultado
         
-        if not postulacion_aggregate:
+        # Solo la cabecera y el número de hitos, sin consultar la tabla de hitos
+        cabecera = self.postulacion_repository.obtener_por_id_sin_hitos(query.postulacion_id)
+        if not cabecera:
             return None
         
-        # Construir respuesta con los datos relevantes
-        postulacion = postulacion_aggregate.postulacion
-        return {
-            "postulacion_id": str(postulacion.postulacion_id),
-            "candidato_id": str(postulacion.candidato_id),
-            "puesto_id": str(postulacion.puesto_id),
-            "fecha_postulacion": postulacion.fecha_postulacion.isoformat(),
-            "estado": postulacion.estado.valor.value,
-            "documentos_adjuntos": postulacion.documentos_adjuntos,
-            "hitos": [
-                {
-                    "hito_id": str(hito.hito_id),
-                    "fecha": hito.fecha.isoformat(),
-                    "descripcion": hito.descripcion
-                }
-                for hito in postulacion_aggregate.linea_de_tiempo.lista_hitos
-            ]
-        }
+        postulacion_aggregate, numero_hitos = cabecera
+        resultado = postulacion_a_dict(postulacion_aggregate, incluir_hitos=False)
+        resultado["hitos_count"] = numero_hitos
+        return resultado
+
+
+@dataclass(slots=True, frozen=True)
+class ListarHitosPostulacionQuery(Query):
+    """Query para listar, paginados, los hitos de una postulación"""
+    postulacion_id: UUID
+    limit: int = 50
+    offset: int = 0
+
+
+class ListarHitosPostulacionQueryHandler(QueryHandler):
+    """
+    Manejador de consulta para listar los hitos de una postulación
+    """
+    
+    def __init__(self, postulacion_repository: PostulacionRepository):
+        self.postulacion_repository = postulacion_repository
+    
+    def handle(self, query: ListarHitosPostulacionQuery) -> List[HitoDict]:
+        """
+        Maneja la consulta de hitos de una postulación
+        """
+        return self.postulacion_repository.listar_hitos(query.postulacion_id, query.limit, query.offset)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ListarPostulacionesCandidatoQuery(Query):
     """Query para listar postulaciones de un candidato"""
     candidato_id: UUID
@@ -68,31 +141,11 @@ class ListarPostulacionesCandidatoQueryHandler(QueryHandler):
         """
         Maneja la consulta de postulaciones por candidato
         """
-        postulaciones = self.postulacion_repository.obtener_por_candidato(query.candidato_id)
-        
-        # Construir respuesta con los datos de cada postulación
-        return [
-            {
-                "postulacion_id": str(agg.postulacion.postulacion_id),
-                "candidato_id": str(agg.postulacion.candidato_id),
-                "puesto_id": str(agg.postulacion.puesto_id),
-                "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                "estado": agg.postulacion.estado.valor.value,
-                "documentos_adjuntos": agg.postulacion.documentos_adjuntos,
-                "hitos": [
-                    {
-                        "hito_id": str(hito.hito_id),
-                        "fecha": hito.fecha.isoformat(),
-                        "descripcion": hito.descripcion
-                    }
-                    for hito in agg.linea_de_tiempo.lista_hitos
-                ]
-            }
-            for agg in postulaciones
-        ]
-
-
-@dataclass
+        # El repositorio devuelve las filas ya con la forma de la respuesta
+        return self.postulacion_repository.listar_proyeccion_por_candidato(query.candidato_id)
+
+
+@dataclass(slots=True, frozen=True)
 class ObtenerPuestoQuery(Query):
     """Query para obtener detalles de un puesto"""
     puesto_id: UUID
@@ -133,14 +186,20 @@ class PostulacionCreadaHandler(EventHandler):
     Manejador de eventos para PostulacionCreada
     """
     
+    def __init__(self, metrica_repository: MetricaRepository):
+        self.metrica_repository = metrica_repository
+    
     def handle(self, event: PostulacionCreada) -> None:
         """
         Maneja el evento de postulación creada
-        Este handler puede notificar a otros bounded contexts como métricas
+        Suma la postulación a las métricas cacheadas del candidato en lugar
+        de descartarlas y volver a contar todas sus postulaciones
         """
-        # Aquí se implementaría la lógica para notificar a otros bounded contexts
-        # Por ejemplo, enviar un evento al servicio de métricas
-        pass
+        if event.candidato_id is None:
+            return
+        ajustar_metricas_cacheadas(
+            self.metrica_repository, event.candidato_id, None, event.estado, event.marca
+        )
 
 
 class EstadoPostulacionActualizadoHandler(EventHandler):
@@ -148,27 +207,33 @@ class EstadoPostulacionActualizadoHandler(EventHandler):
     Manejador de eventos para EstadoPostulacionActualizado
     """
     
+    def __init__(self, metrica_repository: MetricaRepository):
+        self.metrica_repository = metrica_repository
+    
     def handle(self, event: EstadoPostulacionActualizado) -> None:
         """
         Maneja el evento de estado de postulación actualizado
-        
-        Nota: No se requiere actualizar métricas explícitamente, ya que 
-        el repositorio de métricas calcula los valores en tiempo real
-        basándose en el estado actual de las postulaciones.
+        Mueve la postulación del contador del estado anterior al del nuevo
+        en las métricas cacheadas del candidato
         """
-        # La implementación está vacía porque las métricas se calculan
-        # bajo demanda cuando son solicitadas. No es necesario almacenar
-        # o actualizar ningún contador de forma explícita.
-        pass
+        if event.candidato_id is None:
+            return
+        ajustar_metricas_cacheadas(
+            self.metrica_repository, event.candidato_id, event.estado_anterior, event.estado_nuevo,
+            event.marca
+        )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObtenerHistorialCompletoQuery(Query):
     """
     Query para obtener historial completo de postulaciones
     US25: Ver historial completo de postulaciones
     """
     candidato_id: UUID
+    limit: int = 50
+    offset: int = 0
+    incluir_hitos: bool = False
 
 
 class ObtenerHistorialCompletoQueryHandler(QueryHandler):
@@ -182,30 +247,14 @@ class ObtenerHistorialCompletoQueryHandler(QueryHandler):
     def handle(self, query: ObtenerHistorialCompletoQuery) -> List[Dict[str, Any]]:
         """
         Maneja la consulta del historial completo
+        El repositorio devuelve la página ya proyectada, sin reconstruir agregados
         """
-        postulaciones = self.postulacion_repository.obtener_historial_completo(query.candidato_id)
-        
-        # Construir respuesta con los datos detallados de cada postulación
-        return [
-            {
-                "postulacion_id": str(agg.postulacion.postulacion_id),
-                "puesto_id": str(agg.postulacion.puesto_id),
-                "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                "estado": agg.postulacion.estado.valor.value,
-                "documentos_adjuntos": agg.postulacion.documentos_adjuntos,
-                "hitos": [
-                    {
-                        "fecha": hito.fecha.isoformat(),
-                        "descripcion": hito.descripcion
-                    }
-                    for hito in agg.linea_de_tiempo.lista_hitos
-                ]
-            }
-            for agg in postulaciones
-        ]
-
-
-@dataclass
+        return self.postulacion_repository.obtener_historial_proyectado(
+            query.candidato_id, query.limit, query.offset, query.incluir_hitos
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class BuscarPostulacionesQuery(Query):
     """
     Query para buscar postulaciones por empresa o puesto
@@ -227,24 +276,14 @@ class BuscarPostulacionesQueryHandler(QueryHandler):
         """
         Maneja la consulta de búsqueda
         """
-        postulaciones = self.postulacion_repository.buscar_por_empresa_o_puesto(
+        # Filtro y orden se resuelven en SQL; las filas ya vienen proyectadas
+        return self.postulacion_repository.buscar_por_empresa_o_puesto(
             query.candidato_id, 
             query.termino_busqueda
         )
-        
-        # Construir respuesta con los datos de cada postulación
-        return [
-            {
-                "postulacion_id": str(agg.postulacion.postulacion_id),
-                "puesto_id": str(agg.postulacion.puesto_id),
-                "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                "estado": agg.postulacion.estado.valor.value
-            }
-            for agg in postulaciones
-        ]
-
-
-@dataclass
+
+
+@dataclass(slots=True, frozen=True)
 class FiltrarPostulacionesQuery(Query):
     """
     Query para filtrar postulaciones por estado
@@ -266,24 +305,14 @@ class FiltrarPostulacionesQueryHandler(QueryHandler):
         """
         Maneja la consulta de filtrado
         """
-        postulaciones = self.postulacion_repository.filtrar_por_estado(
+        # Filtro y orden se resuelven en SQL; las filas ya vienen proyectadas
+        return self.postulacion_repository.filtrar_por_estado(
             query.candidato_id, 
             query.estado
         )
-        
-        # Construir respuesta con los datos de cada postulación
-        return [
-            {
-                "postulacion_id": str(agg.postulacion.postulacion_id),
-                "puesto_id": str(agg.postulacion.puesto_id),
-                "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                "estado": agg.postulacion.estado.valor.value
-            }
-            for agg in postulaciones
-        ]
-
-
-@dataclass
+
+
+@dataclass(slots=True, frozen=True)
 class OrdenarPostulacionesQuery(Query):
     """
     Query para ordenar postulaciones por fecha o resultado
@@ -306,19 +335,9 @@ class OrdenarPostulacionesQueryHandler(QueryHandler):
         """
         Maneja la consulta de ordenación
         """
-        postulaciones = self.postulacion_repository.ordenar_postulaciones(
+        # Filtro y orden se resuelven en SQL; las filas ya vienen proyectadas
+        return self.postulacion_repository.ordenar_postulaciones(
             query.candidato_id, 
             query.criterio,
             query.descendente
         )
-        
-        # Construir respuesta con los datos de cada postulación
-        return [
-            {
-                "postulacion_id": str(agg.postulacion.postulacion_id),
-                "puesto_id": str(agg.postulacion.puesto_id),
-                "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                "estado": agg.postulacion.estado.valor.value
-            }
-            for agg in postulaciones
-        ]
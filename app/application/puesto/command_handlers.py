@@ -8,9 +8,19 @@ from app.domain.puesto.entities import (
     PuestoCreado, PuestoCerrado, PuestoActualizado
 )
 from app.domain.puesto.repositories import PuestoRepository
+from app.application.postulacion.postulacion_service import info_puesto_cache
+from app.application.puesto.query_handlers import puesto_detalle_cache, puesto_a_dict
 
 
-@dataclass
+# Campos opcionales de ActualizarPuestoCommand, en el orden en que se
+# informan en PuestoActualizado
+_CAMPOS_ACTUALIZABLES = (
+    "titulo", "descripcion", "ubicacion", "salario_min",
+    "salario_max", "moneda", "tipo_contrato", "requisitos"
+)
+
+
+@dataclass(slots=True, frozen=True)
 class CrearPuestoCommand(Command):
     """Comando para crear un nuevo puesto"""
     empresa_id: UUID
@@ -62,30 +72,10 @@ class CrearPuestoHandler(CommandHandler):
         puesto_aggregate.add_event(PuestoCreado(puesto_id, command.empresa_id))
         
         # Devolver respuesta
-        return {
-            "puesto_id": str(puesto.puesto_id),
-            "empresa_id": str(puesto.empresa_id),
-            "titulo": puesto.titulo,
-            "descripcion": puesto.descripcion,
-            "ubicacion": puesto.ubicacion,
-            "salario_min": puesto.salario_min,
-            "salario_max": puesto.salario_max,
-            "moneda": puesto.moneda,
-            "tipo_contrato": puesto.tipo_contrato.value,
-            "fecha_publicacion": puesto.fecha_publicacion.isoformat(),
-            "estado": puesto.estado.value,
-            "requisitos": [
-                {
-                    "tipo": req.tipo,
-                    "descripcion": req.descripcion,
-                    "es_obligatorio": req.es_obligatorio
-                }
-                for req in puesto_aggregate.requisitos
-            ]
-        }
+        return puesto_a_dict(puesto_aggregate)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActualizarPuestoCommand(Command):
     """Comando para actualizar un puesto existente"""
     puesto_id: UUID
@@ -122,7 +112,7 @@ class ActualizarPuestoHandler(CommandHandler):
             raise ValueError("No se puede actualizar un puesto cerrado")
         
         # Actualizar los campos del puesto
-        puesto_aggregate.puesto.actualizar_informacion(
+        hubo_cambios = puesto_aggregate.puesto.actualizar_informacion(
             titulo=command.titulo,
             descripcion=command.descripcion,
             ubicacion=command.ubicacion,
@@ -134,61 +124,31 @@ class ActualizarPuestoHandler(CommandHandler):
         
         # Actualizar requisitos si se proporcionan
         if command.requisitos is not None:
-            puesto_aggregate.actualizar_requisitos(command.requisitos)
-        
-        # Guardar cambios
-        self.puesto_repository.guardar(puesto_aggregate)
-        
-        # Determinar qué campos se actualizaron
-        campos_actualizados = []
-        if command.titulo is not None:
-            campos_actualizados.append("titulo")
-        if command.descripcion is not None:
-            campos_actualizados.append("descripcion")
-        if command.ubicacion is not None:
-            campos_actualizados.append("ubicacion")
-        if command.salario_min is not None:
-            campos_actualizados.append("salario_min")
-        if command.salario_max is not None:
-            campos_actualizados.append("salario_max")
-        if command.moneda is not None:
-            campos_actualizados.append("moneda")
-        if command.tipo_contrato is not None:
-            campos_actualizados.append("tipo_contrato")
-        if command.requisitos is not None:
-            campos_actualizados.append("requisitos")
-        
-        # Emitir evento
-        puesto_aggregate.add_event(PuestoActualizado(
-            puesto_id=command.puesto_id,
-            campos_actualizados=campos_actualizados
-        ))
+            hubo_cambios = puesto_aggregate.actualizar_requisitos(command.requisitos) or hubo_cambios
+        
+        # Si el comando no modifica nada no se persiste ni se emite evento
+        if hubo_cambios:
+            # Guardar cambios
+            self.puesto_repository.guardar(puesto_aggregate)
+            info_puesto_cache.invalidar(command.puesto_id)
+            puesto_detalle_cache.invalidar(command.puesto_id)
+            
+            # Determinar qué campos se actualizaron
+            campos_actualizados = [
+                campo for campo in _CAMPOS_ACTUALIZABLES if getattr(command, campo) is not None
+            ]
+            
+            # Emitir evento
+            puesto_aggregate.add_event(PuestoActualizado(
+                puesto_id=command.puesto_id,
+                campos_actualizados=campos_actualizados
+            ))
         
         # Devolver el puesto actualizado
-        return {
-            "puesto_id": str(puesto_aggregate.puesto.puesto_id),
-            "empresa_id": str(puesto_aggregate.puesto.empresa_id),
-            "titulo": puesto_aggregate.puesto.titulo,
-            "descripcion": puesto_aggregate.puesto.descripcion,
-            "ubicacion": puesto_aggregate.puesto.ubicacion,
-            "salario_min": puesto_aggregate.puesto.salario_min,
-            "salario_max": puesto_aggregate.puesto.salario_max,
-            "moneda": puesto_aggregate.puesto.moneda,
-            "tipo_contrato": puesto_aggregate.puesto.tipo_contrato.value,
-            "fecha_publicacion": puesto_aggregate.puesto.fecha_publicacion.isoformat(),
-            "estado": puesto_aggregate.puesto.estado.value,
-            "requisitos": [
-                {
-                    "tipo": req.tipo,
-                    "descripcion": req.descripcion,
-                    "es_obligatorio": req.es_obligatorio
-                }
-                for req in puesto_aggregate.requisitos
-            ]
-        }
+        return puesto_a_dict(puesto_aggregate)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CambiarEstadoPuestoCommand(Command):
     """Comando para cambiar el estado de un puesto (abierto/cerrado)"""
     puesto_id: UUID
@@ -219,6 +179,8 @@ class CambiarEstadoPuestoHandler(CommandHandler):
         
         # Guardar cambios
         self.puesto_repository.guardar(puesto_aggregate)
+        info_puesto_cache.invalidar(command.puesto_id)
+        puesto_detalle_cache.invalidar(command.puesto_id)
         
         # Si el estado es CERRADO, emitir evento
         if command.nuevo_estado == EstadoPuestoEnum.CERRADO:
@@ -229,11 +191,4 @@ class CambiarEstadoPuestoHandler(CommandHandler):
             ))
         
         # Devolver el puesto actualizado
-        return {
-            "puesto_id": str(puesto_aggregate.puesto.puesto_id),
-            "empresa_id": str(puesto_aggregate.puesto.empresa_id),
-            "titulo": puesto_aggregate.puesto.titulo,
-            "estado": puesto_aggregate.puesto.estado.value,
-            "fecha_publicacion": puesto_aggregate.puesto.fecha_publicacion.isoformat(),
-            "fecha_cierre": puesto_aggregate.puesto.fecha_cierre.isoformat() if puesto_aggregate.puesto.fecha_cierre else None
-        }
\ No newline at end of file
+        return puesto_a_dict(puesto_aggregate)
\ No newline at end of file
@@ -1,13 +1,49 @@
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from app.domain.common import Query, QueryHandler
-from app.domain.puesto.entities import EstadoPuestoEnum
+from app.domain.puesto.entities import EstadoPuestoEnum, PuestoAggregate
 from app.domain.puesto.repositories import PuestoRepository
+from app.infrastructure.cache.memoria import CacheTTL
 
 
-@dataclass
+# Detalle de puesto ya serializado, por puesto_id. Los handlers que modifican
+# un puesto invalidan su entrada; el TTL acota el desfase entre instancias.
+puesto_detalle_cache = CacheTTL(maxsize=4_096, ttl=60)
+
+_leer_puesto = attrgetter("puesto")
+
+
+def puesto_a_dict(puesto_aggregate: PuestoAggregate) -> Dict[str, Any]:
+    """Representación de respuesta de un agregado de puesto, compartida por consultas y comandos"""
+    puesto = puesto_aggregate.puesto
+    return {
+        "puesto_id": str(puesto.puesto_id),
+        "empresa_id": str(puesto.empresa_id),
+        "titulo": puesto.titulo,
+        "descripcion": puesto.descripcion,
+        "ubicacion": puesto.ubicacion,
+        "salario_min": puesto.salario_min,
+        "salario_max": puesto.salario_max,
+        "moneda": puesto.moneda,
+        "tipo_contrato": puesto.tipo_contrato.value,
+        "fecha_publicacion": puesto.fecha_publicacion,
+        "fecha_cierre": puesto.fecha_cierre,
+        "estado": puesto.estado.value,
+        "requisitos": [
+            {
+                "tipo": req.tipo,
+                "descripcion": req.descripcion,
+                "es_obligatorio": req.es_obligatorio
+            }
+            for req in puesto_aggregate.requisitos
+        ]
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class ObtenerPuestoQuery(Query):
     """Query para obtener un puesto por ID"""
     puesto_id: UUID
@@ -24,48 +60,25 @@ class ObtenerPuestoQueryHandler(QueryHandler):
     def handle(self, query: ObtenerPuestoQuery) -> Optional[Dict[str, Any]]:
         """
         Maneja la consulta de puesto por ID
+        El diccionario devuelto es compartido por el cache: no debe modificarse
         """
+        resultado = puesto_detalle_cache.obtener(query.puesto_id)
+        if resultado is not None:
+            return resultado
+        
         # Recuperar el puesto
         puesto_aggregate = self.puesto_repository.obtener_por_id(query.puesto_id)
         
         if not puesto_aggregate:
             return None
         
-        # Obtener valores de enum o strings
-        tipo_contrato_value = (puesto_aggregate.puesto.tipo_contrato.value 
-                              if hasattr(puesto_aggregate.puesto.tipo_contrato, 'value') 
-                              else puesto_aggregate.puesto.tipo_contrato)
-        
-        estado_value = (puesto_aggregate.puesto.estado.value 
-                       if hasattr(puesto_aggregate.puesto.estado, 'value') 
-                       else puesto_aggregate.puesto.estado)
-        
         # Construir respuesta
-        return {
-            "puesto_id": str(puesto_aggregate.puesto.puesto_id),
-            "empresa_id": str(puesto_aggregate.puesto.empresa_id),
-            "titulo": puesto_aggregate.puesto.titulo,
-            "descripcion": puesto_aggregate.puesto.descripcion,
-            "ubicacion": puesto_aggregate.puesto.ubicacion,
-            "salario_min": puesto_aggregate.puesto.salario_min,
-            "salario_max": puesto_aggregate.puesto.salario_max,
-            "moneda": puesto_aggregate.puesto.moneda,
-            "tipo_contrato": tipo_contrato_value,
-            "fecha_publicacion": puesto_aggregate.puesto.fecha_publicacion.isoformat(),
-            "fecha_cierre": puesto_aggregate.puesto.fecha_cierre.isoformat() if puesto_aggregate.puesto.fecha_cierre else None,
-            "estado": estado_value,
-            "requisitos": [
-                {
-                    "tipo": req.tipo,
-                    "descripcion": req.descripcion,
-                    "es_obligatorio": req.es_obligatorio
-                }
-                for req in puesto_aggregate.requisitos
-            ]
-        }
+        resultado = puesto_a_dict(puesto_aggregate)
+        puesto_detalle_cache.guardar(query.puesto_id, resultado)
+        return resultado
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ListarPuestosQuery(Query):
     """Query para listar puestos con filtros"""
     empresa_id: Optional[UUID] = None
@@ -84,35 +97,22 @@ class ListarPuestosQueryHandler(QueryHandler):
         """
         Maneja la consulta de listado de puestos
         """
-        if query.empresa_id:
-            # Filtrar por empresa
-            puestos = self.puesto_repository.listar_por_empresa(query.empresa_id)
-        elif query.estado:
-            # Filtrar por estado
-            puestos = self.puesto_repository.listar_por_estado(query.estado.value)
-        else:
-            # Listar todos
-            puestos = self.puesto_repository.listar_todos()
-        
-        # Construir respuesta resumida
-        resultado = []
-        for agg in puestos:
-            tipo_contrato_value = (agg.puesto.tipo_contrato.value 
-                                  if hasattr(agg.puesto.tipo_contrato, 'value') 
-                                  else agg.puesto.tipo_contrato)
-            
-            estado_value = (agg.puesto.estado.value 
-                           if hasattr(agg.puesto.estado, 'value') 
-                           else agg.puesto.estado)
-            
-            resultado.append({
-                "puesto_id": str(agg.puesto.puesto_id),
-                "empresa_id": str(agg.puesto.empresa_id),
-                "titulo": agg.puesto.titulo,
-                "ubicacion": agg.puesto.ubicacion,
-                "tipo_contrato": tipo_contrato_value,
-                "fecha_publicacion": agg.puesto.fecha_publicacion.isoformat(),
-                "estado": estado_value
-            })
+        # Una sola consulta; los filtros ausentes no se aplican
+        puestos = self.puesto_repository.listar(
+            query.empresa_id, query.estado.value if query.estado else None
+        )
         
-        return resultado
\ No newline at end of file
+        # Construir respuesta resumida; el repositorio ya entrega tipo_contrato
+        # y estado como enums, así que se lee .value sin comprobaciones
+        return [
+            {
+                "puesto_id": str(puesto.puesto_id),
+                "empresa_id": str(puesto.empresa_id),
+                "titulo": puesto.titulo,
+                "ubicacion": puesto.ubicacion,
+                "tipo_contrato": puesto.tipo_contrato.value,
+                "fecha_publicacion": puesto.fecha_publicacion,
+                "estado": puesto.estado.value
+            }
+            for puesto in map(_leer_puesto, puestos)
+        ]
\ No newline at end of file
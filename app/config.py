@@ -1,6 +1,10 @@
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+
+# Valores del entorno que usan varios campos; se leen una sola vez
+_ENVIRONMENT = os.environ.get("ENVIRONMENT", "development")
+_ENABLE_SWAGGER = os.environ.get("ENABLE_SWAGGER", "false").lower() == "true"
 
 class Settings(BaseSettings):
     DB_USER: str = os.getenv("DB_USER", "postgres")
@@ -20,15 +24,30 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-for-jwt")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Factor de trabajo de bcrypt (en desarrollo/pruebas se puede bajar a 4)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    
+    # Hilos para los endpoints síncronos (los handlers hacen I/O bloqueante a la BD)
+    THREADPOOL_WORKERS: int = int(os.getenv("THREADPOOL_WORKERS", "100"))
     
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     
     CORS_ORIGINS: list = ["*"]
     
-    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
-    DEBUG: bool = ENVIRONMENT == "development" or os.getenv("ENABLE_SWAGGER", "false").lower() == "true"
-    SWAGGER_ALWAYS_ON: bool = os.getenv("ENABLE_SWAGGER", "false").lower() == "true"
+    # Creación de BD/tablas al importar la app; en Vercel se omite por defecto
+    # porque cada arranque en frío pagaría esas consultas de red
+    DB_BOOTSTRAP: bool = os.getenv(
+        "DB_BOOTSTRAP", "false" if os.getenv("VERCEL", "") == "1" else "true"
+    ).lower() == "true"
+    
+    # Cache (si no hay REDIS_URL las consultas van directo a la base de datos)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    CACHE_CUENTA_TTL: int = int(os.getenv("CACHE_CUENTA_TTL", "300"))
+    
+    ENVIRONMENT: str = _ENVIRONMENT
+    DEBUG: bool = _ENVIRONMENT == "development" or _ENABLE_SWAGGER
+    SWAGGER_ALWAYS_ON: bool = _ENABLE_SWAGGER
 
     class Config:
         env_file = ".env"
@@ -36,4 +55,10 @@ class Settings(BaseSettings):
 
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Construye la configuración una sola vez por proceso (lee entorno y .env)"""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,38 +1,49 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 
 class Command:
-    pass
+    __slots__ = ()
 
 class Query:
-    pass
+    __slots__ = ()
 
 class Event:
-    pass
+    __slots__ = ()
 
 class CommandHandler(ABC):
+    __slots__ = ()
+    
     @abstractmethod
     def handle(self, command: Command):
         pass
 
 class QueryHandler(ABC):
+    __slots__ = ()
+    
     @abstractmethod
     def handle(self, query: Query):
         pass
 
 class EventHandler(ABC):
+    __slots__ = ()
+    
     @abstractmethod
     def handle(self, event: Event):
         pass
 
-class Repository(ABC):
-    pass
+class Repository:
+    __slots__ = ()
 
 class AggregateRoot:
-    _events: List[Event] = []
+    # Lista propia de cada agregado; los agregados son dataclasses y su
+    # __init__ generado llama a __post_init__
+    __slots__ = ("_events",)
+    
+    def __post_init__(self):
+        self._events = []
     
     def add_event(self, event: Event):
         self._events.append(event)
@@ -40,5 +51,10 @@ class AggregateRoot:
     def clear_events(self):
         self._events.clear()
     
-    def get_events(self) -> List[Event]:
-        return self._events.copy()
\ No newline at end of file
+    def get_events(self) -> Tuple[Event, ...]:
+        return tuple(self._events)
+    
+    def pull_events(self) -> List[Event]:
+        """Devuelve los eventos pendientes y los descarta del agregado"""
+        events, self._events = self._events, []
+        return events
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, NamedTuple
 from uuid import UUID, uuid4
 
 from app.domain.common import AggregateRoot
@@ -15,7 +15,14 @@ class TipoFeedbackEnum(str, Enum):
     OTRO = "otro"
 
 
-@dataclass(frozen=True)
+# Plantilla del mensaje por tipo de feedback; los demás tipos usan el texto tal cual
+_PLANTILLAS_FEEDBACK = {
+    TipoFeedbackEnum.APROBACION: "¡Felicitaciones! {mensaje}",
+    TipoFeedbackEnum.RECHAZO: "Lo sentimos. {mensaje}. Motivo: {motivo}",
+}
+
+
+@dataclass(slots=True, frozen=True)
 class Feedback:
     """Value Object que representa el contenido del feedback enviado al postulante"""
     tipo: TipoFeedbackEnum
@@ -34,12 +41,10 @@ class Feedback:
         """
         Devuelve un mensaje formateado según el tipo de feedback
         """
-        if self.tipo == TipoFeedbackEnum.APROBACION:
-            return f"¡Felicitaciones! {self.mensaje_texto}"
-        elif self.tipo == TipoFeedbackEnum.RECHAZO:
-            return f"Lo sentimos. {self.mensaje_texto}. Motivo: {self.motivo_rechazo}"
-        else:  # INFORMATIVO
+        plantilla = _PLANTILLAS_FEEDBACK.get(self.tipo)
+        if plantilla is None:
             return self.mensaje_texto
+        return plantilla.format(mensaje=self.mensaje_texto, motivo=self.motivo_rechazo)
 
 
 class TipoMensajeEnum(str, Enum):
@@ -49,7 +54,7 @@ class TipoMensajeEnum(str, Enum):
     ACTUALIZACION = "actualizacion"
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactoPostulacion:
     """Entity que representa la interacción entre la empresa y el postulante"""
     contacto_id: UUID = field(default_factory=uuid4)
@@ -82,6 +87,13 @@ class ContactoPostulacion:
             self.motivo_rechazo = "Sin especificar"
 
 
+# Tipo del último feedback -> (estado solicitado a postulación, marca sobre el contacto)
+_ACCIONES_FEEDBACK = {
+    TipoFeedbackEnum.APROBACION: ("oferta", ContactoPostulacion.marcar_como_aceptado),
+    TipoFeedbackEnum.RECHAZO: ("rechazo", ContactoPostulacion.marcar_como_rechazado),
+}
+
+
 @dataclass
 class ContactoAggregate(AggregateRoot):
     """
@@ -116,36 +128,28 @@ class ContactoAggregate(AggregateRoot):
         if not self.lista_feedback:
             return
         
-        ultimo_feedback = self.lista_feedback[-1]
-        
-        if ultimo_feedback.tipo == TipoFeedbackEnum.APROBACION:
-            # Emitir evento para actualizar postulación a OFERTA
-            self.add_event(SolicitudCambioEstadoPostulacion(
-                self.contacto_postulacion.postulacion_id,
-                "oferta"
-            ))
-            self.contacto_postulacion.marcar_como_aceptado()
+        accion = _ACCIONES_FEEDBACK.get(self.lista_feedback[-1].tipo)
+        if accion is None:
+            return
         
-        elif ultimo_feedback.tipo == TipoFeedbackEnum.RECHAZO:
-            # Emitir evento para actualizar postulación a RECHAZO
-            self.add_event(SolicitudCambioEstadoPostulacion(
-                self.contacto_postulacion.postulacion_id,
-                "rechazo"
-            ))
-            self.contacto_postulacion.marcar_como_rechazado()
+        # Emitir evento para que postulación pase a OFERTA o RECHAZO
+        nuevo_estado, marcar = accion
+        self.add_event(SolicitudCambioEstadoPostulacion(
+            self.contacto_postulacion.postulacion_id,
+            nuevo_estado
+        ))
+        marcar(self.contacto_postulacion)
 
 
 # Eventos de dominio
-@dataclass
-class FeedbackEnviado:
+class FeedbackEnviado(NamedTuple):
     """Evento que se emite cuando se envía un feedback a un postulante"""
     contacto_id: UUID
     postulacion_id: UUID
     tipo_feedback: TipoFeedbackEnum
 
 
-@dataclass
-class SolicitudCambioEstadoPostulacion:
+class SolicitudCambioEstadoPostulacion(NamedTuple):
     """
     Evento que solicita al bounded context de postulación que cambie el estado
     """
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
 from app.domain.contacto.entities import ContactoAggregate
@@ -16,12 +16,31 @@ class ContactoRepository(ABC):
         """Guarda o actualiza un contacto y devuelve su ID"""
         pass
     
+    @abstractmethod
+    def guardar_muchos(self, contactos: Iterable[ContactoAggregate]) -> List[UUID]:
+        """Guarda o actualiza varios contactos en una sola transacción y devuelve sus IDs"""
+        pass
+    
     @abstractmethod
     def obtener_por_id(self, contacto_id: UUID) -> Optional[ContactoAggregate]:
         """Recupera un contacto por su ID"""
         pass
     
     @abstractmethod
-    def obtener_por_postulacion(self, postulacion_id: UUID) -> List[ContactoAggregate]:
-        """Recupera todos los contactos asociados a una postulación"""
-        pass
\ No newline at end of file
+    def obtener_por_ids(self, contacto_ids: Iterable[UUID]) -> Dict[UUID, ContactoAggregate]:
+        """Recupera varios contactos a la vez, indexados por ID"""
+        pass
+    
+    @abstractmethod
+    def obtener_por_postulacion(
+        self, postulacion_id: UUID, limit: int = 100, offset: int = 0
+    ) -> List[ContactoAggregate]:
+        """Recupera una página de los contactos asociados a una postulación"""
+        pass
+    
+    @abstractmethod
+    def obtener_por_postulacion_con_feedback(
+        self, postulacion_id: UUID, limit: int = 100, offset: int = 0
+    ) -> List[ContactoAggregate]:
+        """Recupera una página de contactos de una postulación con sus feedbacks en consultas por lote"""
+        pass
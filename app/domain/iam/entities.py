@@ -1,7 +1,9 @@
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Deque, List, Tuple, NamedTuple
 from uuid import UUID, uuid4
 
 from app.domain.common import AggregateRoot
@@ -22,7 +24,15 @@ class EstadoCuentaEnum(str, Enum):
     NO_VERIFICADA = "no_verificada"
 
 
-@dataclass(frozen=True)
+# Tipos de acceso del historial; en el agregado se guarda su posición en la tupla
+TIPOS_ACCESO = ("token_generado", "login_exitoso", "intento_fallido", "cambio_password")
+_CODIGO_TIPO_ACCESO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_ACCESO)}
+
+# Accesos como máximo pendientes de persistir en un agregado
+MAX_HISTORIAL_ACCESOS = 256
+
+
+@dataclass(slots=True, frozen=True)
 class Credencial:
     """Value Object que representa las credenciales de un usuario"""
     id_credencial: UUID = field(default_factory=uuid4)
@@ -38,7 +48,7 @@ class Credencial:
                 self.hash_password and len(self.hash_password) > 20)
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class Token:
     """Value Object que representa un token de acceso"""
     id_token: UUID = field(default_factory=uuid4)
@@ -47,12 +57,16 @@ class Token:
     fecha_creacion: datetime = field(default_factory=datetime.now)
     fecha_expiracion: Optional[datetime] = None
     activo: bool = True
+    # Expiración como timestamp epoch; si no se indica se deriva de fecha_expiracion
+    fecha_expiracion_epoch: Optional[float] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.fecha_expiracion_epoch is None and self.fecha_expiracion is not None:
+            object.__setattr__(self, "fecha_expiracion_epoch", self.fecha_expiracion.timestamp())
     
     def esta_expirado(self) -> bool:
         """Verifica si el token ha expirado"""
-        if self.fecha_expiracion is None:
-            return False
-        return datetime.now() > self.fecha_expiracion
+        return self.fecha_expiracion_epoch is not None and time.time() > self.fecha_expiracion_epoch
     
     def es_valido(self) -> bool:
         """Verifica si el token es válido (activo y no expirado)"""
@@ -75,16 +89,15 @@ class Cuenta:
     fecha_actualizacion: Optional[datetime] = None
     fecha_primer_acceso: Optional[datetime] = None
     
-    def cambiar_estado(self, nuevo_estado: EstadoCuentaEnum) -> None:
+    def cambiar_estado(self, nuevo_estado: EstadoCuentaEnum, ahora: Optional[datetime] = None) -> None:
         """Cambia el estado de la cuenta"""
         self.estado = nuevo_estado
-        self.fecha_actualizacion = datetime.now()
+        self.fecha_actualizacion = ahora or datetime.now()
     
-    def registrar_primer_acceso(self) -> None:
+    def registrar_primer_acceso(self, ahora: Optional[datetime] = None) -> None:
         """Registra el primer acceso a la cuenta"""
         if self.fecha_primer_acceso is None:
-            self.fecha_primer_acceso = datetime.now()
-            self.fecha_actualizacion = datetime.now()
+            self.fecha_primer_acceso = self.fecha_actualizacion = ahora or datetime.now()
 
 
 @dataclass
@@ -94,7 +107,11 @@ class CuentaAggregate(AggregateRoot):
     """
     cuenta: Cuenta
     tokens_activos: Dict[str, Token] = field(default_factory=dict)
-    historial_accesos: list = field(default_factory=list)
+    # Accesos registrados desde que se cargó el agregado, como tuplas
+    # (código de tipo, timestamp epoch, detalles); ver historial()
+    historial_accesos: Deque[Tuple[int, float, Dict[str, Any]]] = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORIAL_ACCESOS)
+    )
     intentos_fallidos: int = 0
     
     def aplicar_creacion_cuenta(
@@ -131,9 +148,10 @@ class CuentaAggregate(AggregateRoot):
         if self.cuenta.estado == EstadoCuentaEnum.VERIFICADA:
             return False
         
-        self.cuenta.cambiar_estado(EstadoCuentaEnum.VERIFICADA)
+        marca = time.time()
+        self.cuenta.cambiar_estado(EstadoCuentaEnum.VERIFICADA, datetime.fromtimestamp(marca))
         self.cuenta.datos_verificacion['codigo_usado'] = codigo_verificacion
-        self.cuenta.datos_verificacion['fecha_verificacion'] = datetime.now().isoformat()
+        self.cuenta.datos_verificacion['fecha_verificacion'] = marca
         
         self.add_event(CuentaVerificada(
             self.cuenta.cuenta_id
@@ -148,12 +166,16 @@ class CuentaAggregate(AggregateRoot):
         minutos_expiracion: int = 30
     ) -> None:
         """Aplica la generación de un nuevo token"""
-        fecha_expiracion = datetime.now() + timedelta(minutes=minutos_expiracion)
+        marca = time.time()
+        expiracion_epoch = marca + minutos_expiracion * 60
+        fecha_expiracion = datetime.fromtimestamp(expiracion_epoch)
         
         token = Token(
             token_value=token_value,
             tipo_token=tipo_token,
-            fecha_expiracion=fecha_expiracion
+            fecha_creacion=datetime.fromtimestamp(marca),
+            fecha_expiracion=fecha_expiracion,
+            fecha_expiracion_epoch=expiracion_epoch
         )
         
         # Almacenar token activo (mantener último token)
@@ -162,8 +184,8 @@ class CuentaAggregate(AggregateRoot):
         # Registrar acceso
         self._registrar_acceso("token_generado", {
             "tipo_token": tipo_token,
-            "fecha_expiracion": fecha_expiracion.isoformat()
-        })
+            "fecha_expiracion": expiracion_epoch
+        }, marca)
         
         self.add_event(TokenGenerado(
             self.cuenta.cuenta_id,
@@ -173,29 +195,37 @@ class CuentaAggregate(AggregateRoot):
     
     def aplicar_login_exitoso(self) -> None:
         """Aplica un login exitoso"""
-        self.cuenta.registrar_primer_acceso()
+        marca = time.time()
+        ahora = datetime.fromtimestamp(marca)
+        self.cuenta.registrar_primer_acceso(ahora)
         self.intentos_fallidos = 0
         
         self._registrar_acceso("login_exitoso", {
-            "fecha": datetime.now().isoformat()
-        })
+            "fecha": marca
+        }, marca)
         
         self.add_event(LoginExitoso(
             self.cuenta.cuenta_id
         ))
     
-    def aplicar_intento_fallido(self) -> None:
-        """Registra un intento de acceso fallido"""
-        self.intentos_fallidos += 1
+    def aplicar_intento_fallido(self, intentos: Optional[int] = None) -> None:
+        """
+        Registra un intento de acceso fallido. intentos es el total ya
+        incrementado en la base de datos; si no se indica se suma uno al
+        contador del agregado
+        """
+        marca = time.time()
+        ahora = datetime.fromtimestamp(marca)
+        self.intentos_fallidos = intentos if intentos is not None else self.intentos_fallidos + 1
         
         self._registrar_acceso("intento_fallido", {
             "numero_intento": self.intentos_fallidos,
-            "fecha": datetime.now().isoformat()
-        })
+            "fecha": marca
+        }, marca)
         
         # Suspender cuenta después de 5 intentos fallidos
         if self.intentos_fallidos >= 5:
-            self.cuenta.cambiar_estado(EstadoCuentaEnum.SUSPENDIDA)
+            self.cuenta.cambiar_estado(EstadoCuentaEnum.SUSPENDIDA, ahora)
             self.add_event(CuentaSuspendida(
                 self.cuenta.cuenta_id,
                 "Demasiados intentos fallidos"
@@ -203,74 +233,77 @@ class CuentaAggregate(AggregateRoot):
     
     def aplicar_cambio_password(self, nuevo_hash_password: str) -> None:
         """Aplica el cambio de contraseña"""
-        credencial_nueva = Credencial(
-            id_credencial=self.cuenta.credencial.id_credencial,
-            email=self.cuenta.credencial.email,
-            hash_password=nuevo_hash_password,
-            fecha_creacion=self.cuenta.credencial.fecha_creacion,
-            activa=True
+        marca = time.time()
+        ahora = datetime.fromtimestamp(marca)
+        self.cuenta.credencial = replace(
+            self.cuenta.credencial, hash_password=nuevo_hash_password, activa=True
         )
-        
-        self.cuenta.credencial = credencial_nueva
-        self.cuenta.fecha_actualizacion = datetime.now()
+        self.cuenta.fecha_actualizacion = ahora
         
         # Limpiar tokens activos al cambiar contraseña
         self.tokens_activos.clear()
         
         self._registrar_acceso("cambio_password", {
-            "fecha": datetime.now().isoformat()
-        })
+            "fecha": marca
+        }, marca)
         
         self.add_event(PasswordActualizado(
             self.cuenta.cuenta_id
         ))
     
-    def _registrar_acceso(self, tipo_acceso: str, detalles: Dict[str, Any]) -> None:
-        """Registra un acceso o evento en el historial"""
-        self.historial_accesos.append({
-            "tipo_acceso": tipo_acceso,
-            "fecha": datetime.now().isoformat(),
-            "detalles": detalles
-        })
+    def _registrar_acceso(self, tipo_acceso: str, detalles: Dict[str, Any], marca: Optional[float] = None) -> None:
+        """
+        Registra un acceso o evento en el historial; marca es el timestamp epoch
+        ya leído por el llamador. Las fechas de los detalles también van en epoch
+        y se formatean al persistirlas
+        """
+        self.historial_accesos.append(
+            (_CODIGO_TIPO_ACCESO[tipo_acceso], marca if marca is not None else time.time(), detalles)
+        )
+    
+    def historial(self) -> List[Dict[str, Any]]:
+        """Historial de accesos en forma de diccionarios, para persistirlo o exponerlo"""
+        return [
+            {
+                "tipo_acceso": TIPOS_ACCESO[codigo],
+                "fecha": datetime.fromtimestamp(timestamp),
+                "detalles": detalles
+            }
+            for codigo, timestamp, detalles in self.historial_accesos
+        ]
 
 
 # Eventos de dominio
-@dataclass
-class CuentaCreada:
+class CuentaCreada(NamedTuple):
     """Evento que se emite cuando se crea una nueva cuenta"""
     cuenta_id: UUID
     email: str
     rol: RolEnum
 
 
-@dataclass
-class CuentaVerificada:
+class CuentaVerificada(NamedTuple):
     """Evento que se emite cuando se verifica una cuenta"""
     cuenta_id: UUID
 
 
-@dataclass
-class TokenGenerado:
+class TokenGenerado(NamedTuple):
     """Evento que se emite cuando se genera un token"""
     cuenta_id: UUID
     token_id: UUID
     tipo_token: str
 
 
-@dataclass
-class LoginExitoso:
+class LoginExitoso(NamedTuple):
     """Evento que se emite cuando hay un login exitoso"""
     cuenta_id: UUID
 
 
-@dataclass
-class CuentaSuspendida:
+class CuentaSuspendida(NamedTuple):
     """Evento que se emite cuando se suspende una cuenta"""
     cuenta_id: UUID
     razon: str
 
 
-@dataclass
-class PasswordActualizado:
+class PasswordActualizado(NamedTuple):
     """Evento que se emite cuando se actualiza la contraseña"""
     cuenta_id: UUID
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import UUID
 
 from app.domain.iam.entities import CuentaAggregate
@@ -16,6 +16,24 @@ class CuentaRepository(ABC):
         """Guarda o actualiza una cuenta y devuelve su ID"""
         pass
     
+    @abstractmethod
+    def guardar_muchos(self, cuentas: Iterable[CuentaAggregate]) -> List[UUID]:
+        """Guarda o actualiza varias cuentas en una sola transacción y devuelve sus IDs"""
+        pass
+    
+    @abstractmethod
+    def incrementar_intentos_fallidos(self, cuenta_id: UUID) -> int:
+        """Suma un intento fallido de forma atómica y devuelve el total resultante"""
+        pass
+    
+    @abstractmethod
+    def guardar_intento_fallido(self, cuenta_aggregate: CuentaAggregate) -> None:
+        """
+        Persiste el historial y, si hubo suspensión, el estado de un intento
+        fallido, sin reescribir el contador de intentos
+        """
+        pass
+    
     @abstractmethod
     def obtener_por_id(self, cuenta_id: UUID) -> Optional[CuentaAggregate]:
         """Recupera una cuenta por su ID"""
@@ -26,12 +44,22 @@ class CuentaRepository(ABC):
         """Recupera una cuenta por su email"""
         pass
     
+    @abstractmethod
+    def obtener_por_ids(self, cuenta_ids: Iterable[UUID]) -> Dict[UUID, CuentaAggregate]:
+        """Recupera varias cuentas a la vez, indexadas por ID"""
+        pass
+    
     @abstractmethod
     def verificar_email_existe(self, email: str) -> bool:
         """Verifica si un email ya está registrado"""
         pass
     
     @abstractmethod
-    def listar_todas(self) -> List[CuentaAggregate]:
-        """Lista todas las cuentas"""
+    def listar_todas(self, limit: int = 100, offset: int = 0) -> List[CuentaAggregate]:
+        """Lista una página de cuentas, ordenadas por ID"""
+        pass
+    
+    @abstractmethod
+    def listar_proyeccion_cuentas(self) -> List[Dict[str, Any]]:
+        """Lista los datos planos de todas las cuentas sin reconstruir agregados"""
         pass
@@ -1,12 +1,14 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Optional, NamedTuple
 from uuid import UUID, uuid4
 
 from app.domain.common import AggregateRoot
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricaRegistro:
     """Entity que guarda las métricas del usuario"""
     cuenta_id: UUID
@@ -14,12 +16,15 @@ class MetricaRegistro:
     total_entrevistas: int = 0
     total_exitos: int = 0
     total_rechazos: int = 0
-    tasa_exito: float = 0.0
+    # ID de la cuenta como texto, calculado una sola vez por registro
+    cuenta_id_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.cuenta_id_str = str(self.cuenta_id)
     
     def aumentar_postulaciones(self) -> None:
         """Incrementa el contador de postulaciones"""
         self.total_postulaciones += 1
-        self._recalcular_tasa_exito()
     
     def aumentar_entrevistas(self) -> None:
         """Incrementa el contador de entrevistas"""
@@ -28,46 +33,61 @@ class MetricaRegistro:
     def aumentar_ofertas(self) -> None:
         """Incrementa el contador de ofertas exitosas"""
         self.total_exitos += 1
-        self._recalcular_tasa_exito()
     
     def aumentar_rechazos(self) -> None:
-        """Incrementa el contador de rechazos"""
+        """Incrementa el contador de rechazos (no afecta a la tasa de éxito)"""
         self.total_rechazos += 1
-        self._recalcular_tasa_exito()
     
-    def _recalcular_tasa_exito(self) -> None:
-        """Recalcula la tasa de éxito basada en postulaciones y ofertas"""
+    @property
+    def tasa_exito(self) -> float:
+        """Tasa de éxito (ofertas sobre postulaciones), calculada al leerla"""
         if self.total_postulaciones > 0:
-            self.tasa_exito = (self.total_exitos / self.total_postulaciones) * 100
-        else:
-            self.tasa_exito = 0.0
+            return (self.total_exitos / self.total_postulaciones) * 100
+        return 0.0
+
+
+class LogroTipoEnum(IntEnum):
+    """Contador que evalúa un logro; el valor es su posición en los argumentos de verificar_logro"""
+    POSTULACIONES = 0
+    ENTREVISTAS = 1
+    OFERTAS = 2
+
+
+# Palabra clave del nombre de un logro -> contador que lo evalúa, en orden de prioridad
+_PALABRAS_TIPO_LOGRO = (
+    ("postulaciones", LogroTipoEnum.POSTULACIONES),
+    ("entrevista", LogroTipoEnum.ENTREVISTAS),
+    ("oferta", LogroTipoEnum.OFERTAS),
+)
+
 
+@lru_cache(maxsize=256)
+def tipo_logro_por_nombre(nombre_logro: str) -> Optional[LogroTipoEnum]:
+    """Clasifica un logro por su nombre, para reglas que no indican el tipo"""
+    nombre = nombre_logro.lower()
+    for palabra, tipo in _PALABRAS_TIPO_LOGRO:
+        if palabra in nombre:
+            return tipo
+    return None
 
-@dataclass(frozen=True)
+
+@dataclass(slots=True, frozen=True)
 class Logro:
     """Value Object que representa un logro de gamificación"""
     id_logro: UUID = field(default_factory=uuid4)
     nombre_logro: str = ""
     umbral: int = 0
     fecha_obtencion: datetime = field(default_factory=datetime.now)
+    tipo: Optional[LogroTipoEnum] = None
     
     def verificar_logro(self, total_postulaciones: int, total_entrevistas: int, total_exitos: int) -> bool:
         """
         Verifica si se alcanzó el umbral necesario para el logro según su tipo
         """
-        # Ejemplo: si este es un logro de "5 postulaciones"
-        if "postulaciones" in self.nombre_logro.lower() and total_postulaciones >= self.umbral:
-            return True
-        
-        # Ejemplo: si este es un logro de "3 entrevistas"
-        elif "entrevista" in self.nombre_logro.lower() and total_entrevistas >= self.umbral:
-            return True
-        
-        # Ejemplo: si este es un logro de "2 ofertas"
-        elif "oferta" in self.nombre_logro.lower() and total_exitos >= self.umbral:
-            return True
-        
-        return False
+        tipo = self.tipo if self.tipo is not None else tipo_logro_por_nombre(self.nombre_logro)
+        if tipo is None:
+            return False
+        return (total_postulaciones, total_entrevistas, total_exitos)[tipo] >= self.umbral
 
 
 @dataclass
@@ -123,7 +143,6 @@ class MetricaAggregate(AggregateRoot):
         # Decrementar postulaciones
         if self.metrica_registro.total_postulaciones > 0:
             self.metrica_registro.total_postulaciones -= 1
-            self.metrica_registro._recalcular_tasa_exito()
             self.add_event(MetricaActualizada(
                 self.metrica_registro.cuenta_id,
                 "postulacion_eliminada"
@@ -134,16 +153,21 @@ class MetricaAggregate(AggregateRoot):
         Evalúa y otorga logros según las reglas y el estado actual de las métricas
         """
         nuevos_logros = []
+        # Nombres de los logros ya obtenidos, para comprobar cada regla sin recorrer la lista
+        obtenidos = {logro.nombre_logro for logro in self.lista_logros}
         
         for regla in lista_reglas:
             # Verificar si ya tiene este logro
-            if any(logro.nombre_logro == regla["nombre"] for logro in self.lista_logros):
+            if regla["nombre"] in obtenidos:
                 continue
             
-            # Crear logro temporal para verificar
+            # Crear logro temporal para verificar; el tipo se toma de la regla
+            # o se deduce una sola vez del nombre
+            tipo = regla.get("tipo")
             logro_temp = Logro(
                 nombre_logro=regla["nombre"],
-                umbral=regla["umbral"]
+                umbral=regla["umbral"],
+                tipo=LogroTipoEnum(tipo) if tipo is not None else tipo_logro_por_nombre(regla["nombre"])
             )
             
             # Verificar si cumple requisitos
@@ -155,6 +179,7 @@ class MetricaAggregate(AggregateRoot):
                 # Agregar a la lista de logros
                 self.lista_logros.append(logro_temp)
                 nuevos_logros.append(logro_temp)
+                obtenidos.add(logro_temp.nombre_logro)
                 
                 # Emitir evento de logro conseguido
                 self.add_event(LogroConseguido(
@@ -166,15 +191,13 @@ class MetricaAggregate(AggregateRoot):
 
 
 # Eventos de dominio
-@dataclass
-class MetricaActualizada:
+class MetricaActualizada(NamedTuple):
     """Evento que se emite cuando se actualiza una métrica"""
     cuenta_id: UUID
     tipo_actualizacion: str
 
 
-@dataclass
-class LogroConseguido:
+class LogroConseguido(NamedTuple):
     """Evento que se emite cuando un postulante consigue un logro"""
     cuenta_id: UUID
     nombre_logro: str
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import UUID
 
 from app.domain.metrica.entities import MetricaAggregate
@@ -16,7 +16,37 @@ class MetricaRepository(ABC):
         """Guarda o actualiza una métrica y devuelve el ID del perfil asociado"""
         pass
     
+    @abstractmethod
+    def guardar_muchos(self, metricas: Iterable[MetricaAggregate]) -> List[UUID]:
+        """Guarda o actualiza varias métricas y devuelve los IDs de los perfiles asociados"""
+        pass
+    
     @abstractmethod
     def obtener_por_postulante(self, postulante_id: UUID) -> Optional[MetricaAggregate]:
         """Recupera las métricas de un postulante por su ID"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def obtener_por_ids(self, postulante_ids: Iterable[UUID]) -> Dict[UUID, MetricaAggregate]:
+        """Recupera las métricas de varios postulantes a la vez, indexadas por ID"""
+        pass
+    
+    @abstractmethod
+    def obtener_metricas_completas(self, postulante_id: UUID) -> Dict[str, Any]:
+        """Calcula todos los contadores de un postulante en una sola consulta"""
+        pass
+    
+    @abstractmethod
+    def construir_agregado(self, postulante_id: UUID, metricas: Dict[str, Any]) -> MetricaAggregate:
+        """Construye el agregado a partir de contadores ya calculados, sin consultar la base de datos"""
+        pass
+    
+    @abstractmethod
+    def tiene_postulaciones(self, postulante_id: UUID) -> bool:
+        """Indica si el postulante tiene al menos una postulación"""
+        pass
+    
+    @abstractmethod
+    def listar_logros_serializados(self, postulante_id: UUID) -> List[Dict[str, Any]]:
+        """Lista los logros del postulante ya en forma de respuesta"""
+        pass
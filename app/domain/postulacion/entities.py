@@ -1,7 +1,8 @@
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 from uuid import UUID, uuid4
 
 from app.domain.common import AggregateRoot
@@ -173,7 +174,12 @@ class PostulacionAggregate(AggregateRoot):
             descripcion=f"Postulación creada en estado {self.estado.valor.value}"
         )
         # Aquí podríamos agregar un evento de dominio
-        self.add_event(PostulacionCreada(self.postulacion.postulacion_id))
+        self.add_event(PostulacionCreada(
+            self.postulacion.postulacion_id,
+            self.postulacion.candidato_id,
+            self.estado.valor.value,
+            time.time()
+        ))
     
     def cambiar_estado(self, nuevo_estado: str) -> bool:
         estado_anterior = self.estado.valor
@@ -193,7 +199,9 @@ class PostulacionAggregate(AggregateRoot):
             self.add_event(EstadoPostulacionActualizado(
                 self.postulacion.postulacion_id,
                 estado_anterior.value,
-                nuevo_estado_enum.value
+                nuevo_estado_enum.value,
+                self.postulacion.candidato_id,
+                time.time()
             ))
             return True
         return False
@@ -207,15 +215,20 @@ class PostulacionAggregate(AggregateRoot):
 
 
 # Eventos de dominio
-@dataclass
-class PostulacionCreada:
+class PostulacionCreada(NamedTuple):
     """Evento que se emite cuando se crea una nueva postulación"""
     postulacion_id: UUID
+    candidato_id: Optional[UUID] = None
+    estado: str = EstadoPostulacionEnum.PENDIENTE.value
+    # Timestamp epoch tomado antes del commit; ver ajustar_metricas_cacheadas
+    marca: Optional[float] = None
 
 
-@dataclass
-class EstadoPostulacionActualizado:
+class EstadoPostulacionActualizado(NamedTuple):
     """Evento que se emite cuando el estado de la postulación cambia"""
     postulacion_id: UUID
     estado_anterior: str
-    estado_nuevo: str
\ No newline at end of file
+    estado_nuevo: str
+    candidato_id: Optional[UUID] = None
+    # Timestamp epoch tomado antes del commit; ver ajustar_metricas_cacheadas
+    marca: Optional[float] = None
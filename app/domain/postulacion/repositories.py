@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 
-from app.domain.postulacion.entities import Postulacion, PuestoPostulacion, PostulacionAggregate
+from app.domain.postulacion.entities import (
+    Postulacion, PuestoPostulacion, PostulacionAggregate, EstadoPostulacionActualizado
+)
 
 
 class PostulacionRepository(ABC):
@@ -16,20 +18,87 @@ class PostulacionRepository(ABC):
         """Guarda o actualiza una postulación y devuelve su ID"""
         pass
     
+    @abstractmethod
+    def crear_si_puesto_abierto(self, puesto_id: UUID, postulacion: PostulacionAggregate) -> Optional[UUID]:
+        """
+        Guarda una postulación nueva solo si el puesto existe y está abierto,
+        de forma atómica. Devuelve su ID, o None si el puesto no está disponible
+        """
+        pass
+    
     @abstractmethod
     def obtener_por_id(self, postulacion_id: UUID) -> Optional[PostulacionAggregate]:
         """Recupera una postulación por su ID"""
         pass
     
+    @abstractmethod
+    def obtener_por_id_sin_hitos(self, postulacion_id: UUID) -> Optional[Tuple[PostulacionAggregate, int]]:
+        """
+        Recupera la cabecera de una postulación sin cargar su línea de tiempo.
+        Devuelve el agregado con la línea de tiempo vacía y el número de hitos
+        """
+        pass
+    
+    @abstractmethod
+    def listar_hitos(self, postulacion_id: UUID, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Página de los hitos de una postulación, del más antiguo al más reciente"""
+        pass
+    
+    @abstractmethod
+    def transicionar_estado(
+        self, postulacion_id: UUID, nuevo_estado: str
+    ) -> Union[EstadoPostulacionActualizado, bool, None]:
+        """
+        Cambia el estado de la postulación si la transición es válida.
+        Devuelve el evento del cambio si se aplicó, False si no está
+        permitida y None si la postulación no existe
+        """
+        pass
+    
     @abstractmethod
     def obtener_por_candidato(self, candidato_id: UUID) -> List[PostulacionAggregate]:
         """Recupera todas las postulaciones de un candidato"""
         pass
     
+    @abstractmethod
+    def listar_proyeccion_por_candidato(self, candidato_id: UUID) -> List[Dict[str, Any]]:
+        """Lista los datos planos de las postulaciones de un candidato sin reconstruir agregados"""
+        pass
+    
+    @abstractmethod
+    def obtener_historial_proyectado(
+        self, candidato_id: UUID, limit: int, offset: int, incluir_hitos: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Devuelve una página del historial del candidato, de la postulación más
+        reciente a la más antigua, ya en forma de respuesta
+        """
+        pass
+    
+    @abstractmethod
+    def buscar_por_empresa_o_puesto(self, candidato_id: UUID, termino_busqueda: str) -> List[Dict[str, Any]]:
+        """Busca postulaciones del candidato por título del puesto o nombre de la empresa"""
+        pass
+    
+    @abstractmethod
+    def filtrar_por_estado(self, candidato_id: UUID, estado: str) -> List[Dict[str, Any]]:
+        """Lista las postulaciones del candidato que están en un estado"""
+        pass
+    
+    @abstractmethod
+    def ordenar_postulaciones(self, candidato_id: UUID, criterio: str, descendente: bool = False) -> List[Dict[str, Any]]:
+        """Lista las postulaciones del candidato ordenadas por fecha o estado"""
+        pass
+    
     @abstractmethod
     def obtener_por_puesto(self, puesto_id: UUID) -> List[PostulacionAggregate]:
         """Recupera todas las postulaciones a un puesto específico"""
         pass
+    
+    @abstractmethod
+    def obtener_por_ids(self, postulacion_ids: Iterable[UUID]) -> Dict[UUID, PostulacionAggregate]:
+        """Recupera varias postulaciones a la vez, indexadas por ID"""
+        pass
 
 
 class PuestoPostulacionRepository(ABC):
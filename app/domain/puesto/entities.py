@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 from uuid import UUID, uuid4
 
 from app.domain.common import AggregateRoot
@@ -64,25 +64,31 @@ class Puesto:
     def actualizar_informacion(self, titulo=None, descripcion=None, 
                               ubicacion=None, salario_min=None, 
                               salario_max=None, moneda=None,
-                              tipo_contrato=None) -> None:
-        """Actualiza la información básica del puesto"""
+                              tipo_contrato=None) -> bool:
+        """
+        Actualiza la información básica del puesto.
+        Devuelve True si algún campo cambió de valor.
+        """
         if self.estado == EstadoPuestoEnum.CERRADO:
             raise ValueError("No se puede actualizar un puesto cerrado")
-            
-        if titulo is not None:
-            self.titulo = titulo
-        if descripcion is not None:
-            self.descripcion = descripcion
-        if ubicacion is not None:
-            self.ubicacion = ubicacion
-        if salario_min is not None:
-            self.salario_min = salario_min
-        if salario_max is not None:
-            self.salario_max = salario_max
-        if moneda is not None:
-            self.moneda = moneda
-        if tipo_contrato is not None:
-            self.tipo_contrato = tipo_contrato
+        
+        cambios = {
+            "titulo": titulo,
+            "descripcion": descripcion,
+            "ubicacion": ubicacion,
+            "salario_min": salario_min,
+            "salario_max": salario_max,
+            "moneda": moneda,
+            "tipo_contrato": tipo_contrato
+        }
+        
+        hubo_cambios = False
+        for campo, valor in cambios.items():
+            if valor is not None and getattr(self, campo) != valor:
+                setattr(self, campo, valor)
+                hubo_cambios = True
+        
+        return hubo_cambios
 
 
 @dataclass
@@ -99,12 +105,15 @@ class PuestoAggregate(AggregateRoot):
         requisito = Requisito(tipo=tipo, descripcion=descripcion, es_obligatorio=es_obligatorio)
         self.requisitos.append(requisito)
     
-    def actualizar_requisitos(self, nuevos_requisitos: List[Dict[str, Any]]) -> None:
-        """Actualiza la lista completa de requisitos"""
+    def actualizar_requisitos(self, nuevos_requisitos: List[Dict[str, Any]]) -> bool:
+        """
+        Actualiza la lista completa de requisitos.
+        Devuelve True si la lista resultante es distinta de la actual.
+        """
         if self.puesto.estado == EstadoPuestoEnum.CERRADO:
             raise ValueError("No se pueden actualizar requisitos de un puesto cerrado")
             
-        self.requisitos = [
+        requisitos = [
             Requisito(
                 tipo=req.get("tipo", "general"),
                 descripcion=req.get("descripcion", ""),
@@ -112,6 +121,12 @@ class PuestoAggregate(AggregateRoot):
             )
             for req in nuevos_requisitos
         ]
+        
+        if requisitos == self.requisitos:
+            return False
+        
+        self.requisitos = requisitos
+        return True
     
     def cambiar_estado(self, nuevo_estado: EstadoPuestoEnum) -> bool:
         """Cambia el estado del puesto (abierto/cerrado)"""
@@ -122,23 +137,20 @@ class PuestoAggregate(AggregateRoot):
 
 
 # Eventos de dominio
-@dataclass
-class PuestoCreado:
+class PuestoCreado(NamedTuple):
     """Evento que se emite cuando se crea un nuevo puesto"""
     puesto_id: UUID
     empresa_id: UUID
 
 
-@dataclass
-class PuestoCerrado:
+class PuestoCerrado(NamedTuple):
     """Evento que se emite cuando se cierra un puesto"""
     puesto_id: UUID
     empresa_id: UUID
     fecha_cierre: datetime
 
 
-@dataclass
-class PuestoActualizado:
+class PuestoActualizado(NamedTuple):
     """Evento que se emite cuando se actualiza un puesto"""
     puesto_id: UUID
     campos_actualizados: List[str]
\ No newline at end of file
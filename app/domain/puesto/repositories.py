@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
 from .entities import PuestoAggregate
@@ -19,18 +19,16 @@ class PuestoRepository(ABC):
         pass
     
     @abstractmethod
-    def listar_por_empresa(self, empresa_id: UUID) -> List[PuestoAggregate]:
-        """Lista los puestos de una empresa específica"""
+    def obtener_por_ids(self, puesto_ids: Iterable[UUID]) -> Dict[UUID, PuestoAggregate]:
+        """Obtiene varios puestos a la vez, indexados por ID"""
         pass
     
     @abstractmethod
-    def listar_por_estado(self, estado: str) -> List[PuestoAggregate]:
-        """Lista los puestos según su estado (abierto/cerrado)"""
-        pass
-    
-    @abstractmethod
-    def listar_todos(self) -> List[PuestoAggregate]:
-        """Lista todos los puestos"""
+    def listar(self, empresa_id: Optional[UUID] = None, estado: Optional[str] = None) -> List[PuestoAggregate]:
+        """
+        Lista los puestos, del más reciente al más antiguo, filtrando por
+        empresa y/o estado (abierto/cerrado) cuando se indican
+        """
         pass
     
     @abstractmethod
@@ -0,0 +1,2 @@
+# app/infrastructure/cache/__init__.py
+# Este archivo permite que el directorio sea un paquete Python
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Cache en memoria del proceso con expiración por tiempo.
+
+Pensado para datos pequeños y muy consultados que toleran unos segundos
+de desfase; cada instancia de la API mantiene su propia copia.
+"""
+import threading
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+
+class CacheTTL:
+    """TTLCache de cachetools protegido con un lock para uso entre hilos"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """Devuelve el valor cacheado o None si no existe o expiró"""
+        with self._lock:
+            return self._cache.get(clave)
+
+    def guardar(self, clave: Hashable, valor: Any) -> None:
+        """Guarda un valor con el TTL del cache"""
+        with self._lock:
+            self._cache[clave] = valor
+
+    def invalidar(self, clave: Hashable) -> None:
+        """Elimina una clave si existe"""
+        with self._lock:
+            self._cache.pop(clave, None)
+
+    def limpiar(self) -> None:
+        """Vacía el cache completo"""
+        with self._lock:
+            self._cache.clear()
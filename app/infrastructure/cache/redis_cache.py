@@ -0,0 +1,75 @@
+"""
+Cliente Redis compartido para el patrón cache-aside.
+
+Si REDIS_URL no está configurado o la librería no está instalada, las
+funciones se comportan como un cache vacío y las consultas van directo
+al repositorio.
+"""
+import logging
+from typing import Any, Optional
+
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# El módulo redis solo se importa si hay REDIS_URL (ahorra tiempo de arranque en frío)
+redis = None
+_cliente: Optional["redis.Redis"] = None
+
+
+def obtener_cliente_redis() -> Optional["redis.Redis"]:
+    """Devuelve el cliente Redis del proceso o None si el cache está deshabilitado"""
+    global _cliente, redis
+
+    if _cliente is None and settings.REDIS_URL:
+        try:
+            import redis
+        except ImportError:
+            logger.warning("REDIS_URL configurado pero la librería redis no está instalada")
+            return None
+
+        _cliente = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+
+    return _cliente
+
+
+def cache_obtener(cliente: Optional["redis.Redis"], clave: str) -> Optional[Any]:
+    """Lee y deserializa una clave; cualquier fallo de Redis se trata como miss"""
+    if cliente is None:
+        return None
+
+    try:
+        valor = cliente.get(clave)
+    except redis.RedisError as e:
+        logger.warning(f"Error leyendo cache '{clave}': {e}")
+        return None
+
+    return orjson.loads(valor) if valor is not None else None
+
+
+def cache_guardar(cliente: Optional["redis.Redis"], clave: str, valor: Any, ttl: int) -> None:
+    """Serializa y guarda un valor con expiración en segundos"""
+    if cliente is None:
+        return
+
+    try:
+        cliente.set(clave, orjson.dumps(valor), ex=ttl)
+    except redis.RedisError as e:
+        logger.warning(f"Error escribiendo cache '{clave}': {e}")
+
+
+def cache_invalidar(cliente: Optional["redis.Redis"], *claves: str) -> None:
+    """Elimina una o varias claves del cache"""
+    if cliente is None or not claves:
+        return
+
+    try:
+        cliente.delete(*claves)
+    except redis.RedisError as e:
+        logger.warning(f"Error invalidando cache {claves}: {e}")
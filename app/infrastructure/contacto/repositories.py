@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID, uuid4
 from sqlalchemy.orm import Session
 
@@ -18,48 +18,67 @@ class ContactoRepositoryImpl(ContactoRepository):
     
     def guardar(self, contacto_aggregate: ContactoAggregate) -> UUID:
 
+        return self.guardar_muchos([contacto_aggregate])[0]
+    
+    def guardar_muchos(self, contactos: Iterable[ContactoAggregate]) -> List[UUID]:
+        """
+        Guarda varios contactos en una sola transacción: una consulta IN para
+        los contactos existentes, un DELETE para sus feedbacks previos y un
+        único commit para todas las inserciones
+        """
+        contactos = list(contactos)
+        if not contactos:
+            return []
+        
         db = SessionLocal()
         try:
-            contacto = contacto_aggregate.contacto_postulacion
-            contacto_id = contacto.contacto_id
-            
-            contacto_db = db.query(ContactoPostulacionModel).filter(
-                ContactoPostulacionModel.id == str(contacto_id)
-            ).first()
-            
-            if not contacto_db:
-                contacto_db = ContactoPostulacionModel(
-                    id=str(contacto_id),
-                    postulacion_id=str(contacto.postulacion_id),
-                    empresa_id=str(contacto.empresa_id),
-                    cuenta_id=str(contacto.cuenta_id),
-                    tipo_mensaje=contacto.tipo_mensaje.value,
-                    motivo_rechazo=contacto.motivo_rechazo,
-                    fecha_hora=contacto.fecha_hora
+            ids_str = [str(c.contacto_postulacion.contacto_id) for c in contactos]
+            existentes = {
+                contacto_db.id: contacto_db
+                for contacto_db in db.query(ContactoPostulacionModel).filter(
+                    ContactoPostulacionModel.id.in_(ids_str)
                 )
-                db.add(contacto_db)
-            else:
-                contacto_db.tipo_mensaje = contacto.tipo_mensaje.value
-                contacto_db.motivo_rechazo = contacto.motivo_rechazo
+            }
             
-            db.query(FeedbackModel).filter(
-                FeedbackModel.contacto_id == str(contacto_id)
-            ).delete()
+            # Solo un contacto existente puede tener feedbacks previos que reemplazar
+            if existentes:
+                db.query(FeedbackModel).filter(
+                    FeedbackModel.contacto_id.in_(list(existentes))
+                ).delete(synchronize_session=False)
             
-
-            for feedback in contacto_aggregate.lista_feedback:
-                feedback_id = uuid4() 
-                feedback_db = FeedbackModel(
-                    id=str(feedback_id),
-                    contacto_id=str(contacto_id),
-                    tipo=feedback.tipo.value,
-                    mensaje_texto=feedback.mensaje_texto,
-                    motivo_rechazo=feedback.motivo_rechazo
-                )
-                db.add(feedback_db)
+            for contacto_id_str, contacto_aggregate in zip(ids_str, contactos):
+                contacto = contacto_aggregate.contacto_postulacion
+                contacto_db = existentes.get(contacto_id_str)
+                
+                if not contacto_db:
+                    contacto_db = ContactoPostulacionModel(
+                        id=contacto_id_str,
+                        postulacion_id=str(contacto.postulacion_id),
+                        empresa_id=str(contacto.empresa_id),
+                        cuenta_id=str(contacto.cuenta_id),
+                        tipo_mensaje=contacto.tipo_mensaje.value,
+                        motivo_rechazo=contacto.motivo_rechazo,
+                        fecha_hora=contacto.fecha_hora
+                    )
+                    db.add(contacto_db)
+                    existentes[contacto_id_str] = contacto_db
+                else:
+                    contacto_db.tipo_mensaje = contacto.tipo_mensaje.value
+                    contacto_db.motivo_rechazo = contacto.motivo_rechazo
+                
+                db.add_all([
+                    FeedbackModel(
+                        id=str(uuid4()),
+                        contacto_id=contacto_id_str,
+                        tipo=feedback.tipo.value,
+                        mensaje_texto=feedback.mensaje_texto,
+                        motivo_rechazo=feedback.motivo_rechazo
+                    )
+                    for feedback in contacto_aggregate.lista_feedback
+                ])
             
             db.commit()
-            return contacto_id
+            return [c.contacto_postulacion.contacto_id for c in contactos]
             
         except Exception as e:
             db.rollback()
@@ -78,51 +97,97 @@ class ContactoRepositoryImpl(ContactoRepository):
             if not contacto_db:
                 return None
             
-            contacto = ContactoPostulacion(
-                contacto_id=UUID(contacto_db.id),
-                postulacion_id=UUID(contacto_db.postulacion_id),
-                empresa_id=UUID(contacto_db.empresa_id),
-                cuenta_id=UUID(contacto_db.cuenta_id),
-                tipo_mensaje=contacto_db.tipo_mensaje,
-                motivo_rechazo=contacto_db.motivo_rechazo,
-                fecha_hora=contacto_db.fecha_hora
-            )
-            
-            lista_feedback = []
-            for feedback_db in contacto_db.feedbacks:
-                feedback = Feedback(
-                    tipo=feedback_db.tipo,
-                    mensaje_texto=feedback_db.mensaje_texto,
-                    motivo_rechazo=feedback_db.motivo_rechazo
-                )
-                lista_feedback.append(feedback)
-            
-            contacto_aggregate = ContactoAggregate(
-                contacto_postulacion=contacto,
-                lista_feedback=lista_feedback
-            )
-            
-            return contacto_aggregate
+            return self._mapear_a_aggregate(contacto_db, contacto_db.feedbacks)
             
         finally:
             db.close()
     
-    def obtener_por_postulacion(self, postulacion_id: UUID) -> List[ContactoAggregate]:
-        """Recupera todos los contactos asociados a una postulación"""
+    def obtener_por_ids(self, contacto_ids: Iterable[UUID]) -> Dict[UUID, ContactoAggregate]:
+        """Recupera varios contactos con una consulta IN para contactos y otra para sus feedbacks"""
+        ids_str = {str(contacto_id) for contacto_id in contacto_ids}
+        if not ids_str:
+            return {}
+        
+        contactos = self._listar_con_feedback(ContactoPostulacionModel.id.in_(ids_str))
+        return {c.contacto_postulacion.contacto_id: c for c in contactos}
+    
+    def obtener_por_postulacion(
+        self, postulacion_id: UUID, limit: int = 100, offset: int = 0
+    ) -> List[ContactoAggregate]:
+        """Recupera una página de los contactos asociados a una postulación"""
+        return self.obtener_por_postulacion_con_feedback(postulacion_id, limit, offset)
+    
+    def obtener_por_postulacion_con_feedback(
+        self, postulacion_id: UUID, limit: int = 100, offset: int = 0
+    ) -> List[ContactoAggregate]:
+        """
+        Recupera una página de contactos de una postulación, por fecha, con sus
+        feedbacks usando dos consultas: contactos y luego feedbacks con IN (contacto_ids)
+        """
+        return self._listar_con_feedback(
+            ContactoPostulacionModel.postulacion_id == str(postulacion_id), limit=limit, offset=offset
+        )
+    
+    def _listar_con_feedback(
+        self, *filtros, limit: Optional[int] = None, offset: int = 0
+    ) -> List[ContactoAggregate]:
+        """
+        Contactos que cumplen los filtros, con sus feedbacks cargados en una
+        segunda consulta IN; con limit se devuelve solo esa página, por fecha
+        """
         db = SessionLocal()
         try:
-            contactos_db = db.query(ContactoPostulacionModel).filter(
-                ContactoPostulacionModel.postulacion_id == str(postulacion_id)
-            ).all()
+            consulta = db.query(ContactoPostulacionModel).filter(*filtros)
+            if limit is not None:
+                consulta = consulta.order_by(
+                    ContactoPostulacionModel.fecha_hora, ContactoPostulacionModel.id
+                ).offset(offset).limit(limit)
+            contactos_db = consulta.all()
+            
+            if not contactos_db:
+                return []
             
-            resultado = []
-            for contacto_db in contactos_db:
-                #### Obtener cada contacto completo
-                contacto_aggregate = self.obtener_por_id(UUID(contacto_db.id))
-                if contacto_aggregate:
-                    resultado.append(contacto_aggregate)
+            feedbacks_por_contacto = {contacto_db.id: [] for contacto_db in contactos_db}
+            feedbacks_db = db.query(FeedbackModel).filter(
+                FeedbackModel.contacto_id.in_(list(feedbacks_por_contacto))
+            ).all()
+            for feedback_db in feedbacks_db:
+                feedbacks_por_contacto[feedback_db.contacto_id].append(feedback_db)
             
-            return resultado
+            return [
+                self._mapear_a_aggregate(contacto_db, feedbacks_por_contacto[contacto_db.id])
+                for contacto_db in contactos_db
+            ]
             
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+    
+    def _mapear_a_aggregate(
+        self,
+        contacto_db: ContactoPostulacionModel,
+        feedbacks_db: List[FeedbackModel]
+    ) -> ContactoAggregate:
+        """Construye el agregado a partir del modelo y sus feedbacks ya cargados"""
+        contacto = ContactoPostulacion(
+            contacto_id=UUID(contacto_db.id),
+            postulacion_id=UUID(contacto_db.postulacion_id),
+            empresa_id=UUID(contacto_db.empresa_id),
+            cuenta_id=UUID(contacto_db.cuenta_id),
+            tipo_mensaje=contacto_db.tipo_mensaje,
+            motivo_rechazo=contacto_db.motivo_rechazo,
+            fecha_hora=contacto_db.fecha_hora
+        )
+        
+        lista_feedback = [
+            Feedback(
+                tipo=feedback_db.tipo,
+                mensaje_texto=feedback_db.mensaje_texto,
+                motivo_rechazo=feedback_db.motivo_rechazo
+            )
+            for feedback_db in feedbacks_db
+        ]
+        
+        return ContactoAggregate(
+            contacto_postulacion=contacto,
+            lista_feedback=lista_feedback
+        )
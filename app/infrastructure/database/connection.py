@@ -75,15 +75,16 @@ def create_database():
         if 'temp_engine' in locals():
             temp_engine.dispose()
 
-try:
-    logger.info("Verificando conexión a PostgreSQL...")
-    if is_database_available():
-        logger.info("Conexión a PostgreSQL establecida.")
-        create_database()
-    else:
-        logger.warning("No se pudo conectar a PostgreSQL. Continuando sin verificar/crear la base de datos.")
-except Exception as e:
-    logger.error(f"Error durante la inicialización de la base de datos: {e}")
+if settings.DB_BOOTSTRAP:
+    try:
+        logger.info("Verificando conexión a PostgreSQL...")
+        if is_database_available():
+            logger.info("Conexión a PostgreSQL establecida.")
+            create_database()
+        else:
+            logger.warning("No se pudo conectar a PostgreSQL. Continuando sin verificar/crear la base de datos.")
+    except Exception as e:
+        logger.error(f"Error durante la inicialización de la base de datos: {e}")
 
 # Detectar entorno Vercel
 IS_VERCEL = os.getenv("VERCEL", "") == "1"
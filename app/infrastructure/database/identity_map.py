@@ -0,0 +1,27 @@
+"""
+Identity map con alcance de petición.
+
+Guarda los agregados ya reconstruidos durante una petición HTTP para que
+las lecturas repetidas del mismo ID (comando y consulta encadenados,
+dependencias de autenticación) no vuelvan a la base de datos.
+"""
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class IdentityMap:
+    """Mapa (tipo de agregado, clave) -> agregado, válido durante una petición"""
+
+    def __init__(self):
+        self._map: Dict[Tuple[type, Hashable], Any] = {}
+
+    def obtener(self, tipo: type, clave: Hashable) -> Optional[Any]:
+        """Devuelve el agregado registrado o None si aún no se ha cargado"""
+        return self._map.get((tipo, clave))
+
+    def registrar(self, tipo: type, clave: Hashable, agregado: Any) -> None:
+        """Registra un agregado recién cargado o guardado"""
+        self._map[(tipo, clave)] = agregado
+
+    def descartar(self, tipo: type, clave: Hashable) -> None:
+        """Elimina un agregado del mapa"""
+        self._map.pop((tipo, clave), None)
@@ -0,0 +1,114 @@
+"""
+Escritura de cuentas por lotes para los flujos asíncronos de IAM.
+
+Las escrituras que llegan durante una ventana corta (MAX_ESPERA_MS) se
+agrupan y se persisten con un único guardar_muchos, en lugar de una
+transacción por petición. Cada llamador espera su propio resultado.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.iam.entities import CuentaAggregate
+from app.domain.iam.repositories import CuentaRepository
+from app.infrastructure.iam.repositories import CuentaRepositoryImpl
+
+logger = logging.getLogger(__name__)
+
+# Máximo de cuentas por lote y espera máxima para completarlo
+MAX_LOTE = 64
+MAX_ESPERA_MS = 3
+
+
+class GuardadoCuentasPorLotes:
+    """Agrupa las escrituras de cuentas concurrentes en un solo guardar_muchos"""
+
+    def __init__(
+        self,
+        cuenta_repository: CuentaRepository,
+        max_lote: int = MAX_LOTE,
+        max_espera_ms: float = MAX_ESPERA_MS
+    ):
+        self.cuenta_repository = cuenta_repository
+        self.max_lote = max_lote
+        self.max_espera = max_espera_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cola: Optional[asyncio.Queue] = None
+        self._tarea: Optional[asyncio.Task] = None
+
+    async def guardar(self, cuenta_aggregate: CuentaAggregate) -> UUID:
+        """Encola la cuenta y espera a que se persista su lote"""
+        loop = asyncio.get_running_loop()
+        self._asegurar_tarea(loop)
+
+        futuro = loop.create_future()
+        self._cola.put_nowait((cuenta_aggregate, futuro))
+        return await futuro
+
+    def _asegurar_tarea(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Arranca la tarea de vaciado en el loop actual si no está en marcha"""
+        if self._loop is not loop:
+            # Un loop nuevo (otro worker o reinicio) necesita su propia cola
+            self._loop = loop
+            self._cola = asyncio.Queue()
+            self._tarea = None
+
+        if self._tarea is None or self._tarea.done():
+            self._tarea = loop.create_task(self._vaciar())
+
+    async def _vaciar(self) -> None:
+        """Toma lotes de la cola y los persiste mientras el loop siga activo"""
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+
+            limite = loop.time() + self.max_espera
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._escribir(lote)
+
+    async def _escribir(self, lote: List[Tuple[CuentaAggregate, asyncio.Future]]) -> None:
+        """Persiste el lote y resuelve el futuro de cada llamador"""
+        try:
+            cuenta_ids = await asyncio.to_thread(
+                self.cuenta_repository.guardar_muchos, [agg for agg, _ in lote]
+            )
+        except Exception as e:
+            if len(lote) == 1:
+                _resolver(lote[0][1], error=e)
+                return
+
+            # Una cuenta inválida no debe hacer fallar al resto del lote
+            logger.warning(f"Fallo al guardar un lote de {len(lote)} cuentas, se reintenta una a una: {e}")
+            for cuenta_aggregate, futuro in lote:
+                try:
+                    cuenta_id = await asyncio.to_thread(self.cuenta_repository.guardar, cuenta_aggregate)
+                except Exception as error:
+                    _resolver(futuro, error=error)
+                else:
+                    _resolver(futuro, resultado=cuenta_id)
+            return
+
+        for (_, futuro), cuenta_id in zip(lote, cuenta_ids):
+            _resolver(futuro, resultado=cuenta_id)
+
+
+def _resolver(futuro: asyncio.Future, resultado: Optional[UUID] = None, error: Optional[Exception] = None) -> None:
+    """Resuelve el futuro salvo que el llamador ya lo haya cancelado"""
+    if futuro.done():
+        return
+    if error is not None:
+        futuro.set_exception(error)
+    else:
+        futuro.set_result(resultado)
+
+
+guardado_cuentas_por_lotes = GuardadoCuentasPorLotes(CuentaRepositoryImpl())
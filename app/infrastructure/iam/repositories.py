@@ -1,6 +1,10 @@
 import json
-from typing import Optional, List
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, List
 from uuid import UUID
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from sqlalchemy.exc import IntegrityError
@@ -11,89 +15,99 @@ from app.domain.iam.entities import (
 from app.domain.iam.repositories import CuentaRepository
 from app.infrastructure.iam.models import CuentaModel, TokenModel, HistorialAccesoModel
 from app.infrastructure.database.connection import SessionLocal
+from app.infrastructure.database.identity_map import IdentityMap
+
+
+def _a_iso(marca: float) -> str:
+    """Formatea un timestamp epoch en ISO 8601"""
+    return datetime.fromtimestamp(marca).isoformat()
+
+
+def _a_json(datos: Dict[str, Any]) -> str:
+    """
+    Serializa datos de verificación o detalles de acceso; las fechas que el
+    dominio guarda en epoch se escriben en ISO 8601, como hasta ahora
+    """
+    return json.dumps({
+        clave: _a_iso(valor) if clave.startswith("fecha") and isinstance(valor, float) else valor
+        for clave, valor in datos.items()
+    })
 
 
 class CuentaRepositoryImpl(CuentaRepository):
     """Implementación del repositorio de cuentas usando SQLAlchemy"""
     
     def __init__(self, session: Optional[Session] = None):
-        self.session = session or SessionLocal()
+        self.session = session
+    
+    @contextmanager
+    def _sesion(self) -> Iterator[Session]:
+        """
+        Usa la sesión inyectada o abre una propia por operación, igual que el
+        resto de repositorios, para que la instancia sea segura entre hilos
+        """
+        if self.session is not None:
+            yield self.session
+            return
+        
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
     
     def guardar(self, cuenta_aggregate: CuentaAggregate) -> UUID:
         """Guarda o actualiza una cuenta"""
+        with self._sesion() as session:
+            return self._guardar(session, cuenta_aggregate)
+    
+    def guardar_muchos(self, cuentas: Iterable[CuentaAggregate]) -> List[UUID]:
+        """Guarda o actualiza varias cuentas con un único commit"""
+        cuentas = list(cuentas)
+        if not cuentas:
+            return []
+        
+        with self._sesion() as session:
+            return self._guardar_lote(session, cuentas)
+    
+    def _guardar(self, session: Session, cuenta_aggregate: CuentaAggregate) -> UUID:
+        """Persiste el agregado usando la sesión indicada"""
+        return self._guardar_lote(session, [cuenta_aggregate])[0]
+    
+    def _guardar_lote(self, session: Session, cuentas: List[CuentaAggregate]) -> List[UUID]:
+        """
+        Persiste los agregados usando la sesión indicada: una consulta IN
+        para las cuentas existentes, otra para los tokens ya guardados y un
+        único commit
+        """
         try:
-            cuenta = cuenta_aggregate.cuenta
+            cuenta_ids = [agg.cuenta.cuenta_id for agg in cuentas]
+            cuentas_existentes = {
+                m.id: m
+                for m in session.query(CuentaModel).filter(CuentaModel.id.in_(cuenta_ids))
+            }
             
-            # Buscar si existe
-            cuenta_existente = self.session.query(CuentaModel).filter_by(
-                id=str(cuenta.cuenta_id)
-            ).first()
+            token_ids = [
+                token.id_token for agg in cuentas for token in agg.tokens_activos.values()
+            ]
+            tokens_existentes = {
+                token_id
+                for (token_id,) in session.query(TokenModel.id).filter(TokenModel.id.in_(token_ids))
+            } if token_ids else set()
             
-            if cuenta_existente:
-                # Actualizar
-                cuenta_existente.email = cuenta.credencial.email
-                cuenta_existente.hash_password = cuenta.credencial.hash_password
-                cuenta_existente.rol = cuenta.rol
-                cuenta_existente.estado = cuenta.estado
-                cuenta_existente.fecha_actualizacion = cuenta.fecha_actualizacion
-                cuenta_existente.fecha_primer_acceso = cuenta.fecha_primer_acceso
-                cuenta_existente.intentos_fallidos = cuenta_aggregate.intentos_fallidos
-                if cuenta.datos_verificacion:
-                    cuenta_existente.datos_verificacion = json.dumps(cuenta.datos_verificacion)
-            else:
-                # Crear nueva
-                cuenta_model = CuentaModel(
-                    id=cuenta.cuenta_id,
-                    nombre_completo=cuenta.nombre_completo,
-                    carrera=cuenta.carrera,
-                    telefono=cuenta.telefono,
-                    ciudad=cuenta.ciudad,
-                    email=cuenta.credencial.email,
-                    hash_password=cuenta.credencial.hash_password,
-                    rol=cuenta.rol,
-                    estado=cuenta.estado,
-                    datos_verificacion=json.dumps(cuenta.datos_verificacion) if cuenta.datos_verificacion else None,
-                    fecha_creacion=cuenta.fecha_creacion,
-                    fecha_actualizacion=cuenta.fecha_actualizacion,
-                    fecha_primer_acceso=cuenta.fecha_primer_acceso,
-                    intentos_fallidos=cuenta_aggregate.intentos_fallidos,
-                    activa=True
-                )
-                self.session.add(cuenta_model)
-            
-            # Guardar tokens activos
-            for tipo_token, token in cuenta_aggregate.tokens_activos.items():
-                token_existente = self.session.query(TokenModel).filter_by(
-                    id=token.id_token
-                ).first()
-                
-                if not token_existente:
-                    token_model = TokenModel(
-                        id=token.id_token,
-                        cuenta_id=cuenta.cuenta_id,
-                        token_value=token.token_value,
-                        tipo_token=token.tipo_token,
-                        fecha_creacion=token.fecha_creacion,
-                        fecha_expiracion=token.fecha_expiracion,
-                        activo=token.activo
-                    )
-                    self.session.add(token_model)
-            
-            # Guardar historial de accesos
-            for acceso in cuenta_aggregate.historial_accesos:
-                historial_model = HistorialAccesoModel(
-                    cuenta_id=cuenta.cuenta_id,
-                    tipo_acceso=acceso['tipo_acceso'],
-                    detalles=json.dumps(acceso['detalles']) if acceso.get('detalles') else None,
-                    fecha_creacion=acceso['fecha']
+            for cuenta_aggregate in cuentas:
+                self._escribir(
+                    session,
+                    cuenta_aggregate,
+                    cuentas_existentes.get(cuenta_aggregate.cuenta.cuenta_id),
+                    tokens_existentes
                 )
-                self.session.add(historial_model)
             
-            self.session.commit()
-            return cuenta.cuenta_id
+            session.commit()
+            return cuenta_ids
         
         except IntegrityError as ie:
-            self.session.rollback()
+            session.rollback()
             # Log the actual error to help debugging
             error_detail = str(ie.orig) if ie.orig else str(ie)
             if "email" in error_detail.lower() or "unique" in error_detail.lower():
@@ -101,62 +115,230 @@ class CuentaRepositoryImpl(CuentaRepository):
             else:
                 raise ValueError(f"Database integrity error: {error_detail}")
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             raise e
     
+    def incrementar_intentos_fallidos(self, cuenta_id: UUID) -> int:
+        """
+        Suma un intento fallido con UPDATE ... RETURNING, de modo que dos
+        intentos concurrentes nunca escriben el mismo total
+        """
+        with self._sesion() as session:
+            try:
+                intentos = session.execute(
+                    update(CuentaModel)
+                    .where(CuentaModel.id == cuenta_id)
+                    .values(intentos_fallidos=func.coalesce(CuentaModel.intentos_fallidos, 0) + 1)
+                    .returning(CuentaModel.intentos_fallidos)
+                ).scalar_one()
+                session.commit()
+                return intentos
+            except Exception:
+                session.rollback()
+                raise
+    
+    def guardar_intento_fallido(self, cuenta_aggregate: CuentaAggregate) -> None:
+        """
+        Persiste el historial del intento y, solo si el agregado quedó
+        suspendido, el estado; un intento que no suspende no debe pisar la
+        suspensión de otro intento concurrente
+        """
+        cuenta = cuenta_aggregate.cuenta
+        with self._sesion() as session:
+            try:
+                if cuenta.estado == EstadoCuentaEnum.SUSPENDIDA:
+                    session.execute(
+                        update(CuentaModel)
+                        .where(CuentaModel.id == cuenta.cuenta_id)
+                        .values(estado=cuenta.estado, fecha_actualizacion=cuenta.fecha_actualizacion)
+                    )
+                self._escribir_historial(session, cuenta_aggregate)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+    
+    def _escribir(
+        self,
+        session: Session,
+        cuenta_aggregate: CuentaAggregate,
+        cuenta_existente: Optional[CuentaModel],
+        tokens_existentes: set
+    ) -> None:
+        """Añade a la sesión los cambios de un agregado, sin hacer commit"""
+        cuenta = cuenta_aggregate.cuenta
+        
+        if cuenta_existente:
+            # Actualizar
+            cuenta_existente.email = cuenta.credencial.email
+            cuenta_existente.hash_password = cuenta.credencial.hash_password
+            cuenta_existente.rol = cuenta.rol
+            cuenta_existente.estado = cuenta.estado
+            cuenta_existente.fecha_actualizacion = cuenta.fecha_actualizacion
+            cuenta_existente.fecha_primer_acceso = cuenta.fecha_primer_acceso
+            cuenta_existente.intentos_fallidos = cuenta_aggregate.intentos_fallidos
+            if cuenta.datos_verificacion:
+                cuenta_existente.datos_verificacion = _a_json(cuenta.datos_verificacion)
+        else:
+            # Crear nueva
+            cuenta_model = CuentaModel(
+                id=cuenta.cuenta_id,
+                nombre_completo=cuenta.nombre_completo,
+                carrera=cuenta.carrera,
+                telefono=cuenta.telefono,
+                ciudad=cuenta.ciudad,
+                email=cuenta.credencial.email,
+                hash_password=cuenta.credencial.hash_password,
+                rol=cuenta.rol,
+                estado=cuenta.estado,
+                datos_verificacion=_a_json(cuenta.datos_verificacion) if cuenta.datos_verificacion else None,
+                fecha_creacion=cuenta.fecha_creacion,
+                fecha_actualizacion=cuenta.fecha_actualizacion,
+                fecha_primer_acceso=cuenta.fecha_primer_acceso,
+                intentos_fallidos=cuenta_aggregate.intentos_fallidos,
+                activa=True
+            )
+            session.add(cuenta_model)
+        
+        # Guardar tokens activos
+        for tipo_token, token in cuenta_aggregate.tokens_activos.items():
+            if token.id_token not in tokens_existentes:
+                token_model = TokenModel(
+                    id=token.id_token,
+                    cuenta_id=cuenta.cuenta_id,
+                    token_value=token.token_value,
+                    tipo_token=token.tipo_token,
+                    fecha_creacion=token.fecha_creacion,
+                    fecha_expiracion=token.fecha_expiracion,
+                    activo=token.activo
+                )
+                session.add(token_model)
+                tokens_existentes.add(token.id_token)
+        
+        self._escribir_historial(session, cuenta_aggregate)
+    
+    def _escribir_historial(self, session: Session, cuenta_aggregate: CuentaAggregate) -> None:
+        """Añade a la sesión los accesos registrados desde que se cargó el agregado"""
+        cuenta = cuenta_aggregate.cuenta
+        for acceso in cuenta_aggregate.historial():
+            historial_model = HistorialAccesoModel(
+                cuenta_id=cuenta.cuenta_id,
+                tipo_acceso=acceso['tipo_acceso'],
+                detalles=_a_json(acceso['detalles']) if acceso.get('detalles') else None,
+                fecha_creacion=acceso['fecha']
+            )
+            session.add(historial_model)
+    
     def obtener_por_id(self, cuenta_id: UUID) -> Optional[CuentaAggregate]:
         """Recupera una cuenta por su ID"""
-        try:
-            cuenta_model = self.session.query(CuentaModel).filter_by(
+        with self._sesion() as session:
+            cuenta_model = session.query(CuentaModel).filter_by(
                 id=cuenta_id
             ).first()
             
             if not cuenta_model:
                 return None
             
-            return self._mapear_modelo_a_aggregate(cuenta_model)
-        except Exception as e:
-            raise e
+            return self._mapear_modelo_a_aggregate(session, cuenta_model)
     
     def obtener_por_email(self, email: str) -> Optional[CuentaAggregate]:
         """Recupera una cuenta por su email"""
-        try:
-            cuenta_model = self.session.query(CuentaModel).filter_by(
+        with self._sesion() as session:
+            cuenta_model = session.query(CuentaModel).filter_by(
                 email=email
             ).first()
             
             if not cuenta_model:
                 return None
             
-            return self._mapear_modelo_a_aggregate(cuenta_model)
-        except Exception as e:
-            raise e
+            return self._mapear_modelo_a_aggregate(session, cuenta_model)
     
+    def obtener_por_ids(self, cuenta_ids: Iterable[UUID]) -> Dict[UUID, CuentaAggregate]:
+        """
+        Recupera varias cuentas con una consulta IN por tabla (cuentas y
+        tokens) en lugar de dos consultas por cuenta
+        """
+        cuenta_ids = list(set(cuenta_ids))
+        if not cuenta_ids:
+            return {}
+        
+        with self._sesion() as session:
+            cuentas_model = session.query(CuentaModel).filter(
+                CuentaModel.id.in_(cuenta_ids)
+            ).all()
+            
+            tokens_por_cuenta = defaultdict(list)
+            for token_model in session.query(TokenModel).filter(TokenModel.cuenta_id.in_(cuenta_ids)):
+                tokens_por_cuenta[token_model.cuenta_id].append(token_model)
+            
+            return {
+                m.id: self._mapear_modelo_a_aggregate(session, m, tokens_por_cuenta[m.id])
+                for m in cuentas_model
+            }
     
     def verificar_email_existe(self, email: str) -> bool:
         """Verifica si un email ya está registrado"""
-        try:
-            cuenta = self.session.query(CuentaModel).filter_by(
+        with self._sesion() as session:
+            cuenta = session.query(CuentaModel).filter_by(
                 email=email
             ).first()
             return cuenta is not None
-        except Exception as e:
-            raise e
     
-    def listar_todas(self) -> List[CuentaAggregate]:
-        """Lista todas las cuentas"""
-        try:
-            cuentas_model = self.session.query(CuentaModel).all()
-            return [self._mapear_modelo_a_aggregate(m) for m in cuentas_model]
-        except Exception as e:
-            raise e
+    def listar_todas(self, limit: int = 100, offset: int = 0) -> List[CuentaAggregate]:
+        """Lista una página de cuentas, ordenadas por ID para que la paginación sea estable"""
+        with self._sesion() as session:
+            cuentas_model = session.query(CuentaModel).order_by(
+                CuentaModel.id
+            ).offset(offset).limit(limit).all()
+            return [self._mapear_modelo_a_aggregate(session, m) for m in cuentas_model]
     
-    def _mapear_modelo_a_aggregate(self, cuenta_model: CuentaModel) -> CuentaAggregate:
-        """Mapea un modelo de base de datos a un agregado"""
+    def listar_proyeccion_cuentas(self) -> List[Dict[str, Any]]:
+        """Lista las cuentas en una sola consulta, solo con las columnas de lectura"""
+        with self._sesion() as session:
+            filas = session.query(
+                CuentaModel.id,
+                CuentaModel.nombre_completo,
+                CuentaModel.carrera,
+                CuentaModel.telefono,
+                CuentaModel.ciudad,
+                CuentaModel.email,
+                CuentaModel.rol,
+                CuentaModel.estado,
+                CuentaModel.fecha_creacion
+            ).all()
+            
+            return [
+                {
+                    'cuenta_id': str(fila.id),
+                    'nombre_completo': fila.nombre_completo,
+                    'carrera': fila.carrera,
+                    'telefono': fila.telefono,
+                    'ciudad': fila.ciudad,
+                    "email": fila.email,
+                    "rol": fila.rol.value,
+                    "estado": fila.estado.value,
+                    "fecha_creacion": fila.fecha_creacion
+                }
+                for fila in filas
+            ]
+    
+    def _mapear_modelo_a_aggregate(
+        self,
+        session: Session,
+        cuenta_model: CuentaModel,
+        tokens_model: Optional[List[TokenModel]] = None
+    ) -> CuentaAggregate:
+        """
+        Mapea un modelo de base de datos a un agregado. Los tokens se
+        consultan aquí salvo que ya vengan precargados; el historial de
+        accesos no se carga, el agregado solo acumula los accesos nuevos
+        que se insertarán al guardarlo
+        """
         # Recuperar tokens asociados
-        tokens_model = self.session.query(TokenModel).filter_by(
-            cuenta_id=cuenta_model.id
-        ).all()
+        if tokens_model is None:
+            tokens_model = session.query(TokenModel).filter_by(
+                cuenta_id=cuenta_model.id
+            ).all()
         
         tokens_dict = {}
         for token_model in tokens_model:
@@ -171,19 +353,6 @@ class CuentaRepositoryImpl(CuentaRepository):
                 )
                 tokens_dict[token_model.tipo_token] = token
         
-        # Recuperar historial de accesos
-        historial_model = self.session.query(HistorialAccesoModel).filter_by(
-            cuenta_id=cuenta_model.id
-        ).all()
-        
-        historial = []
-        for h in historial_model:
-            historial.append({
-                'tipo_acceso': h.tipo_acceso,
-                'fecha': h.fecha_creacion.isoformat(),
-                'detalles': json.loads(h.detalles) if h.detalles else {}
-            })
-        
         # Crear credencial
         credencial = Credencial(
             id_credencial=cuenta_model.id,
@@ -221,8 +390,96 @@ class CuentaRepositoryImpl(CuentaRepository):
         aggregate = CuentaAggregate(
             cuenta=cuenta,
             tokens_activos=tokens_dict,
-            historial_accesos=historial,
             intentos_fallidos=cuenta_model.intentos_fallidos
         )
         
         return aggregate
+
+
+class CuentaRepositoryConIdentityMap(CuentaRepository):
+    """
+    Decorador del repositorio de cuentas que reutiliza los agregados ya
+    cargados en la misma petición a través de un IdentityMap
+    """
+    
+    def __init__(self, inner: CuentaRepository, identity_map: IdentityMap):
+        self._inner = inner
+        self._identity_map = identity_map
+    
+    def _registrar(self, cuenta_aggregate: CuentaAggregate) -> None:
+        cuenta = cuenta_aggregate.cuenta
+        self._identity_map.registrar(CuentaAggregate, cuenta.cuenta_id, cuenta_aggregate)
+        self._identity_map.registrar(CuentaAggregate, ("email", cuenta.credencial.email), cuenta_aggregate)
+    
+    def guardar(self, cuenta_aggregate: CuentaAggregate) -> UUID:
+        """Guarda la cuenta y la deja registrada para lecturas posteriores"""
+        cuenta_id = self._inner.guardar(cuenta_aggregate)
+        self._registrar(cuenta_aggregate)
+        return cuenta_id
+    
+    def guardar_muchos(self, cuentas: Iterable[CuentaAggregate]) -> List[UUID]:
+        """Guarda las cuentas en lote y las deja registradas para lecturas posteriores"""
+        cuentas = list(cuentas)
+        cuenta_ids = self._inner.guardar_muchos(cuentas)
+        for cuenta_aggregate in cuentas:
+            self._registrar(cuenta_aggregate)
+        return cuenta_ids
+    
+    def incrementar_intentos_fallidos(self, cuenta_id: UUID) -> int:
+        """Suma un intento fallido en la base de datos"""
+        return self._inner.incrementar_intentos_fallidos(cuenta_id)
+    
+    def guardar_intento_fallido(self, cuenta_aggregate: CuentaAggregate) -> None:
+        """Persiste el intento fallido y deja la cuenta registrada para lecturas posteriores"""
+        self._inner.guardar_intento_fallido(cuenta_aggregate)
+        self._registrar(cuenta_aggregate)
+    
+    def obtener_por_id(self, cuenta_id: UUID) -> Optional[CuentaAggregate]:
+        """Recupera una cuenta por su ID, consultando primero el identity map"""
+        cuenta_aggregate = self._identity_map.obtener(CuentaAggregate, cuenta_id)
+        if cuenta_aggregate is None:
+            cuenta_aggregate = self._inner.obtener_por_id(cuenta_id)
+            if cuenta_aggregate is not None:
+                self._registrar(cuenta_aggregate)
+        return cuenta_aggregate
+    
+    def obtener_por_email(self, email: str) -> Optional[CuentaAggregate]:
+        """Recupera una cuenta por su email, consultando primero el identity map"""
+        cuenta_aggregate = self._identity_map.obtener(CuentaAggregate, ("email", email))
+        if cuenta_aggregate is None:
+            cuenta_aggregate = self._inner.obtener_por_email(email)
+            if cuenta_aggregate is not None:
+                self._registrar(cuenta_aggregate)
+        return cuenta_aggregate
+    
+    def obtener_por_ids(self, cuenta_ids: Iterable[UUID]) -> Dict[UUID, CuentaAggregate]:
+        """Recupera varias cuentas; solo consulta las que no están en el identity map"""
+        encontradas: Dict[UUID, CuentaAggregate] = {}
+        pendientes = []
+        for cuenta_id in set(cuenta_ids):
+            cuenta_aggregate = self._identity_map.obtener(CuentaAggregate, cuenta_id)
+            if cuenta_aggregate is None:
+                pendientes.append(cuenta_id)
+            else:
+                encontradas[cuenta_id] = cuenta_aggregate
+        
+        if pendientes:
+            for cuenta_id, cuenta_aggregate in self._inner.obtener_por_ids(pendientes).items():
+                self._registrar(cuenta_aggregate)
+                encontradas[cuenta_id] = cuenta_aggregate
+        
+        return encontradas
+    
+    def verificar_email_existe(self, email: str) -> bool:
+        """Verifica si un email ya está registrado"""
+        if self._identity_map.obtener(CuentaAggregate, ("email", email)) is not None:
+            return True
+        return self._inner.verificar_email_existe(email)
+    
+    def listar_todas(self, limit: int = 100, offset: int = 0) -> List[CuentaAggregate]:
+        """Lista una página de cuentas"""
+        return self._inner.listar_todas(limit, offset)
+    
+    def listar_proyeccion_cuentas(self) -> List[Dict[str, Any]]:
+        """Lista los datos planos de todas las cuentas"""
+        return self._inner.listar_proyeccion_cuentas()
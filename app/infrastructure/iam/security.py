@@ -1,10 +1,36 @@
+import asyncio
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from uuid import UUID
-from jose import jwt, JWTError
-import bcrypt
 
 from app.config import settings
+from app.infrastructure.cache.memoria import CacheTTL
+
+# jose (con cryptography) y bcrypt se importan al primer uso para no
+# cargarlos en cada arranque en frío cuando la petición no los necesita
+
+
+# Pool dedicado al hashing: bcrypt libera el GIL, así que los hashes
+# corren en paralelo sin bloquear el event loop
+hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="hash")
+
+# Longitud mínima y carácter especial de una contraseña fuerte, compilados una
+# sola vez. Mayúsculas, minúsculas y números se comprueban con str.isupper,
+# str.islower y str.isdigit para aceptar cualquier letra o dígito Unicode
+CARACTERES_ESPECIALES = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+_PASSWORD_FUERTE_RE = re.compile(
+    r"(?=.*[" + re.escape(CARACTERES_ESPECIALES) + r"])"
+    r".{8,}",
+    re.DOTALL
+)
+
+# Tokens ya verificados: token -> (expira_en, payload). TTL corto para acotar exposición
+_TOKEN_CACHE_TTL = 30
+_token_cache = CacheTTL(maxsize=4096, ttl=_TOKEN_CACHE_TTL)
 
 
 class TokenManager:
@@ -16,6 +42,8 @@ class TokenManager:
         expires_delta: Optional[timedelta] = None
     ) -> str:
         """Crea un token de acceso"""
+        from jose import jwt
+        
         to_encode = data.copy()
         
         if expires_delta:
@@ -41,6 +69,8 @@ class TokenManager:
         expires_delta: Optional[timedelta] = None
     ) -> str:
         """Crea un token de refresco"""
+        from jose import jwt
+        
         to_encode = data.copy()
         
         if expires_delta:
@@ -61,13 +91,23 @@ class TokenManager:
     
     @staticmethod
     def verificar_token(token: str) -> Optional[Dict[str, Any]]:
-        """Verifica y decodifica un token"""
+        """Verifica y decodifica un token (con cache de lectura por token)"""
+        ahora = time.time()
+        cacheado = _token_cache.obtener(token)
+        if cacheado is not None and cacheado[0] > ahora:
+            return cacheado[1]
+        
+        from jose import jwt, JWTError
+        
         try:
             payload = jwt.decode(
                 token,
                 settings.SECRET_KEY,
                 algorithms=[settings.ALGORITHM]
             )
+            # No mantener el token en cache más allá de su propia expiración
+            expira_en = min(ahora + _TOKEN_CACHE_TTL, payload.get("exp", ahora))
+            _token_cache.guardar(token, (expira_en, payload))
             return payload
         except JWTError:
             return None
@@ -77,6 +117,8 @@ class TokenManager:
     @staticmethod
     def crear_token_verificacion_email(email: str) -> str:
         """Crea un token temporal para verificación de email"""
+        from jose import jwt
+        
         data = {
             "email": email,
             "tipo": "email_verification"
@@ -101,6 +143,8 @@ class PasswordManager:
     @staticmethod
     def hashear_password(password: str) -> str:
         """Genera el hash de una contraseña usando bcrypt"""
+        import bcrypt
+        
         # Ensure password is a string
         if not isinstance(password, str):
             password = str(password)
@@ -114,8 +158,8 @@ class PasswordManager:
         if len(password_bytes) > 72:
             password_bytes = password_bytes[:72]
         
-        # Hash using bcrypt with rounds=12
-        salt = bcrypt.gensalt(rounds=12)
+        # Hash using bcrypt with the configured work factor
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hash_password = bcrypt.hashpw(password_bytes, salt)
         
         # Return as string
@@ -124,6 +168,8 @@ class PasswordManager:
     @staticmethod
     def verificar_password(password: str, hash_password: str) -> bool:
         """Verifica una contraseña contra su hash"""
+        import bcrypt
+        
         if not isinstance(password, str):
             password = str(password)
         
@@ -143,28 +189,30 @@ class PasswordManager:
         # Verify
         return bcrypt.checkpw(password_bytes, hash_bytes)
     
+    @staticmethod
+    async def hashear_password_async(password: str) -> str:
+        """Genera el hash en el pool de hashing sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_pool, PasswordManager.hashear_password, password)
+    
+    @staticmethod
+    async def verificar_password_async(password: str, hash_password: str) -> bool:
+        """Verifica una contraseña en el pool de hashing sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            hash_pool, PasswordManager.verificar_password, password, hash_password
+        )
+    
     @staticmethod
     def es_password_fuerte(password: str) -> bool:
-        """Verifica si una contraseña cumple requisitos mínimos de seguridad"""
-        # Mínimo 8 caracteres
-        if len(password) < 8:
-            return False
-        
-        # Al menos una mayúscula
-        if not any(c.isupper() for c in password):
-            return False
-        
-        # Al menos una minúscula
-        if not any(c.islower() for c in password):
-            return False
-        
-        # Al menos un número
-        if not any(c.isdigit() for c in password):
-            return False
-        
-        # Al menos un carácter especial
-        caracteres_especiales = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-        if not any(c in caracteres_especiales for c in password):
-            return False
-        
-        return True
+        """
+        Verifica si una contraseña cumple requisitos mínimos de seguridad:
+        al menos 8 caracteres, una mayúscula, una minúscula, un número y un
+        carácter especial
+        """
+        return (
+            _PASSWORD_FUERTE_RE.fullmatch(password) is not None
+            and any(c.isupper() for c in password)
+            and any(c.islower() for c in password)
+            and any(c.isdigit() for c in password)
+        )
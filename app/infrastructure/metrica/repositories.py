@@ -1,5 +1,6 @@
-from typing import Optional, List, Dict, Any
-from uuid import UUID
+from collections import defaultdict
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy import func, case, and_
 
@@ -8,9 +9,19 @@ from app.domain.metrica.entities import (
 )
 from app.domain.metrica.repositories import MetricaRepository
 from app.infrastructure.database.connection import SessionLocal
+from app.domain.postulacion.entities import EstadoPostulacionEnum
 from app.infrastructure.postulacion.models import PostulacionModel
 
 
+# Reglas de logros: (nombre, umbral, contador de obtener_metricas_completas)
+_REGLAS_LOGROS = (
+    ("Postulante Activo", 10, "postulaciones"),
+    ("Entrevistado Frecuente", 5, "entrevistas"),
+    ("Primera Oferta", 1, "exitos"),
+    ("Candidato Destacado", 3, "exitos"),
+)
+
+
 class MetricaRepositoryImpl(MetricaRepository):
     """
     Implementación del repositorio de métricas con SQLAlchemy
@@ -24,116 +35,148 @@ class MetricaRepositoryImpl(MetricaRepository):
         # No necesitamos inicializar ningún modelo ya que calculamos en tiempo real
         pass
     
+    def obtener_metricas_completas(self, postulante_id: UUID) -> Dict[str, Any]:
+        """
+        Calcula todos los contadores de un postulante con una sola consulta
+        agrupada por estado en lugar de un conteo por cada estado
+        """
+        db = SessionLocal()
+        try:
+            filas = db.query(
+                PostulacionModel.estado, func.count(PostulacionModel.id)
+            ).filter(
+                PostulacionModel.cuenta_id == str(postulante_id)
+            ).group_by(PostulacionModel.estado).all()
+        finally:
+            db.close()
+        
+        return self._metricas_desde_conteos({estado: total for estado, total in filas})
+    
+    def _metricas_desde_conteos(self, conteos: Dict[Any, int]) -> Dict[str, Any]:
+        """Contadores de métricas a partir del número de postulaciones por estado"""
+        total_postulaciones = sum(conteos.values())
+        total_entrevistas = conteos.get(EstadoPostulacionEnum.ENTREVISTA, 0)
+        total_exitos = conteos.get(EstadoPostulacionEnum.OFERTA, 0)
+        total_rechazos = (
+            conteos.get(EstadoPostulacionEnum.RECHAZADO, 0) + conteos.get(EstadoPostulacionEnum.RECHAZO, 0)
+        )
+        
+        # Calcular tasa de éxito (ofertas sobre total de postulaciones)
+        tasa_exito = (total_exitos / total_postulaciones) * 100 if total_postulaciones > 0 else 0.0
+        
+        return {
+            "postulaciones": total_postulaciones,
+            "entrevistas": total_entrevistas,
+            "exitos": total_exitos,
+            "ofertas": total_exitos,
+            "rechazos": total_rechazos,
+            "tasa_exito": tasa_exito
+        }
+    
+    def tiene_postulaciones(self, postulante_id: UUID) -> bool:
+        """Comprueba con una consulta EXISTS si el postulante tiene alguna postulación"""
+        db = SessionLocal()
+        try:
+            return db.query(
+                db.query(PostulacionModel.id).filter(
+                    PostulacionModel.cuenta_id == str(postulante_id)
+                ).exists()
+            ).scalar()
+        finally:
+            db.close()
+    
     def obtener_por_postulante(self, postulante_id: UUID) -> Optional[MetricaAggregate]:
         """Calcula las métricas de un postulante en tiempo real basado en sus postulaciones"""
+        return self.construir_agregado(postulante_id, self.obtener_metricas_completas(postulante_id))
+    
+    def obtener_por_ids(self, postulante_ids: Iterable[UUID]) -> Dict[UUID, MetricaAggregate]:
+        """
+        Calcula las métricas de varios postulantes con una sola consulta
+        agrupada por (postulante, estado)
+        """
+        postulante_ids = set(postulante_ids)
+        if not postulante_ids:
+            return {}
+        
         db = SessionLocal()
         try:
-            # Contar el total de postulaciones
-            total_postulaciones = db.query(func.count(PostulacionModel.id)).filter(
-                PostulacionModel.cuenta_id == str(postulante_id)
-            ).scalar() or 0
-            
-            # No hay postulaciones, retornar métricas en ceros
-            if total_postulaciones == 0:
-                return MetricaAggregate(
-                    metrica_registro=MetricaRegistro(
-                        cuenta_id=postulante_id,
-                        total_postulaciones=0,
-                        total_entrevistas=0,
-                        total_exitos=0,
-                        total_rechazos=0,
-                        tasa_exito=0.0
-                    ),
-                    lista_logros=[]
-                )
-            
-            # Contar entrevistas
-            total_entrevistas = db.query(func.count(PostulacionModel.id)).filter(
-                PostulacionModel.cuenta_id == str(postulante_id),
-                PostulacionModel.estado == "entrevista"
-            ).scalar() or 0
-            
-            # Contar ofertas (éxitos)
-            total_exitos = db.query(func.count(PostulacionModel.id)).filter(
-                PostulacionModel.cuenta_id == str(postulante_id),
-                PostulacionModel.estado == "oferta"
-            ).scalar() or 0
-            
-            # Contar rechazos
-            total_rechazos = db.query(func.count(PostulacionModel.id)).filter(
-                PostulacionModel.cuenta_id == str(postulante_id),
-                PostulacionModel.estado.in_(["rechazado", "rechazo"])
-            ).scalar() or 0
-            
-            # Calcular tasa de éxito (ofertas sobre total de postulaciones)
-            tasa_exito = (total_exitos / total_postulaciones) * 100 if total_postulaciones > 0 else 0.0
-            
-            # Crear métricas
-            metrica_registro = MetricaRegistro(
-                cuenta_id=postulante_id,
-                total_postulaciones=total_postulaciones,
-                total_entrevistas=total_entrevistas,
-                total_exitos=total_exitos,
-                total_rechazos=total_rechazos,
-                tasa_exito=tasa_exito
-            )
-            
-            # Determinar logros basados en métricas
-            lista_logros = self._calcular_logros(
-                postulante_id, 
-                total_postulaciones, 
-                total_entrevistas, 
-                total_exitos,
-                total_rechazos
-            )
-            
-            return MetricaAggregate(
-                metrica_registro=metrica_registro,
-                lista_logros=lista_logros
-            )
-            
+            filas = db.query(
+                PostulacionModel.cuenta_id, PostulacionModel.estado, func.count(PostulacionModel.id)
+            ).filter(
+                PostulacionModel.cuenta_id.in_([str(postulante_id) for postulante_id in postulante_ids])
+            ).group_by(PostulacionModel.cuenta_id, PostulacionModel.estado).all()
         finally:
             db.close()
+        
+        conteos_por_postulante: Dict[str, Dict[Any, int]] = defaultdict(dict)
+        for cuenta_id, estado, total in filas:
+            conteos_por_postulante[cuenta_id][estado] = total
+        
+        return {
+            postulante_id: self.construir_agregado(
+                postulante_id, self._metricas_desde_conteos(conteos_por_postulante.get(str(postulante_id), {}))
+            )
+            for postulante_id in postulante_ids
+        }
     
-    def _calcular_logros(self, 
-                         postulante_id: UUID, 
-                         total_postulaciones: int, 
-                         total_entrevistas: int,
-                         total_exitos: int,
-                         total_rechazos: int) -> List[Logro]:
+    def construir_agregado(self, postulante_id: UUID, metricas: Dict[str, Any]) -> MetricaAggregate:
+        """
+        Construye el agregado de métricas a partir de contadores ya calculados,
+        sin consultar la base de datos; la tasa de éxito se deriva de ellos
+        """
+        total_postulaciones = metricas["postulaciones"]
+        
+        # Crear métricas
+        metrica_registro = MetricaRegistro(
+            cuenta_id=postulante_id,
+            total_postulaciones=total_postulaciones,
+            total_entrevistas=metricas["entrevistas"],
+            total_exitos=metricas["exitos"],
+            total_rechazos=metricas["rechazos"]
+        )
+        
+        # No hay postulaciones, retornar métricas en ceros y sin logros
+        if total_postulaciones == 0:
+            return MetricaAggregate(metrica_registro=metrica_registro, lista_logros=[])
+        
+        # Determinar logros basados en métricas
+        lista_logros = self._calcular_logros(metricas)
+        
+        return MetricaAggregate(
+            metrica_registro=metrica_registro,
+            lista_logros=lista_logros
+        )
+    
+    def _logros_alcanzados(self, metricas: Dict[str, Any]) -> Iterator[Tuple[str, int]]:
+        """Nombre y umbral de cada logro cuyas métricas superan el umbral"""
+        for nombre, umbral, contador in _REGLAS_LOGROS:
+            if metricas[contador] >= umbral:
+                yield nombre, umbral
+    
+    def _calcular_logros(self, metricas: Dict[str, Any]) -> List[Logro]:
         """Calcula los logros basados en las métricas"""
-        logros = []
+        return [
+            Logro(nombre_logro=nombre, umbral=umbral, fecha_obtencion=datetime.now())
+            for nombre, umbral in self._logros_alcanzados(metricas)
+        ]
+    
+    def listar_logros_serializados(self, postulante_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Devuelve los logros del postulante ya en forma de respuesta, a partir
+        de la consulta agrupada de contadores y sin construir el agregado
+        """
+        metricas = self.obtener_metricas_completas(postulante_id)
+        fecha_obtencion = datetime.now()
         
-        # Ejemplos de logros según hitos alcanzados
-        if total_postulaciones >= 10:
-            logros.append(Logro(
-                nombre_logro="Postulante Activo",
-                umbral=10,
-                fecha_obtencion=datetime.now()
-            ))
-            
-        if total_entrevistas >= 5:
-            logros.append(Logro(
-                nombre_logro="Entrevistado Frecuente",
-                umbral=5,
-                fecha_obtencion=datetime.now()
-            ))
-            
-        if total_exitos >= 1:
-            logros.append(Logro(
-                nombre_logro="Primera Oferta",
-                umbral=1,
-                fecha_obtencion=datetime.now()
-            ))
-            
-        if total_exitos >= 3:
-            logros.append(Logro(
-                nombre_logro="Candidato Destacado",
-                umbral=3,
-                fecha_obtencion=datetime.now()
-            ))
-            
-        return logros
+        return [
+            {
+                "id_logro": str(uuid4()),
+                "nombre_logro": nombre,
+                "umbral": umbral,
+                "fecha_obtencion": fecha_obtencion
+            }
+            for nombre, umbral in self._logros_alcanzados(metricas)
+        ]
     
     def obtener_contador_ofertas(self, postulante_id: UUID) -> int:
         """
@@ -188,4 +231,8 @@ class MetricaRepositoryImpl(MetricaRepository):
         Al ser un bounded context de solo lectura, no hay necesidad de persistir el estado
         ya que se deriva completamente de otros bounded contexts (postulación).
         """
-        return metrica_aggregate.metrica_registro.cuenta_id
\ No newline at end of file
+        return metrica_aggregate.metrica_registro.cuenta_id
+    
+    def guardar_muchos(self, metricas: Iterable[MetricaAggregate]) -> List[UUID]:
+        """Igual que guardar: las métricas no se almacenan, solo se devuelven los IDs"""
+        return [metrica_aggregate.metrica_registro.cuenta_id for metrica_aggregate in metricas]
\ No newline at end of file
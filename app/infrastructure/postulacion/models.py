@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Enum as SQLAEnum, JSON
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Enum as SQLAEnum, JSON, Index
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
@@ -20,6 +20,12 @@ class PostulacionModel(Base):
     
     # Relaciones
     hitos = relationship("HitoModel", back_populates="postulacion", cascade="all, delete-orphan")
+    
+    # Listados por candidato: orden por fecha y filtro por estado
+    __table_args__ = (
+        Index("ix_postulaciones_cuenta_fecha", "cuenta_id", "fecha_postulacion"),
+        Index("ix_postulaciones_cuenta_estado", "cuenta_id", "estado"),
+    )
 
 
 class HitoModel(Base):
@@ -1,14 +1,28 @@
-from typing import List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 from datetime import datetime
+from sqlalchemy import String, cast, func, or_
+from sqlalchemy.orm import selectinload
 
 from app.domain.postulacion.entities import (
     Postulacion, PostulacionAggregate,
-    EstadoPostulacion, LineaDeTiempo, Hito
+    EstadoPostulacion, EstadoPostulacionEnum, LineaDeTiempo, Hito,
+    EstadoPostulacionActualizado
 )
 from app.domain.postulacion.repositories import PostulacionRepository
 from app.infrastructure.database.connection import SessionLocal
 from app.infrastructure.postulacion.models import PostulacionModel, HitoModel
+from app.infrastructure.puesto.models import PuestoModel, PuestoMapeo
+from app.infrastructure.iam.models import CuentaModel
+from app.domain.puesto.entities import EstadoPuestoEnum
+
+
+# Columnas por las que se puede ordenar el listado de un candidato
+_COLUMNAS_ORDEN = {
+    "fecha": PostulacionModel.fecha_postulacion,
+    "estado": PostulacionModel.estado
+}
 
 
 class PostulacionRepositoryImpl(PostulacionRepository):
@@ -18,46 +32,36 @@ class PostulacionRepositoryImpl(PostulacionRepository):
         """Guarda o actualiza una postulación y devuelve su ID"""
         db = SessionLocal()
         try:
-            post = postulacion_aggregate.postulacion
-            post_id = post.postulacion_id
+            post_id = self._escribir(db, postulacion_aggregate)
+            db.commit()
+            return post_id
             
-            # Verificar si ya existe
-            post_db = db.query(PostulacionModel).filter(
-                PostulacionModel.postulacion_id == str(post.postulacion_id)
-            ).first()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
+    def crear_si_puesto_abierto(self, puesto_id: UUID, postulacion_aggregate: PostulacionAggregate) -> Optional[UUID]:
+        """
+        Valida que el puesto esté abierto y guarda la postulación en la misma
+        transacción. La fila del puesto queda bloqueada en modo compartido
+        hasta el commit, así que no puede cerrarse entre la validación y la
+        inserción. Devuelve None si el puesto no existe o no está abierto.
+        """
+        db = SessionLocal()
+        try:
+            puesto_abierto = db.query(PuestoModel.id).join(
+                PuestoMapeo, PuestoMapeo.bd_id == PuestoModel.id
+            ).filter(
+                PuestoMapeo.uuid_id == str(puesto_id),
+                PuestoModel.estado == EstadoPuestoEnum.ABIERTO.value
+            ).with_for_update(read=True).first()
             
-            if post_db:
-                # Actualizar existente
-                post_db.estado = post.estado.valor.value
-                post_db.cuenta_id = str(post.candidato_id)
-                post_db.puesto_id = str(post.puesto_id)
-                post_db.fecha_postulacion = post.fecha_postulacion
-                
-                # Eliminar hitos existentes y agregar los nuevos
-                db.query(HitoModel).filter(HitoModel.postulacion_id == post_db.id).delete()
-                db.flush()
-            else:
-                # Crear nueva postulación
-                post_db = PostulacionModel(
-                    postulacion_id=str(post.postulacion_id),
-                    cuenta_id=str(post.candidato_id),
-                    puesto_id=str(post.puesto_id),
-                    fecha_postulacion=post.fecha_postulacion,
-                    estado=post.estado.valor.value,
-                    resultado=None
-                )
-                db.add(post_db)
-                db.flush()
-            
-            # Guardar todos los hitos
-            for hito in postulacion_aggregate.linea_de_tiempo.lista_hitos:
-                hito_db = HitoModel(
-                    postulacion_id=post_db.id,
-                    fecha=hito.fecha,
-                    descripcion=hito.descripcion
-                )
-                db.add(hito_db)
+            if puesto_abierto is None:
+                return None
             
+            post_id = self._escribir(db, postulacion_aggregate)
             db.commit()
             return post_id
             
@@ -67,77 +71,272 @@ class PostulacionRepositoryImpl(PostulacionRepository):
         finally:
             db.close()
     
+    def _escribir(self, db, postulacion_aggregate: PostulacionAggregate) -> UUID:
+        """Inserta o actualiza la postulación y sus hitos en la sesión, sin confirmar"""
+        post = postulacion_aggregate.postulacion
+        post_id = post.postulacion_id
+        
+        # Verificar si ya existe
+        post_db = db.query(PostulacionModel).filter(
+            PostulacionModel.postulacion_id == str(post.postulacion_id)
+        ).first()
+        
+        if post_db:
+            # Actualizar existente
+            post_db.estado = post.estado.valor.value
+            post_db.cuenta_id = str(post.candidato_id)
+            post_db.puesto_id = str(post.puesto_id)
+            post_db.fecha_postulacion = post.fecha_postulacion
+            
+            # Eliminar hitos existentes y agregar los nuevos
+            db.query(HitoModel).filter(HitoModel.postulacion_id == post_db.id).delete()
+            db.flush()
+        else:
+            # Crear nueva postulación
+            post_db = PostulacionModel(
+                postulacion_id=str(post.postulacion_id),
+                cuenta_id=str(post.candidato_id),
+                puesto_id=str(post.puesto_id),
+                fecha_postulacion=post.fecha_postulacion,
+                estado=post.estado.valor.value,
+                resultado=None
+            )
+            db.add(post_db)
+            db.flush()
+        
+        # Guardar todos los hitos
+        for hito in postulacion_aggregate.linea_de_tiempo.lista_hitos:
+            hito_db = HitoModel(
+                postulacion_id=post_db.id,
+                fecha=hito.fecha,
+                descripcion=hito.descripcion
+            )
+            db.add(hito_db)
+        
+        return post_id
+    
     def obtener_por_id(self, postulacion_id: UUID) -> Optional[PostulacionAggregate]:
         """Obtiene una postulación por ID"""
         db = SessionLocal()
         try:
-            # Buscar por postulacion_id (UUID)
-            post_db = db.query(PostulacionModel).filter(
+            # Buscar por postulacion_id (UUID) cargando los hitos en la misma operación
+            post_db = db.query(PostulacionModel).options(
+                selectinload(PostulacionModel.hitos)
+            ).filter(
                 PostulacionModel.postulacion_id == str(postulacion_id)
             ).first()
             
             if not post_db:
                 return None
             
-            post = Postulacion(
-                postulacion_id=UUID(post_db.postulacion_id) if post_db.postulacion_id else postulacion_id,
-                candidato_id=UUID(post_db.cuenta_id),
-                puesto_id=UUID(post_db.puesto_id) if post_db.puesto_id else UUID('00000000-0000-0000-0000-000000000001'),
-                fecha_postulacion=post_db.fecha_postulacion,
-                estado=EstadoPostulacion(post_db.estado),
-                documentos_adjuntos=[]
-            )
+            return self._mapear_modelo_a_aggregate(post_db)
+        finally:
+            db.close()
+    
+    def obtener_por_id_sin_hitos(self, postulacion_id: UUID) -> Optional[Tuple[PostulacionAggregate, int]]:
+        """
+        Obtiene la cabecera de una postulación sin consultar sus hitos;
+        el número de hitos se calcula con una subconsulta en la misma sentencia
+        """
+        db = SessionLocal()
+        try:
+            total_hitos = db.query(func.count(HitoModel.id)).filter(
+                HitoModel.postulacion_id == PostulacionModel.id
+            ).correlate(PostulacionModel).scalar_subquery()
             
-            linea_tiempo = LineaDeTiempo()
-            for hito_db in post_db.hitos:
-                hito = Hito(
-                    hito_id=UUID(f'00000000-0000-0000-0000-{hito_db.id:012d}'),
-                    fecha=hito_db.fecha,
-                    descripcion=hito_db.descripcion
-                )
-                linea_tiempo.lista_hitos.append(hito)
+            fila = db.query(PostulacionModel, total_hitos).filter(
+                PostulacionModel.postulacion_id == str(postulacion_id)
+            ).first()
             
-            return PostulacionAggregate(
-                postulacion=post,
-                estado=post.estado,
-                linea_de_tiempo=linea_tiempo
-            )
+            if not fila:
+                return None
+            
+            post_db, numero_hitos = fila
+            return self._mapear_modelo_a_aggregate(post_db, con_hitos=False), numero_hitos
+        finally:
+            db.close()
+    
+    def listar_hitos(self, postulacion_id: UUID, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Consulta de columnas de una página de hitos de la postulación"""
+        db = SessionLocal()
+        try:
+            hitos = db.query(
+                HitoModel.id, HitoModel.fecha, HitoModel.descripcion
+            ).join(
+                PostulacionModel, HitoModel.postulacion_id == PostulacionModel.id
+            ).filter(
+                PostulacionModel.postulacion_id == str(postulacion_id)
+            ).order_by(HitoModel.id).offset(offset).limit(limit)
+            
+            return [
+                {
+                    # Mismo ID derivado que usa el mapeo a agregado
+                    "hito_id": f"00000000-0000-0000-0000-{hito.id:012d}",
+                    "fecha": hito.fecha,
+                    "descripcion": hito.descripcion
+                }
+                for hito in hitos
+            ]
         finally:
             db.close()
     
     def obtener_por_candidato(self, candidato_id: UUID) -> List[PostulacionAggregate]:
         """Obtiene todas las postulaciones de un candidato"""
+        return self._listar(PostulacionModel.cuenta_id == str(candidato_id))
+    
+    def listar_proyeccion_por_candidato(self, candidato_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Lista las postulaciones de un candidato ya en su forma de lectura,
+        con dos consultas de columnas (postulaciones e hitos) y sin
+        reconstruir agregados
+        """
+        return self._proyectar_por_candidato(candidato_id)
+    
+    def obtener_historial_proyectado(
+        self, candidato_id: UUID, limit: int, offset: int, incluir_hitos: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Página del historial del candidato ordenada por fecha de postulación
+        descendente; los hitos solo se consultan si se piden
+        """
+        return self._proyectar_por_candidato(candidato_id, limit, offset, incluir_hitos)
+    
+    def buscar_por_empresa_o_puesto(self, candidato_id: UUID, termino_busqueda: str) -> List[Dict[str, Any]]:
+        """
+        Postulaciones del candidato cuyo puesto contiene el término en el
+        título o en el nombre de la empresa (sin distinguir mayúsculas)
+        """
+        termino = termino_busqueda.strip().lower()
+        if not termino:
+            return self._listar_resumen(candidato_id)
+        
+        return self._listar_resumen(
+            candidato_id,
+            or_(
+                func.lower(PuestoModel.titulo).contains(termino, autoescape=True),
+                func.lower(CuentaModel.nombre_completo).contains(termino, autoescape=True)
+            ),
+            con_puesto=True
+        )
+    
+    def filtrar_por_estado(self, candidato_id: UUID, estado: str) -> List[Dict[str, Any]]:
+        """Postulaciones del candidato en un estado, filtradas en la consulta"""
+        return self._listar_resumen(candidato_id, PostulacionModel.estado == EstadoPostulacionEnum(estado))
+    
+    def ordenar_postulaciones(self, candidato_id: UUID, criterio: str, descendente: bool = False) -> List[Dict[str, Any]]:
+        """Postulaciones del candidato ordenadas por la base de datos según el criterio"""
+        columna = _COLUMNAS_ORDEN.get(criterio)
+        if columna is None:
+            raise ValueError(f"Criterio de ordenación no válido: {criterio}")
+        
+        orden = columna.desc() if descendente else columna.asc()
+        return self._listar_resumen(candidato_id, orden=(orden, PostulacionModel.id))
+    
+    def _listar_resumen(
+        self,
+        candidato_id: UUID,
+        *filtros,
+        orden: Optional[tuple] = None,
+        con_puesto: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Resumen (ID, puesto, fecha y estado) de las postulaciones del candidato
+        con filtros y orden resueltos en SQL; con_puesto agrega los joins al
+        puesto y a la cuenta de la empresa que necesita la búsqueda
+        """
         db = SessionLocal()
         try:
-            posts_db = db.query(PostulacionModel).filter(
-                PostulacionModel.cuenta_id == str(candidato_id)
-            ).all()
-            
-            resultado = []
-            for post_db in posts_db:
-                post = Postulacion(
-                    postulacion_id=UUID(post_db.postulacion_id) if post_db.postulacion_id else UUID('00000000-0000-0000-0000-000000000001'),
-                    candidato_id=UUID(post_db.cuenta_id),
-                    puesto_id=UUID(post_db.puesto_id) if post_db.puesto_id else UUID('00000000-0000-0000-0000-000000000001'),
-                    fecha_postulacion=post_db.fecha_postulacion,
-                    estado=EstadoPostulacion(post_db.estado),
-                    documentos_adjuntos=[]
+            consulta = db.query(
+                PostulacionModel.postulacion_id,
+                PostulacionModel.puesto_id,
+                PostulacionModel.fecha_postulacion,
+                PostulacionModel.estado
+            )
+            if con_puesto:
+                consulta = consulta.join(
+                    PuestoMapeo, PuestoMapeo.uuid_id == PostulacionModel.puesto_id
+                ).join(
+                    PuestoModel, PuestoModel.id == PuestoMapeo.bd_id
+                ).outerjoin(
+                    CuentaModel, cast(CuentaModel.id, String) == PuestoModel.empresa
                 )
-                
-                linea_tiempo = LineaDeTiempo()
-                for hito_db in post_db.hitos:
-                    hito = Hito(
-                        hito_id=UUID(f'00000000-0000-0000-0000-{hito_db.id:012d}'),
-                        fecha=hito_db.fecha,
-                        descripcion=hito_db.descripcion
-                    )
-                    linea_tiempo.lista_hitos.append(hito)
-                
-                resultado.append(PostulacionAggregate(
-                    postulacion=post,
-                    estado=post.estado,
-                    linea_de_tiempo=linea_tiempo
-                ))
+            consulta = consulta.filter(PostulacionModel.cuenta_id == str(candidato_id), *filtros)
+            consulta = consulta.order_by(*(orden or (PostulacionModel.fecha_postulacion.desc(), PostulacionModel.id)))
+            
+            return [
+                {
+                    "postulacion_id": fila.postulacion_id,
+                    "puesto_id": fila.puesto_id,
+                    "fecha_postulacion": fila.fecha_postulacion,
+                    "estado": fila.estado.value
+                }
+                for fila in consulta
+            ]
+        finally:
+            db.close()
+    
+    def _proyectar_por_candidato(
+        self,
+        candidato_id: UUID,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        incluir_hitos: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Consulta de columnas de las postulaciones del candidato y, opcionalmente, de sus hitos"""
+        db = SessionLocal()
+        try:
+            consulta = db.query(
+                PostulacionModel.id,
+                PostulacionModel.postulacion_id,
+                PostulacionModel.cuenta_id,
+                PostulacionModel.puesto_id,
+                PostulacionModel.fecha_postulacion,
+                PostulacionModel.estado
+            ).filter(
+                PostulacionModel.cuenta_id == str(candidato_id)
+            ).order_by(
+                PostulacionModel.fecha_postulacion.desc(), PostulacionModel.id.desc()
+            )
+            if offset:
+                consulta = consulta.offset(offset)
+            if limit is not None:
+                consulta = consulta.limit(limit)
+            filas = consulta.all()
+            
+            if not filas:
+                return []
+            
+            resultado = [
+                {
+                    "postulacion_id": fila.postulacion_id,
+                    "candidato_id": fila.cuenta_id,
+                    "puesto_id": fila.puesto_id,
+                    "fecha_postulacion": fila.fecha_postulacion,
+                    "estado": fila.estado.value,
+                    "documentos_adjuntos": []
+                }
+                for fila in filas
+            ]
+            if not incluir_hitos:
+                return resultado
+            
+            hitos_por_postulacion: Dict[int, List[Dict[str, Any]]] = {}
+            for fila, item in zip(filas, resultado):
+                item["hitos"] = hitos_por_postulacion[fila.id] = []
+            
+            hitos = db.query(
+                HitoModel.id, HitoModel.postulacion_id, HitoModel.fecha, HitoModel.descripcion
+            ).filter(
+                HitoModel.postulacion_id.in_(hitos_por_postulacion)
+            ).order_by(HitoModel.id)
+            
+            for hito in hitos:
+                hitos_por_postulacion[hito.postulacion_id].append({
+                    # Mismo ID derivado que usa el mapeo a agregado
+                    "hito_id": f"00000000-0000-0000-0000-{hito.id:012d}",
+                    "fecha": hito.fecha,
+                    "descripcion": hito.descripcion
+                })
             
             return resultado
         finally:
@@ -145,39 +344,108 @@ class PostulacionRepositoryImpl(PostulacionRepository):
     
     def obtener_por_puesto(self, puesto_id: UUID) -> List[PostulacionAggregate]:
         """Obtiene todas las postulaciones para un puesto"""
+        return self._listar(PostulacionModel.puesto_id == str(puesto_id))
+    
+    def obtener_por_ids(self, postulacion_ids: Iterable[UUID]) -> Dict[UUID, PostulacionAggregate]:
+        """Obtiene varias postulaciones con una única consulta IN"""
+        ids_str = {str(postulacion_id) for postulacion_id in postulacion_ids}
+        if not ids_str:
+            return {}
+        
+        postulaciones = self._listar(PostulacionModel.postulacion_id.in_(ids_str))
+        return {p.postulacion.postulacion_id: p for p in postulaciones}
+    
+    def _listar(self, *filtros) -> List[PostulacionAggregate]:
+        """
+        Lista las postulaciones que cumplen los filtros. Los hitos se cargan
+        con selectinload en una única consulta IN para todo el resultado,
+        en lugar de una consulta perezosa por cada postulación.
+        """
         db = SessionLocal()
         try:
-            posts_db = db.query(PostulacionModel).filter(
-                PostulacionModel.puesto_id == str(puesto_id)
-            ).all()
-            
-            resultado = []
-            for post_db in posts_db:
-                post = Postulacion(
-                    postulacion_id=UUID(post_db.postulacion_id) if post_db.postulacion_id else UUID('00000000-0000-0000-0000-000000000001'),
-                    candidato_id=UUID(post_db.cuenta_id),
-                    puesto_id=UUID(post_db.puesto_id) if post_db.puesto_id else UUID('00000000-0000-0000-0000-000000000001'),
-                    fecha_postulacion=post_db.fecha_postulacion,
-                    estado=EstadoPostulacion(post_db.estado),
-                    documentos_adjuntos=[]
-                )
-                
-                linea_tiempo = LineaDeTiempo()
-                for hito_db in post_db.hitos:
-                    hito = Hito(
-                        hito_id=UUID(f'00000000-0000-0000-0000-{hito_db.id:012d}'),
-                        fecha=hito_db.fecha,
-                        descripcion=hito_db.descripcion
-                    )
-                    linea_tiempo.lista_hitos.append(hito)
-                
-                resultado.append(PostulacionAggregate(
-                    postulacion=post,
-                    estado=post.estado,
-                    linea_de_tiempo=linea_tiempo
-                ))
+            posts_db = db.query(PostulacionModel).options(
+                selectinload(PostulacionModel.hitos)
+            ).filter(*filtros).all()
             
-            return resultado
+            return [self._mapear_modelo_a_aggregate(post_db) for post_db in posts_db]
+        finally:
+            db.close()
+    
+    def _mapear_modelo_a_aggregate(self, post_db: PostulacionModel, con_hitos: bool = True) -> PostulacionAggregate:
+        """
+        Mapea una fila de postulaciones y sus hitos ya cargados a un agregado;
+        con con_hitos=False la línea de tiempo queda vacía y no se toca la relación
+        """
+        post = Postulacion(
+            postulacion_id=UUID(post_db.postulacion_id) if post_db.postulacion_id else UUID('00000000-0000-0000-0000-000000000001'),
+            candidato_id=UUID(post_db.cuenta_id),
+            puesto_id=UUID(post_db.puesto_id) if post_db.puesto_id else UUID('00000000-0000-0000-0000-000000000001'),
+            fecha_postulacion=post_db.fecha_postulacion,
+            estado=EstadoPostulacion(post_db.estado),
+            documentos_adjuntos=[]
+        )
+        
+        linea_tiempo = LineaDeTiempo()
+        for hito_db in (post_db.hitos if con_hitos else ()):
+            hito = Hito(
+                hito_id=UUID(f'00000000-0000-0000-0000-{hito_db.id:012d}'),
+                fecha=hito_db.fecha,
+                descripcion=hito_db.descripcion
+            )
+            linea_tiempo.lista_hitos.append(hito)
+        
+        return PostulacionAggregate(
+            postulacion=post,
+            estado=post.estado,
+            linea_de_tiempo=linea_tiempo
+        )
+    
+    def transicionar_estado(self, postulacion_id: UUID, nuevo_estado: str) -> Union[EstadoPostulacionActualizado, bool, None]:
+        """
+        Cambia el estado de una postulación si la transición es válida, sin
+        reconstruir el agregado ni reescribir sus hitos: bloquea solo la fila
+        de la postulación, valida con las reglas del dominio, actualiza el
+        estado y agrega el hito del cambio en una misma transacción.
+        Devuelve el evento del cambio aplicado, False si la transición no
+        está permitida y None si la postulación no existe.
+        """
+        db = SessionLocal()
+        try:
+            fila = db.query(
+                PostulacionModel.id, PostulacionModel.estado, PostulacionModel.cuenta_id
+            ).filter(
+                PostulacionModel.postulacion_id == str(postulacion_id)
+            ).with_for_update().first()
+            
+            if fila is None:
+                return None
+            
+            estado_anterior = EstadoPostulacion(EstadoPostulacionEnum(fila.estado))
+            if not estado_anterior.es_valido(nuevo_estado):
+                return False
+            
+            estado_nuevo = EstadoPostulacionEnum(nuevo_estado)
+            db.query(PostulacionModel).filter(PostulacionModel.id == fila.id).update(
+                {PostulacionModel.estado: estado_nuevo.value}, synchronize_session=False
+            )
+            db.add(HitoModel(
+                postulacion_id=fila.id,
+                fecha=datetime.now(),
+                descripcion=f"Estado actualizado de {estado_anterior.valor.value} a {estado_nuevo.value}"
+            ))
+            marca = time.time()
+            db.commit()
+            return EstadoPostulacionActualizado(
+                postulacion_id,
+                estado_anterior.valor.value,
+                estado_nuevo.value,
+                UUID(fila.cuenta_id),
+                marca
+            )
+            
+        except Exception as e:
+            db.rollback()
+            raise e
         finally:
             db.close()
     
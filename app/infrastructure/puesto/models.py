@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
 from uuid import uuid4
 from datetime import datetime
 
@@ -21,6 +21,11 @@ class PuestoModel(Base):
     fecha_publicacion = Column(DateTime, nullable=False, default=datetime.now)
     fecha_cierre = Column(DateTime, nullable=True)
     estado = Column(String(50), nullable=False, default="abierto")
+    
+    __table_args__ = (
+        Index("ix_puestos_empresa_fecha", "empresa", "fecha_publicacion"),
+        Index("ix_puestos_estado_fecha", "estado", "fecha_publicacion"),
+    )
 
 
 class PuestoMapeo(Base):
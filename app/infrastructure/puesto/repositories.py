@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
-from app.domain.puesto.entities import PuestoAggregate
+from app.domain.puesto.entities import PuestoAggregate, Puesto, TipoContratoEnum, EstadoPuestoEnum
 from app.domain.puesto.repositories import PuestoRepository
 from app.infrastructure.database.connection import SessionLocal
 from app.infrastructure.puesto.models import PuestoModel, PuestoMapeo
@@ -87,110 +87,66 @@ class PuestoRepositoryImpl(PuestoRepository):
         """Recupera un puesto por su ID"""
         db = SessionLocal()
         try:
-            puesto_id_str = str(puesto_id)
-            
-            # Buscar el mapeo
-            mapeo = db.query(PuestoMapeo).filter(
-                PuestoMapeo.uuid_id == puesto_id_str
+            # Mapeo y puesto en una sola consulta
+            fila = self._consulta_con_mapeo(db).filter(
+                PuestoMapeo.uuid_id == str(puesto_id)
             ).first()
             
-            if not mapeo:
+            if not fila:
                 return None
             
-            # Buscar el puesto por bd_id
-            puesto_db = db.query(PuestoModel).filter(
-                PuestoModel.id == mapeo.bd_id
-            ).first()
-            
-            if not puesto_db:
-                return None
-            
-            from app.domain.puesto.entities import Puesto, TipoContratoEnum, EstadoPuestoEnum
-            
-            try:
-                empresa_id = UUID(puesto_db.empresa)
-            except:
-                empresa_id = UUID('00000000-0000-0000-0000-000000000000')
-            
-            # Convertir tipo_contrato y estado a enums
-            try:
-                tipo_contrato = TipoContratoEnum(puesto_db.tipo_contrato) if puesto_db.tipo_contrato else TipoContratoEnum.TIEMPO_COMPLETO
-            except:
-                tipo_contrato = TipoContratoEnum.TIEMPO_COMPLETO
-            
-            try:
-                estado = EstadoPuestoEnum(puesto_db.estado) if puesto_db.estado else EstadoPuestoEnum.ABIERTO
-            except:
-                estado = EstadoPuestoEnum.ABIERTO
-            
-            puesto = Puesto(
-                puesto_id=puesto_id,
-                empresa_id=empresa_id,
-                titulo=puesto_db.titulo,
-                descripcion=puesto_db.descripcion,
-                ubicacion=puesto_db.ubicacion or "",
-                salario_min=puesto_db.salario_min,
-                salario_max=puesto_db.salario_max,
-                moneda=puesto_db.moneda or "MXN",
-                tipo_contrato=tipo_contrato,
-                fecha_publicacion=puesto_db.fecha_publicacion,
-                fecha_cierre=puesto_db.fecha_cierre,
-                estado=estado
-            )
-            
-            puesto_aggregate = PuestoAggregate(puesto=puesto)
-            return puesto_aggregate
+            return self._mapear_modelo_a_aggregate(puesto_id, fila.PuestoModel)
             
         finally:
             db.close()
     
-    def listar_por_empresa(self, empresa_id: UUID) -> List[PuestoAggregate]:
-        """Lista los puestos de una empresa específica"""
-        db = SessionLocal()
-        try:
-            empresa_id_str = str(empresa_id)
-            puestos_db = db.query(PuestoModel).filter(
-                PuestoModel.empresa == empresa_id_str
-            ).all()
-            
-            resultado = []
-            for puesto_db in puestos_db:
-                try:
-                    # Obtener el UUID del mapeo
-                    mapeo = db.query(PuestoMapeo).filter(
-                        PuestoMapeo.bd_id == puesto_db.id
-                    ).first()
-                    if mapeo:
-                        puesto_agg = self.obtener_por_id(UUID(mapeo.uuid_id))
-                        if puesto_agg:
-                            resultado.append(puesto_agg)
-                except:
-                    pass
-            
-            return resultado
-            
-        finally:
-            db.close()
+    def obtener_por_ids(self, puesto_ids: Iterable[UUID]) -> Dict[UUID, PuestoAggregate]:
+        """Recupera varios puestos con una única consulta IN sobre la tabla de mapeo"""
+        ids_str = {str(puesto_id) for puesto_id in puesto_ids}
+        if not ids_str:
+            return {}
+        
+        puestos = self._listar(PuestoMapeo.uuid_id.in_(ids_str))
+        return {p.puesto.puesto_id: p for p in puestos}
+    
+    def listar(self, empresa_id: Optional[UUID] = None, estado: Optional[str] = None) -> List[PuestoAggregate]:
+        """
+        Lista los puestos con una única consulta; los filtros omitidos no
+        se añaden a la sentencia
+        """
+        filtros = []
+        if empresa_id is not None:
+            filtros.append(PuestoModel.empresa == str(empresa_id))
+        if estado is not None:
+            filtros.append(PuestoModel.estado == estado)
+        return self._listar(*filtros, orden=PuestoModel.fecha_publicacion.desc())
+    
+    def _consulta_con_mapeo(self, db):
+        """Consulta de puestos unida a su UUID de dominio a través de la tabla de mapeo"""
+        return db.query(PuestoMapeo.uuid_id, PuestoModel).join(
+            PuestoModel, PuestoModel.id == PuestoMapeo.bd_id
+        )
     
-    def listar_por_estado(self, estado: str) -> List[PuestoAggregate]:
-        """Lista los puestos según su estado"""
+    def _listar(self, *filtros, orden=None) -> List[PuestoAggregate]:
+        """
+        Lista los puestos que cumplen los filtros con una sola consulta;
+        antes se hacían dos consultas adicionales por cada fila
+        """
         db = SessionLocal()
         try:
-            puestos_db = db.query(PuestoModel).filter(
-                PuestoModel.estado == estado
-            ).all()
+            consulta = self._consulta_con_mapeo(db).filter(*filtros)
+            if orden is not None:
+                consulta = consulta.order_by(orden)
+            filas = consulta.all()
             
             resultado = []
-            for puesto_db in puestos_db:
+            for fila in filas:
                 try:
-                    mapeo = db.query(PuestoMapeo).filter(
-                        PuestoMapeo.bd_id == puesto_db.id
-                    ).first()
-                    if mapeo:
-                        puesto_agg = self.obtener_por_id(UUID(mapeo.uuid_id))
-                        if puesto_agg:
-                            resultado.append(puesto_agg)
-                except:
+                    resultado.append(
+                        self._mapear_modelo_a_aggregate(UUID(fila.uuid_id), fila.PuestoModel)
+                    )
+                except ValueError:
+                    # UUID de mapeo corrupto: se omite la fila como antes
                     pass
             
             return resultado
@@ -198,29 +154,40 @@ class PuestoRepositoryImpl(PuestoRepository):
         finally:
             db.close()
     
-    def listar_todos(self) -> List[PuestoAggregate]:
-        """Lista todos los puestos"""
-        db = SessionLocal()
+    def _mapear_modelo_a_aggregate(self, puesto_id: UUID, puesto_db: PuestoModel) -> PuestoAggregate:
+        """Mapea una fila de la tabla de puestos a un agregado"""
         try:
-            puestos_db = db.query(PuestoModel).all()
-            
-            resultado = []
-            for puesto_db in puestos_db:
-                try:
-                    mapeo = db.query(PuestoMapeo).filter(
-                        PuestoMapeo.bd_id == puesto_db.id
-                    ).first()
-                    if mapeo:
-                        puesto_agg = self.obtener_por_id(UUID(mapeo.uuid_id))
-                        if puesto_agg:
-                            resultado.append(puesto_agg)
-                except:
-                    pass
-            
-            return resultado
-            
-        finally:
-            db.close()
+            empresa_id = UUID(puesto_db.empresa)
+        except:
+            empresa_id = UUID('00000000-0000-0000-0000-000000000000')
+        
+        # Convertir tipo_contrato y estado a enums
+        try:
+            tipo_contrato = TipoContratoEnum(puesto_db.tipo_contrato) if puesto_db.tipo_contrato else TipoContratoEnum.TIEMPO_COMPLETO
+        except:
+            tipo_contrato = TipoContratoEnum.TIEMPO_COMPLETO
+        
+        try:
+            estado = EstadoPuestoEnum(puesto_db.estado) if puesto_db.estado else EstadoPuestoEnum.ABIERTO
+        except:
+            estado = EstadoPuestoEnum.ABIERTO
+        
+        puesto = Puesto(
+            puesto_id=puesto_id,
+            empresa_id=empresa_id,
+            titulo=puesto_db.titulo,
+            descripcion=puesto_db.descripcion,
+            ubicacion=puesto_db.ubicacion or "",
+            salario_min=puesto_db.salario_min,
+            salario_max=puesto_db.salario_max,
+            moneda=puesto_db.moneda or "MXN",
+            tipo_contrato=tipo_contrato,
+            fecha_publicacion=puesto_db.fecha_publicacion,
+            fecha_cierre=puesto_db.fecha_cierre,
+            estado=estado
+        )
+        
+        return PuestoAggregate(puesto=puesto)
     
     def eliminar(self, puesto_id: UUID) -> bool:
         """Elimina un puesto por su ID"""
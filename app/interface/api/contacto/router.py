@@ -11,6 +11,7 @@ from app.application.contacto.query_handlers import (
     ObtenerContactoQueryHandler, ObtenerContactoQuery,
     ObtenerContactosPostulacionQueryHandler, ObtenerContactosPostulacionQuery
 )
+from app.application._registry import get_handler
 from app.infrastructure.contacto.repositories import ContactoRepositoryImpl
 
 from .schemas import (
@@ -77,10 +78,9 @@ async def marcar_contacto_leido(
 
 # Endpoints para Feedback
 @router.post("/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
-async def enviar_feedback(feedback: FeedbackCreate):
+def enviar_feedback(feedback: FeedbackCreate):
     try:
-        contacto_repository = ContactoRepositoryImpl()
-        handler = EnviarFeedbackCommandHandler(contacto_repository)
+        handler = get_handler(EnviarFeedbackCommandHandler, ContactoRepositoryImpl)
         # Ajustar los parámetros según la definición del handler real
         comando = EnviarFeedbackCommand(
             postulacion_id=UUID(feedback.postulacion_id),
@@ -1,22 +1,43 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
 from app.infrastructure.iam.security import TokenManager
-from app.infrastructure.iam.repositories import CuentaRepositoryImpl
+from app.domain.iam.repositories import CuentaRepository
+from app.infrastructure.database.identity_map import IdentityMap
+from app.infrastructure.iam.repositories import CuentaRepositoryImpl, CuentaRepositoryConIdentityMap
 from app.application.iam.query_handlers import ObtenerCuentaQueryHandler, ObtenerCuentaQuery
 from uuid import UUID
 
 security = HTTPBearer()
 
 
-async def obtener_usuario_actual(credentials: HTTPAuthCredentials = Depends(security)) -> dict:
+def obtener_identity_map() -> IdentityMap:
+    """
+    Identity map de la petición actual. FastAPI cachea el resultado de la
+    dependencia, así que todos los consumidores de una misma petición
+    comparten la misma instancia.
+    """
+    return IdentityMap()
+
+
+def obtener_cuenta_repository(
+    identity_map: IdentityMap = Depends(obtener_identity_map)
+) -> CuentaRepository:
+    """Repositorio de cuentas que reutiliza los agregados cargados en la petición"""
+    return CuentaRepositoryConIdentityMap(CuentaRepositoryImpl(), identity_map)
+
+
+def obtener_usuario_actual(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+) -> dict:
     """
     Dependencia para obtener el usuario actual a partir del token JWT.
     
     Uso:
     @router.get("/mi-cuenta")
-    async def mi_cuenta(usuario: dict = Depends(obtener_usuario_actual)):
+    def mi_cuenta(usuario: dict = Depends(obtener_usuario_actual)):
         return usuario
     """
     token = credentials.credentials
@@ -40,7 +61,6 @@ async def obtener_usuario_actual(credentials: HTTPAuthCredentials = Depends(secu
     
     # Obtener información de la cuenta
     try:
-        repository = CuentaRepositoryImpl()
         handler = ObtenerCuentaQueryHandler(repository)
         query = ObtenerCuentaQuery(cuenta_id=UUID(cuenta_id))
         cuenta_data = handler.handle(query)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from uuid import UUID
 
@@ -14,8 +15,9 @@ from app.application.iam.query_handlers import (
     ObtenerCuentaPorEmailQueryHandler, ObtenerCuentaPorEmailQuery,
     VerificarTokenQueryHandler, VerificarTokenQuery
 )
-from app.infrastructure.iam.repositories import CuentaRepositoryImpl
+from app.domain.iam.repositories import CuentaRepository
 from app.infrastructure.iam.security import TokenManager
+from app.interface.api.dependencies import obtener_cuenta_repository
 
 from .schemas import (
     CrearCuentaRequest, LoginRequest, VerificarCuentaRequest,
@@ -28,7 +30,10 @@ router = APIRouter(prefix="/iam", tags=["IAM"])
 
 
 @router.post("/registrar", response_model=CuentaResponse, status_code=status.HTTP_201_CREATED)
-async def registrar_cuenta(request: CrearCuentaRequest):
+async def registrar_cuenta(
+    request: CrearCuentaRequest,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Registra una nueva cuenta de usuario.
     - **email**: Email único del usuario
@@ -36,7 +41,6 @@ async def registrar_cuenta(request: CrearCuentaRequest):
     - **tipo_cuenta**: Tipo de cuenta (candidato, empresa, admin) - por defecto 'candidato'
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = CrearCuentaHandler(repository)
         
         command = CrearCuentaCommand(
@@ -49,25 +53,16 @@ async def registrar_cuenta(request: CrearCuentaRequest):
             rol=request.rol
         )
         
-        cuenta_id = handler.handle(command)
+        cuenta_id = await handler.handle(command)
         
         # Obtener la cuenta creada para devolver los datos completos
         query_handler = ObtenerCuentaQueryHandler(repository)
-        cuenta_data = query_handler.handle(ObtenerCuentaQuery(cuenta_id=UUID(cuenta_id['cuenta_id'])))
-        
-        return CuentaResponse(
-            cuenta_id=cuenta_data['cuenta_id'],
-            nombre_completo=cuenta_data['nombre_completo'],
-            email=cuenta_data['email'],
-            carrera=cuenta_data['carrera'],
-            telefono=cuenta_data['telefono'],
-            ciudad=cuenta_data['ciudad'],
-            rol=cuenta_data['rol'],
-            estado=cuenta_data['estado'],
-            fecha_creacion=cuenta_data['fecha_creacion'],
-            fecha_actualizacion=cuenta_data['fecha_actualizacion'],
-            fecha_primer_acceso=cuenta_data['fecha_primer_acceso']
+        cuenta_data = await run_in_threadpool(
+            query_handler.handle, ObtenerCuentaQuery(cuenta_id=UUID(cuenta_id['cuenta_id']))
         )
+        
+        # response_model valida y serializa el dict una sola vez
+        return cuenta_data
     
     except ValueError as e:
         raise HTTPException(
@@ -82,7 +77,10 @@ async def registrar_cuenta(request: CrearCuentaRequest):
 
 
 @router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
-async def login(request: LoginRequest):
+async def login(
+    request: LoginRequest,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Realiza login del usuario y devuelve tokens JWT.
     
@@ -92,7 +90,6 @@ async def login(request: LoginRequest):
     Retorna access_token y refresh_token para futuras autenticaciones.
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = LoginHandler(repository)
         
         command = LoginCommand(
@@ -100,7 +97,7 @@ async def login(request: LoginRequest):
             password=request.password
         )
         
-        resultado = handler.handle(command)
+        resultado = await handler.handle(command)
         
         return TokenResponse(
             access_token=resultado['access_token'],
@@ -124,7 +121,10 @@ async def login(request: LoginRequest):
 
 
 @router.post("/verificar-cuenta", response_model=VerificacionResponse, status_code=status.HTTP_200_OK)
-async def verificar_cuenta(request: VerificarCuentaRequest):
+def verificar_cuenta(
+    request: VerificarCuentaRequest,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Verifica una cuenta usando el código de verificación enviado al email.
     
@@ -132,7 +132,6 @@ async def verificar_cuenta(request: VerificarCuentaRequest):
     - **codigo_verificacion**: Código enviado al email del usuario
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = VerificarCuentaHandler(repository)
         
         command = VerificarCuentaCommand(
@@ -166,7 +165,10 @@ async def verificar_cuenta(request: VerificarCuentaRequest):
 
 
 @router.post("/refresh-token", response_model=TokenResponse, status_code=status.HTTP_200_OK)
-async def refresh_token(request: RefreshTokenRequest):
+def refresh_token(
+    request: RefreshTokenRequest,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Obtiene un nuevo access_token usando el refresh_token.
     
@@ -189,7 +191,6 @@ async def refresh_token(request: RefreshTokenRequest):
             )
         
         # Obtener la cuenta
-        repository = CuentaRepositoryImpl()
         query_handler = ObtenerCuentaQueryHandler(repository)
         query = ObtenerCuentaQuery(cuenta_id=UUID(payload.get("sub")))
         cuenta_data = query_handler.handle(query)
@@ -228,7 +229,8 @@ async def refresh_token(request: RefreshTokenRequest):
 @router.post("/cambiar-password", response_model=MensajeResponse, status_code=status.HTTP_200_OK)
 async def cambiar_password(
     request: CambiarPasswordRequest,
-    cuenta_id: str
+    cuenta_id: str,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
 ):
     """
     Cambia la contraseña del usuario autenticado.
@@ -238,7 +240,6 @@ async def cambiar_password(
     - **cuenta_id**: ID de la cuenta (desde header o parámetro)
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = CambiarPasswordHandler(repository)
         
         command = CambiarPasswordCommand(
@@ -247,7 +248,7 @@ async def cambiar_password(
             password_nuevo=request.password_nuevo
         )
         
-        handler.handle(command)
+        await handler.handle(command)
         
         return MensajeResponse(
             mensaje="Contraseña actualizada exitosamente",
@@ -267,14 +268,16 @@ async def cambiar_password(
 
 
 @router.get("/cuenta/{cuenta_id}", response_model=CuentaResponse, status_code=status.HTTP_200_OK)
-async def obtener_cuenta(cuenta_id: str):
+def obtener_cuenta(
+    cuenta_id: str,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Obtiene la información de una cuenta.
     
     - **cuenta_id**: ID de la cuenta
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = ObtenerCuentaQueryHandler(repository)
         
         query = ObtenerCuentaQuery(cuenta_id=UUID(cuenta_id))
@@ -286,7 +289,7 @@ async def obtener_cuenta(cuenta_id: str):
                 detail=f"Cuenta no encontrada: {cuenta_id}"
             )
         
-        return CuentaResponse(**cuenta_data)
+        return cuenta_data
     
     except HTTPException:
         raise
@@ -298,14 +301,16 @@ async def obtener_cuenta(cuenta_id: str):
 
 
 @router.get("/cuenta/email/{email}", response_model=CuentaResponse, status_code=status.HTTP_200_OK)
-async def obtener_cuenta_por_email(email: str):
+def obtener_cuenta_por_email(
+    email: str,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Obtiene la información de una cuenta por email.
     
     - **email**: Email del usuario
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = ObtenerCuentaPorEmailQueryHandler(repository)
         
         query = ObtenerCuentaPorEmailQuery(email=email)
@@ -317,7 +322,7 @@ async def obtener_cuenta_por_email(email: str):
                 detail=f"Cuenta no encontrada para el email: {email}"
             )
         
-        return CuentaResponse(**cuenta_data)
+        return cuenta_data
     
     except HTTPException:
         raise
@@ -332,14 +337,16 @@ async def obtener_cuenta_por_email(email: str):
 
 
 @router.post("/verificar-token", response_model=TokenVerificationResponse, status_code=status.HTTP_200_OK)
-async def verificar_token_endpoint(request: RefreshTokenRequest):
+def verificar_token_endpoint(
+    request: RefreshTokenRequest,
+    repository: CuentaRepository = Depends(obtener_cuenta_repository)
+):
     """
     Verifica si un token JWT es válido.
     
     - **refresh_token**: Token a verificar (puede ser access_token o refresh_token)
     """
     try:
-        repository = CuentaRepositoryImpl()
         handler = VerificarTokenQueryHandler(repository)
         
         query = VerificarTokenQuery(token=request.refresh_token)
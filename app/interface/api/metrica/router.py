@@ -13,6 +13,7 @@ from app.application.metrica.query_handlers import (
     ContadorEntrevistasQuery, ContadorEntrevistasQueryHandler,
     ContadorRechazosQuery, ContadorRechazosQueryHandler
 )
+from app.application._registry import get_handler
 from app.infrastructure.metrica.repositories import MetricaRepositoryImpl
 
 from .schemas import (
@@ -25,14 +26,13 @@ router = APIRouter(prefix="/metricas", tags=["Métricas"])
 
 # Endpoints para consulta de métricas (calculadas en tiempo real)
 @router.get("/resumen/{cuenta_id}", response_model=MetricaResumenResponse)
-async def obtener_resumen_metricas(cuenta_id: UUID = Path(..., title="ID del cuenta")):
+def obtener_resumen_metricas(cuenta_id: UUID = Path(..., title="ID del cuenta")):
     """
     Obtiene un resumen de todas las métricas para una cuenta  específica.
     Las métricas se calculan en tiempo real basadas en el estado actual de las postulaciones.
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = ConsultarResumenMetricasHandler(metrica_repository)
+        handler = get_handler(ConsultarResumenMetricasHandler, MetricaRepositoryImpl)
         query = ConsultarResumenMetricasQuery(cuenta_id=cuenta_id)
         
         resultado = handler.handle(query)
@@ -50,14 +50,13 @@ async def obtener_resumen_metricas(cuenta_id: UUID = Path(..., title="ID del cue
 
 
 @router.get("/logros/{cuenta_id}", response_model=List[LogroResponse])
-async def listar_logros(cuenta_id: UUID = Path(..., title="ID del cuenta")):
+def listar_logros(cuenta_id: UUID = Path(..., title="ID del cuenta")):
     """
     Lista todos los logros conseguidos por una cuenta específica.
     Los logros se calculan en tiempo real basados en el historial de postulaciones.
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = ListarLogrosHandler(metrica_repository)
+        handler = get_handler(ListarLogrosHandler, MetricaRepositoryImpl)
         query = ListarLogrosQuery(cuenta_id=cuenta_id)
         
         return handler.handle(query)
@@ -69,14 +68,13 @@ async def listar_logros(cuenta_id: UUID = Path(..., title="ID del cuenta")):
 
 
 @router.get("/recalcular/{cuenta_id}", response_model=MetricaResumenResponse)
-async def recalcular_metricas(cuenta_id: UUID = Path(..., title="ID de la cuenta" )):
+def recalcular_metricas(cuenta_id: UUID = Path(..., title="ID de la cuenta" )):
     """
     Fuerza un recálculo de todas las métricas para un cuenta específico.
     Las métricas se calculan en tiempo real basadas en el estado actual de las postulaciones.
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = RecalcularMetricasHandler(metrica_repository)
+        handler = get_handler(RecalcularMetricasHandler, MetricaRepositoryImpl)
         command = RecalcularMetricasCommand(cuenta_id=cuenta_id)
         
         return handler.handle(command)
@@ -88,14 +86,13 @@ async def recalcular_metricas(cuenta_id: UUID = Path(..., title="ID de la cuenta
 
 
 @router.get("/contadores/ofertas/{postulante_id}", response_model=ContadorResponse)
-async def obtener_contador_ofertas(postulante_id: UUID = Path(..., title="ID del postulante")):
+def obtener_contador_ofertas(postulante_id: UUID = Path(..., title="ID del postulante")):
     """
     Obtiene el contador de ofertas para un postulante específico.
     US23: Contador de ofertas alcanzadas
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = ContadorOfertasQueryHandler(metrica_repository)
+        handler = get_handler(ContadorOfertasQueryHandler, MetricaRepositoryImpl)
         query = ContadorOfertasQuery(postulante_id=postulante_id)
         
         result = handler.handle(query)
@@ -111,14 +108,13 @@ async def obtener_contador_ofertas(postulante_id: UUID = Path(..., title="ID del
 
 
 @router.get("/contadores/entrevistas/{postulante_id}", response_model=ContadorResponse)
-async def obtener_contador_entrevistas(postulante_id: UUID = Path(..., title="ID del postulante")):
+def obtener_contador_entrevistas(postulante_id: UUID = Path(..., title="ID del postulante")):
     """
     Obtiene el contador de entrevistas para un postulante específico.
     US22: Contador de entrevistas obtenidas
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = ContadorEntrevistasQueryHandler(metrica_repository)
+        handler = get_handler(ContadorEntrevistasQueryHandler, MetricaRepositoryImpl)
         query = ContadorEntrevistasQuery(postulante_id=postulante_id)
         
         result = handler.handle(query)
@@ -134,14 +130,13 @@ async def obtener_contador_entrevistas(postulante_id: UUID = Path(..., title="ID
 
 
 @router.get("/contadores/rechazos/{postulante_id}", response_model=ContadorResponse)
-async def obtener_contador_rechazos(postulante_id: UUID = Path(..., title="ID del postulante")):
+def obtener_contador_rechazos(postulante_id: UUID = Path(..., title="ID del postulante")):
     """
     Obtiene el contador de rechazos para un postulante específico.
     US24: Contador de rechazos acumulados
     """
     try:
-        metrica_repository = MetricaRepositoryImpl()
-        handler = ContadorRechazosQueryHandler(metrica_repository)
+        handler = get_handler(ContadorRechazosQueryHandler, MetricaRepositoryImpl)
         query = ContadorRechazosQuery(postulante_id=postulante_id)
         
         result = handler.handle(query)
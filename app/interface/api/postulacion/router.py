@@ -9,15 +9,18 @@ from app.application.postulacion.command_handlers import (
 )
 from app.application.postulacion.query_handlers import (
     ObtenerPostulacionQueryHandler, ObtenerPostulacionQuery,
-    ListarPostulacionesCandidatoQueryHandler, ListarPostulacionesCandidatoQuery
+    ListarPostulacionesCandidatoQueryHandler, ListarPostulacionesCandidatoQuery,
+    ListarHitosPostulacionQueryHandler, ListarHitosPostulacionQuery,
+    postulacion_a_dict
 )
 from app.application.postulacion.postulacion_service import PostulacionService
+from app.application._registry import get_handler
 from app.infrastructure.postulacion.repositories import PostulacionRepositoryImpl
 from app.infrastructure.puesto.repositories import PuestoRepositoryImpl
 
 from .schemas import (
     PostulacionCreate, PostulacionResponse, PostulacionEnriquecidaResponse,
-    EstadoUpdate, EstadoPostulacionEnum
+    HitoResponse, EstadoUpdate, EstadoPostulacionEnum
 )
 
 router = APIRouter(prefix="/postulacion", tags=["Postulación"])
@@ -26,7 +29,7 @@ postulacion_service = PostulacionService()
 
 # Endpoints para Postulaciones
 @router.post("/", response_model=PostulacionEnriquecidaResponse, status_code=status.HTTP_201_CREATED)
-async def crear_postulacion(postulacion: PostulacionCreate):
+def crear_postulacion(postulacion: PostulacionCreate):
     """
     Crea una nueva postulación y devuelve datos enriquecidos
     """
@@ -53,7 +56,7 @@ async def crear_postulacion(postulacion: PostulacionCreate):
         }
         
         # Enriquecer con datos relacionados
-        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(respuesta_basica)
+        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(respuesta_basica, inplace=True)
         
         return respuesta_enriquecida
     except Exception as e:
@@ -64,20 +67,25 @@ async def crear_postulacion(postulacion: PostulacionCreate):
 
 
 @router.get("/{postulacion_id}", response_model=PostulacionEnriquecidaResponse)
-async def obtener_postulacion(postulacion_id: str = Path(..., title="ID de la postulación")):
+def obtener_postulacion(
+    postulacion_id: str = Path(..., title="ID de la postulación"),
+    incluir_hitos: bool = Query(False, title="Incluir la lista de hitos")
+):
     """
     Obtiene una postulación con datos enriquecidos de candidato, puesto y empresa
+    
+    - **incluir_hitos**: Si es False (default), devuelve solo hitos_count; la
+      línea de tiempo completa está en /postulacion/{postulacion_id}/hitos
     """
     try:
-        postulacion_repository = PostulacionRepositoryImpl()
-        handler = ObtenerPostulacionQueryHandler(postulacion_repository)
-        query = ObtenerPostulacionQuery(postulacion_id=UUID(postulacion_id))
+        handler = get_handler(ObtenerPostulacionQueryHandler, PostulacionRepositoryImpl)
+        query = ObtenerPostulacionQuery(postulacion_id=UUID(postulacion_id), incluir_hitos=incluir_hitos)
         resultado = handler.handle(query)
         if resultado is None:
             raise ValueError("No se encontró la postulación")
         
         # Enriquecer con datos relacionados
-        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(resultado)
+        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(resultado, inplace=True)
         
         return respuesta_enriquecida
     except Exception as e:
@@ -87,8 +95,28 @@ async def obtener_postulacion(postulacion_id: str = Path(..., title="ID de la po
         )
 
 
+@router.get("/{postulacion_id}/hitos", response_model=List[HitoResponse])
+def listar_hitos_postulacion(
+    postulacion_id: str = Path(..., title="ID de la postulación"),
+    limit: int = Query(50, ge=1, le=200, title="Máximo de hitos a devolver"),
+    offset: int = Query(0, ge=0, title="Hitos a omitir")
+):
+    """
+    Lista, paginados, los hitos de la línea de tiempo de una postulación
+    """
+    try:
+        handler = get_handler(ListarHitosPostulacionQueryHandler, PostulacionRepositoryImpl)
+        query = ListarHitosPostulacionQuery(postulacion_id=UUID(postulacion_id), limit=limit, offset=offset)
+        return handler.handle(query)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/", response_model=List[PostulacionEnriquecidaResponse])
-async def listar_postulaciones(
+def listar_postulaciones(
     candidato_id: Optional[str] = Query(None, title="ID del candidato"),
     puesto_id: Optional[str] = Query(None, title="ID del puesto"),
     estado: Optional[EstadoPostulacionEnum] = Query(None, title="Estado de la postulación"),
@@ -110,64 +138,29 @@ async def listar_postulaciones(
 
             # Enriquecer resultados si se solicita
             if enriquecer:
-                respuestas = postulacion_service.enriquecer_postulaciones([
-                    {
-                        "postulacion_id": str(agg.postulacion.postulacion_id),
-                        "candidato_id": str(agg.postulacion.candidato_id),
-                        "puesto_id": str(agg.postulacion.puesto_id),
-                        "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                        "estado": agg.postulacion.estado.valor.value,
-                        "documentos_adjuntos": agg.postulacion.documentos_adjuntos,
-                        "hitos": [
-                            {
-                                "hito_id": str(hito.hito_id),
-                                "fecha": hito.fecha.isoformat(),
-                                "descripcion": hito.descripcion
-                            }
-                            for hito in agg.linea_de_tiempo.lista_hitos
-                        ]
-                    }
-                    for agg in resultados
-                ])
+                respuestas = postulacion_service.enriquecer_postulaciones(
+                    [postulacion_a_dict(agg) for agg in resultados], inplace=True
+                )
             else:
-                respuestas = [
-                    {
-                        "postulacion_id": str(agg.postulacion.postulacion_id),
-                        "candidato_id": str(agg.postulacion.candidato_id),
-                        "puesto_id": str(agg.postulacion.puesto_id),
-                        "fecha_postulacion": agg.postulacion.fecha_postulacion.isoformat(),
-                        "estado": agg.postulacion.estado.valor.value,
-                        "documentos_adjuntos": agg.postulacion.documentos_adjuntos,
-                        "hitos": []
-                    }
-                    for agg in resultados
-                ]
+                respuestas = [postulacion_a_dict(agg, incluir_hitos=False) for agg in resultados]
 
             return respuestas
 
         # Por ahora solo implementamos el filtrado por candidato
         if candidato_id:
-            postulacion_repository = PostulacionRepositoryImpl()
-            handler = ListarPostulacionesCandidatoQueryHandler(postulacion_repository)
+            handler = get_handler(ListarPostulacionesCandidatoQueryHandler, PostulacionRepositoryImpl)
             query = ListarPostulacionesCandidatoQuery(candidato_id=UUID(candidato_id))
             resultados = handler.handle(query)
             
             # Enriquecer resultados si se solicita
             if enriquecer:
-                respuestas = postulacion_service.enriquecer_postulaciones(resultados)
+                respuestas = postulacion_service.enriquecer_postulaciones(resultados, inplace=True)
             else:
-                respuestas = [
-                    {
-                        "postulacion_id": resultado.get("postulacion_id", ""),
-                        "candidato_id": resultado.get("candidato_id", candidato_id),
-                        "puesto_id": resultado.get("puesto_id", ""),
-                        "fecha_postulacion": datetime.fromisoformat(resultado.get("fecha_postulacion", datetime.now().isoformat())),
-                        "estado": resultado.get("estado", EstadoPostulacionEnum.PENDIENTE.value),
-                        "documentos_adjuntos": resultado.get("documentos_adjuntos", []),
-                        "hitos": []
-                    }
-                    for resultado in resultados
-                ]
+                # La proyección ya tiene la forma de respuesta: se reutilizan
+                # sus filas en lugar de copiarlas a una segunda lista
+                for resultado in resultados:
+                    resultado["hitos"] = []
+                respuestas = resultados
             
             return respuestas
         else:
@@ -181,7 +174,7 @@ async def listar_postulaciones(
 
 
 @router.patch("/{postulacion_id}/estado", response_model=PostulacionEnriquecidaResponse)
-async def actualizar_estado_postulacion(
+def actualizar_estado_postulacion(
     estado_update: EstadoUpdate,
     postulacion_id: str = Path(..., title="ID de la postulación")
 ):
@@ -215,25 +208,10 @@ async def actualizar_estado_postulacion(
             )
         
         # Construir respuesta desde el agregado actualizado
-        respuesta = {
-            "postulacion_id": str(postulacion_actualizada.postulacion.postulacion_id),
-            "candidato_id": str(postulacion_actualizada.postulacion.candidato_id),
-            "puesto_id": str(postulacion_actualizada.postulacion.puesto_id),
-            "fecha_postulacion": postulacion_actualizada.postulacion.fecha_postulacion.isoformat(),
-            "estado": postulacion_actualizada.postulacion.estado.valor.value,
-            "documentos_adjuntos": postulacion_actualizada.postulacion.documentos_adjuntos,
-            "hitos": [
-                {
-                    "hito_id": str(hito.hito_id),
-                    "fecha": hito.fecha.isoformat(),
-                    "descripcion": hito.descripcion
-                }
-                for hito in postulacion_actualizada.linea_de_tiempo.lista_hitos
-            ]
-        }
+        respuesta = postulacion_a_dict(postulacion_actualizada)
         
         # Enriquecer con datos relacionados
-        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(respuesta)
+        respuesta_enriquecida = postulacion_service.enriquecer_postulacion(respuesta, inplace=True)
         
         return respuesta_enriquecida
     except HTTPException:
@@ -72,6 +72,7 @@ class PostulacionResponse(BaseModel):
     estado: str
     documentos_adjuntos: List[Dict[str, Any]]
     hitos: List[HitoResponse]
+    hitos_count: Optional[int] = None
 
 
 class PostulacionEnriquecidaResponse(BaseModel):
@@ -81,6 +82,7 @@ class PostulacionEnriquecidaResponse(BaseModel):
     estado: str
     documentos_adjuntos: List[Dict[str, Any]]
     hitos: List[HitoResponse]
+    hitos_count: Optional[int] = None
     # Información enriquecida
     candidato: Optional[CandidatoInfoResponse] = None
     puesto: Optional[PuestoInfoResponse] = None
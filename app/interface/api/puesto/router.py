@@ -4,23 +4,25 @@ from uuid import UUID
 from datetime import datetime
 
 from app.application.puesto.command_handlers import (
-    CrearPuestoHandler, CrearPuestoCommand, ActualizarPuestoHandler, CambiarEstadoPuestoHandler, CambiarEstadoPuestoCommand
+    CrearPuestoHandler, CrearPuestoCommand, ActualizarPuestoHandler, ActualizarPuestoCommand,
+    CambiarEstadoPuestoHandler, CambiarEstadoPuestoCommand
 )
 from app.application.puesto.query_handlers import (
     ObtenerPuestoQueryHandler, ObtenerPuestoQuery,
     ListarPuestosQueryHandler, ListarPuestosQuery
 )
+from app.application._registry import get_handler
 from app.infrastructure.puesto.repositories import PuestoRepositoryImpl
 
 from .schemas import (
     PuestoCreate, PuestoUpdate, PuestoResponse, RequisitoResponse,
-    EstadoPuestoUpdate, EstadoPuestoEnum, TipoContratoEnum
+    EstadoPuestoUpdate, EstadoPuestoEnum
 )
 
 router = APIRouter(prefix="/puesto", tags=["Puesto"])
 
 @router.post("/", response_model=PuestoResponse, status_code=status.HTTP_201_CREATED)
-async def crear_puesto(puesto: PuestoCreate):
+def crear_puesto(puesto: PuestoCreate):
     """
     Crea un nuevo puesto de trabajo con la información proporcionada.
     
@@ -35,8 +37,7 @@ async def crear_puesto(puesto: PuestoCreate):
     - **requisitos**: Lista de requisitos para el puesto (opcional)
     """
     try:
-        puesto_repository = PuestoRepositoryImpl()
-        handler = CrearPuestoHandler(puesto_repository)
+        handler = get_handler(CrearPuestoHandler, PuestoRepositoryImpl)
         
         # Preparar requisitos en formato dict
         requisitos = []
@@ -73,8 +74,8 @@ async def crear_puesto(puesto: PuestoCreate):
             salario_max=resultado.get("salario_max"),
             moneda=resultado.get("moneda", "MXN"),
             tipo_contrato=resultado.get("tipo_contrato", "tiempo_completo"),
-            fecha_publicacion=datetime.fromisoformat(resultado.get("fecha_publicacion", datetime.now().isoformat())),
-            fecha_cierre=datetime.fromisoformat(resultado.get("fecha_cierre", datetime.now().isoformat())) if resultado.get("fecha_cierre") else None,
+            fecha_publicacion=resultado.get("fecha_publicacion") or datetime.now(),
+            fecha_cierre=resultado.get("fecha_cierre"),
             estado=resultado.get("estado", "abierto"),
             requisitos=[RequisitoResponse(**req) for req in resultado.get("requisitos", [])]
         )
@@ -87,15 +88,14 @@ async def crear_puesto(puesto: PuestoCreate):
 
 
 @router.get("/{puesto_id}", response_model=PuestoResponse)
-async def obtener_puesto(puesto_id: str = Path(..., title="ID del puesto")):
+def obtener_puesto(puesto_id: str = Path(..., title="ID del puesto")):
     """
     Obtiene la información detallada de un puesto por su ID.
     
     - **puesto_id**: ID del puesto a consultar
     """
     try:
-        puesto_repository = PuestoRepositoryImpl()
-        handler = ObtenerPuestoQueryHandler(puesto_repository)
+        handler = get_handler(ObtenerPuestoQueryHandler, PuestoRepositoryImpl)
         query = ObtenerPuestoQuery(puesto_id=UUID(puesto_id))
         resultado = handler.handle(query)
         if resultado is None:
@@ -112,8 +112,8 @@ async def obtener_puesto(puesto_id: str = Path(..., title="ID del puesto")):
             salario_max=resultado.get("salario_max"),
             moneda=resultado.get("moneda", "MXN"),
             tipo_contrato=resultado.get("tipo_contrato", "tiempo_completo"),
-            fecha_publicacion=datetime.fromisoformat(resultado.get("fecha_publicacion", datetime.now().isoformat())),
-            fecha_cierre=datetime.fromisoformat(resultado.get("fecha_cierre")) if resultado.get("fecha_cierre") else None,
+            fecha_publicacion=resultado.get("fecha_publicacion") or datetime.now(),
+            fecha_cierre=resultado.get("fecha_cierre"),
             estado=resultado.get("estado", EstadoPuestoEnum.ABIERTO.value),
             requisitos=resultado.get("requisitos", [])
         )
@@ -126,7 +126,7 @@ async def obtener_puesto(puesto_id: str = Path(..., title="ID del puesto")):
 
 
 @router.get("/", response_model=List[PuestoResponse])
-async def listar_puestos(
+def listar_puestos(
     empresa_id: Optional[str] = Query(None, title="ID de la empresa"),
     estado: Optional[EstadoPuestoEnum] = Query(None, title="Estado del puesto (abierto/cerrado)")
 ):
@@ -137,8 +137,7 @@ async def listar_puestos(
     - **estado**: Filtrar por estado del puesto (abierto/cerrado) (opcional)
     """
     try:
-        puesto_repository = PuestoRepositoryImpl()
-        handler = ListarPuestosQueryHandler(puesto_repository)
+        handler = get_handler(ListarPuestosQueryHandler, PuestoRepositoryImpl)
         query = ListarPuestosQuery(
             empresa_id=UUID(empresa_id) if empresa_id else None,
             estado=estado
@@ -158,8 +157,8 @@ async def listar_puestos(
                 salario_max=resultado.get("salario_max"),
                 moneda=resultado.get("moneda", "MXN"),
                 tipo_contrato=resultado.get("tipo_contrato", "tiempo_completo"),
-                fecha_publicacion=datetime.fromisoformat(resultado.get("fecha_publicacion", datetime.now().isoformat())),
-                fecha_cierre=datetime.fromisoformat(resultado.get("fecha_cierre")) if resultado.get("fecha_cierre") else None,
+                fecha_publicacion=resultado.get("fecha_publicacion") or datetime.now(),
+                fecha_cierre=resultado.get("fecha_cierre"),
                 estado=resultado.get("estado", EstadoPuestoEnum.ABIERTO.value),
                 requisitos=resultado.get("requisitos", [])
             )
@@ -173,7 +172,7 @@ async def listar_puestos(
 
 
 @router.put("/{puesto_id}", response_model=PuestoResponse)
-async def actualizar_puesto(
+def actualizar_puesto(
     puesto_update: PuestoUpdate,
     puesto_id: str = Path(..., title="ID del puesto")
 ):
@@ -191,25 +190,13 @@ async def actualizar_puesto(
     - **requisitos**: Nueva lista de requisitos (opcional)
     """
     try:
-        puesto_repository = PuestoRepositoryImpl()
-        
-        # Obtener el puesto actual
-        handler_get = ObtenerPuestoQueryHandler(puesto_repository)
-        query_get = ObtenerPuestoQuery(puesto_id=UUID(puesto_id))
-        puesto_actual = handler_get.handle(query_get)
-        if not puesto_actual:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Puesto con ID {puesto_id} no encontrado"
-            )
-        
-        # Actualizar
-        handler = ActualizarPuestoHandler(puesto_repository)
+        # Actualizar (el handler devuelve el puesto completo ya actualizado)
+        handler = get_handler(ActualizarPuestoHandler, PuestoRepositoryImpl)
         requisitos = None
         if puesto_update.requisitos is not None:
             requisitos = [req.dict() if hasattr(req, 'dict') else req for req in puesto_update.requisitos]
             
-        resultado = handler.handle(
+        command = ActualizarPuestoCommand(
             puesto_id=UUID(puesto_id),
             titulo=puesto_update.titulo,
             descripcion=puesto_update.descripcion,
@@ -217,27 +204,11 @@ async def actualizar_puesto(
             salario_min=puesto_update.salario_min,
             salario_max=puesto_update.salario_max,
             moneda=puesto_update.moneda,
-            tipo_contrato=puesto_update.tipo_contrato.value if isinstance(puesto_update.tipo_contrato, TipoContratoEnum) else puesto_update.tipo_contrato if puesto_update.tipo_contrato else None,
+            tipo_contrato=puesto_update.tipo_contrato,
             requisitos=requisitos
         )
-        
-        # Retornar puesto actualizado
-        respuesta = PuestoResponse(
-            puesto_id=puesto_actual.get("puesto_id", puesto_id),
-            empresa_id=puesto_actual.get("empresa_id", ""),
-            titulo=puesto_update.titulo or puesto_actual.get("titulo", ""),
-            descripcion=puesto_update.descripcion or puesto_actual.get("descripcion", ""),
-            ubicacion=puesto_update.ubicacion or puesto_actual.get("ubicacion", ""),
-            salario_min=puesto_update.salario_min if puesto_update.salario_min is not None else puesto_actual.get("salario_min"),
-            salario_max=puesto_update.salario_max if puesto_update.salario_max is not None else puesto_actual.get("salario_max"),
-            moneda=puesto_update.moneda or puesto_actual.get("moneda", "MXN"),
-            tipo_contrato=(puesto_update.tipo_contrato.value if isinstance(puesto_update.tipo_contrato, TipoContratoEnum) else puesto_update.tipo_contrato) or puesto_actual.get("tipo_contrato", "tiempo_completo"),
-            fecha_publicacion=datetime.fromisoformat(puesto_actual.get("fecha_publicacion", datetime.now().isoformat())),
-            fecha_cierre=datetime.fromisoformat(puesto_actual.get("fecha_cierre")) if puesto_actual.get("fecha_cierre") else None,
-            estado=puesto_actual.get("estado", EstadoPuestoEnum.ABIERTO.value),
-            requisitos=requisitos or puesto_actual.get("requisitos", [])
-        )
-        return respuesta
+        resultado = handler.handle(command)
+        return PuestoResponse(**resultado)
     except HTTPException:
         raise
     except ValueError as e:
@@ -253,7 +224,7 @@ async def actualizar_puesto(
 
 
 @router.patch("/{puesto_id}/estado", response_model=PuestoResponse)
-async def cambiar_estado_puesto(
+def cambiar_estado_puesto(
     estado_update: EstadoPuestoUpdate,
     puesto_id: str = Path(..., title="ID del puesto")
 ):
@@ -264,43 +235,14 @@ async def cambiar_estado_puesto(
     - **nuevo_estado**: Nuevo estado del puesto (abierto/cerrado)
     """
     try:
-        puesto_repository = PuestoRepositoryImpl()
-        
-        # Obtener el puesto actual
-        handler_get = ObtenerPuestoQueryHandler(puesto_repository)
-        query_get = ObtenerPuestoQuery(puesto_id=UUID(puesto_id))
-        puesto_actual = handler_get.handle(query_get)
-        if not puesto_actual:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Puesto con ID {puesto_id} no encontrado"
-            )
-        
-        # Cambiar estado
-        handler = CambiarEstadoPuestoHandler(puesto_repository)
+        # Cambiar estado (el handler devuelve el puesto completo ya actualizado)
+        handler = get_handler(CambiarEstadoPuestoHandler, PuestoRepositoryImpl)
         command = CambiarEstadoPuestoCommand(
             puesto_id=UUID(puesto_id),
             nuevo_estado=estado_update.nuevo_estado
         )
         resultado = handler.handle(command)
-        
-        # Retornar puesto con estado actualizado
-        respuesta = PuestoResponse(
-            puesto_id=puesto_actual.get("puesto_id", puesto_id),
-            empresa_id=puesto_actual.get("empresa_id", ""),
-            titulo=puesto_actual.get("titulo", ""),
-            descripcion=puesto_actual.get("descripcion", ""),
-            ubicacion=puesto_actual.get("ubicacion", ""),
-            salario_min=puesto_actual.get("salario_min"),
-            salario_max=puesto_actual.get("salario_max"),
-            moneda=puesto_actual.get("moneda", "MXN"),
-            tipo_contrato=puesto_actual.get("tipo_contrato", "tiempo_completo"),
-            fecha_publicacion=datetime.fromisoformat(puesto_actual.get("fecha_publicacion", datetime.now().isoformat())),
-            fecha_cierre=datetime.fromisoformat(puesto_actual.get("fecha_cierre")) if puesto_actual.get("fecha_cierre") else None,
-            estado=estado_update.nuevo_estado.value,
-            requisitos=puesto_actual.get("requisitos", [])
-        )
-        return respuesta
+        return PuestoResponse(**resultado)
     except HTTPException:
         raise
     except ValueError as e:
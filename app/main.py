@@ -1,4 +1,7 @@
 import logging
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
@@ -11,6 +14,16 @@ from app.interface.api.metrica.router import router as metrica_router
 from app.interface.api.puesto.router import router as puesto_router
 from app.interface.api.iam.router import router as iam_router
 from app.config import settings
+from app.application.event_bus import event_bus
+from app.application.contacto.query_handlers import (
+    FeedbackEnviadoHandler, SolicitudCambioEstadoPostulacionHandler
+)
+from app.application.postulacion.query_handlers import (
+    PostulacionCreadaHandler, EstadoPostulacionActualizadoHandler
+)
+from app.domain.contacto.entities import FeedbackEnviado, SolicitudCambioEstadoPostulacion
+from app.domain.postulacion.entities import PostulacionCreada, EstadoPostulacionActualizado
+from app.infrastructure.metrica.repositories import MetricaRepositoryImpl
 
 
 logging.basicConfig(
@@ -21,7 +34,9 @@ logger = logging.getLogger(__name__)
 
 
 try:
-    if engine is not None:
+    if not settings.DB_BOOTSTRAP:
+        logger.info("DB_BOOTSTRAP desactivado, se omite la creación de tablas.")
+    elif engine is not None:
         logger.info("Creando tablas en la base de datos...")
         Base.metadata.create_all(bind=engine)
         logger.info("Tablas creadas exitosamente.")
@@ -31,13 +46,29 @@ except Exception as e:
     logger.error(f"Error al crear tablas: {e}")
 
 
+# Suscripción de manejadores de eventos de dominio
+event_bus.suscribir(FeedbackEnviado, FeedbackEnviadoHandler())
+event_bus.suscribir(SolicitudCambioEstadoPostulacion, SolicitudCambioEstadoPostulacionHandler())
+event_bus.suscribir(PostulacionCreada, PostulacionCreadaHandler(MetricaRepositoryImpl()))
+event_bus.suscribir(EstadoPostulacionActualizado, EstadoPostulacionActualizadoHandler(MetricaRepositoryImpl()))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Los endpoints síncronos corren en el threadpool de anyio; su tamaño
+    # por defecto (40) sería el techo de concurrencia de todo el proceso
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_WORKERS
+    yield
+
+
 app = FastAPI(
     title="API de Gestión de Postulaciones",
     description="API REST con FastAPI y PostgreSQL implementando Domain-Driven Design",
     version="1.0.0",
     docs_url="/docs",  
     redoc_url="/redoc", 
-    swagger_ui_parameters={"defaultModelsExpandDepth": -1}
+    swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan
 )
 
 app.add_middleware(